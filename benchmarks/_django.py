@@ -0,0 +1,38 @@
+"""Minimal Django setup (SQLite in memory) shared by the benchmarks."""
+import django
+from django.conf import settings
+
+
+def setup(**extra_settings):
+    if not settings.configured:
+        settings.configure(
+            SECRET_KEY='benchmark',
+            IS_MICROSERVICE=False,
+            USE_TZ=True,
+            DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+            INSTALLED_APPS=[
+                'django.contrib.contenttypes',
+                'django.contrib.auth',
+                'dj_core_utils',
+            ],
+            DATABASES={
+                'default': {
+                    'ENGINE': 'django.db.backends.sqlite3',
+                    'NAME': ':memory:',
+                }
+            },
+            **extra_settings,
+        )
+        django.setup()
+
+
+def create_tables():
+    """Creates the tables of every registered model."""
+    from django.apps import apps
+    from django.db import connection
+
+    import dj_core_utils.db.models  # noqa
+
+    with connection.schema_editor() as editor:
+        for model in apps.get_models():
+            editor.create_model(model)
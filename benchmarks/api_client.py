@@ -0,0 +1,64 @@
+"""
+SyncAPIClient vs async_to_sync(AsyncAPIClient.request) from sync code,
+against a local keep-alive HTTP server.
+
+    python benchmarks/api_client.py
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from _django import setup
+
+connections = set()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        connections.add(self.client_address)
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def measure(call, requests):
+    connections.clear()
+    start = time.perf_counter()
+    for i in range(requests):
+        call('GET', f'items/{i}/')
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, len(connections)
+
+
+def main(requests=500):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    setup(API_CLIENT={
+        'BASE_URL': f'http://127.0.0.1:{server.server_port}/api',
+    })
+
+    from asgiref.sync import async_to_sync
+
+    from dj_core_utils.api.client import AsyncAPIClient, SyncAPIClient
+
+    for label, call in (
+        ('async_to_sync', async_to_sync(AsyncAPIClient('bench').request)),
+        ('sync', SyncAPIClient('bench').request),
+    ):
+        rate, opened = measure(call, requests)
+        print(f'{label:>13}: {rate:8.0f} req/s, {opened} connections opened')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
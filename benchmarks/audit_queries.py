@@ -0,0 +1,83 @@
+"""
+Queries per audited save: legacy model_to_dict_safe vs the compiled plan.
+
+    python benchmarks/audit_queries.py
+"""
+import time
+
+from _django import create_tables, setup
+
+setup()
+
+from django.db import connection, models  # noqa: E402
+from django.db.models import ForeignKey, JSONField, ManyToManyField  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from dj_core_utils.db.models import CoreBaseModel  # noqa: E402
+from dj_core_utils.signals.audit import AuditHandler  # noqa: E402
+
+
+class Customer(models.Model):
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = 'dj_core_utils'
+
+
+class Order(CoreBaseModel):
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
+    seller = models.ForeignKey(
+        Customer, on_delete=models.CASCADE, related_name='sales')
+    total = models.IntegerField(default=0)
+    extra = models.JSONField(default=dict)
+
+
+def legacy_model_to_dict_safe(instance):
+    """AuditHandler.model_to_dict_safe before the serialization plans."""
+    data = {}
+    for field in instance._meta.get_fields():
+        if isinstance(field, ManyToManyField):
+            continue
+        try:
+            value = getattr(instance, field.name, None)
+            if isinstance(field, ForeignKey):
+                data[field.name] = str(value) if value else None
+            elif isinstance(field, JSONField):
+                data[field.name] = (
+                    value if isinstance(value, dict) else dict(value or {})
+                )
+            else:
+                data[field.name] = value
+        except Exception:
+            data[field.name] = None
+    return data
+
+
+def measure(serializer, rows):
+    orders = list(Order.objects.all()[:rows])
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        for order in orders:
+            serializer(order)
+        elapsed = time.perf_counter() - start
+    return len(ctx) / rows, elapsed / rows * 1e6
+
+
+def main(rows=500):
+    create_tables()
+    customer = Customer.objects.create(name='c')
+    Order.objects.bulk_create(
+        Order(customer=customer, seller=customer, total=i)
+        for i in range(rows)
+    )
+
+    for label, serializer in (
+        ('legacy', legacy_model_to_dict_safe),
+        ('plan', AuditHandler.model_to_dict_safe),
+    ):
+        queries, micros = measure(serializer, rows)
+        print(f'{label:>7}: {queries:.2f} queries/save, {micros:.1f} us/save')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Auth overhead per request of fastapi.auth: jose.jwt.decode on every
+request (legacy) vs prebuilt keys vs the verified-token cache.
+
+    python benchmarks/jwt_auth.py
+"""
+import time
+
+import rsa
+from jose import jwt
+
+from _django import setup
+
+setup(SIMPLE_JWT={'ALGORITHM': 'HS256', 'SIGNING_KEY': 'benchmark'})
+
+from django.test.utils import override_settings  # noqa: E402
+
+from dj_core_utils.fastapi import auth  # noqa: E402
+
+
+def measure(decode, token, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        decode(token)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def run(label, config, signing_key, verifying_key, requests):
+    claims = {'user_id': 1, 'email': 'a@b.c', 'exp': int(time.time()) + 3600}
+    token = jwt.encode(claims, signing_key, algorithm=config['ALGORITHM'])
+
+    with override_settings(SIMPLE_JWT={**config, 'TOKEN_CACHE_SIZE': 0}):
+        legacy = measure(
+            lambda t: jwt.decode(t, verifying_key, [config['ALGORITHM']]),
+            token, requests)
+        prebuilt = measure(auth.decode_token, token, requests)
+    with override_settings(SIMPLE_JWT=config):
+        cached = measure(auth.decode_token, token, requests)
+
+    print(
+        f'{label}: legacy {legacy:8.1f} us, prebuilt keys {prebuilt:8.1f} us,'
+        f' cached {cached:6.1f} us per request'
+    )
+
+
+def main(requests=2000):
+    run('HS256', {'ALGORITHM': 'HS256', 'SIGNING_KEY': 'benchmark'},
+        'benchmark', 'benchmark', requests)
+
+    public, private = (key.save_pkcs1().decode() for key in rsa.newkeys(2048))
+    run('RS256', {'ALGORITHM': 'RS256', 'VERIFYING_KEY': public},
+        private, public, requests // 10)
+
+
+if __name__ == '__main__':
+    main()
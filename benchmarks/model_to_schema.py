@@ -0,0 +1,127 @@
+"""
+Queries and time to serialize a list: legacy model_to_schema vs the
+compiled plan vs models_to_schemas.
+
+    python benchmarks/model_to_schema.py
+"""
+import time
+
+from _django import create_tables, setup
+
+setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, models  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from dj_core_utils.db.models import (  # noqa: E402
+    CoreBaseModel, OperationLog, TimeStampedModel, UserTrackedModel,
+)
+from dj_core_utils.fastapi.schemas import (  # noqa: E402
+    LockType, TimeStampedSchema, TrackedSchema, UniversalState,
+)
+from dj_core_utils.fastapi.utils import (  # noqa: E402
+    model_to_schema, models_to_schemas,
+)
+
+User = get_user_model()
+
+
+class Customer(models.Model):
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = 'dj_core_utils'
+
+
+class Order(CoreBaseModel):
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
+    seller = models.ForeignKey(
+        Customer, on_delete=models.CASCADE, related_name='sales')
+    total = models.IntegerField(default=0)
+
+
+class OrderSchema(TrackedSchema):
+    customer_id: int
+    seller_id: int
+    total: int
+
+
+def legacy_model_to_schema(django_instance, schema_class):
+    """fastapi.utils.model_to_schema before the compiled plans."""
+    model_dict = {}
+
+    for field in django_instance._meta.fields:
+        field_name = field.name
+        field_value = getattr(django_instance, field_name)
+
+        if field.is_relation:
+            if isinstance(field_value, User):
+                model_dict[f'{field_name}_id'] = field_value.id
+            elif hasattr(field_value, 'id'):
+                model_dict[f'{field_name}_id'] = field_value.id
+            continue
+
+        model_dict[field_name] = field_value
+
+    if isinstance(django_instance, TimeStampedModel):
+        if not issubclass(schema_class, (TimeStampedSchema, TrackedSchema)):
+            raise ValueError('TimeStampedModel models require '
+                             'TimeStampedSchema or TrackedSchema')
+
+    if isinstance(django_instance, UserTrackedModel):
+        model_dict.update({
+            'created_by': django_instance.created_by_id,
+            'updated_by': django_instance.updated_by_id,
+            'universal_state': UniversalState(django_instance.universal_state),
+            'lock_type': LockType(django_instance.lock_type),
+            'object_locked': django_instance.object_locked
+        })
+
+    if isinstance(django_instance, OperationLog):
+        model_dict['user_id'] = (
+            django_instance.user_id if django_instance.user else None
+        )
+        model_dict['changes'] = django_instance.changes
+
+    return schema_class(**model_dict)
+
+
+def measure(label, serialize, rows):
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        schemas = serialize()
+        elapsed = time.perf_counter() - start
+    assert len(schemas) == rows
+    print(f'{label:>18}: {len(ctx):4d} queries, {elapsed * 1000:7.1f} ms')
+    return schemas
+
+
+def main(rows=500):
+    create_tables()
+    user = User.objects.create(username='u')
+    customers = Customer.objects.bulk_create(
+        Customer(name=f'c{i}') for i in range(rows))
+    Order.objects.bulk_create(
+        Order(customer=customer, seller=customer, total=i,
+              created_by=user, updated_by=user)
+        for i, customer in enumerate(customers)
+    )
+
+    legacy = measure('legacy', lambda: [
+        legacy_model_to_schema(order, OrderSchema)
+        for order in Order.objects.all()
+    ], rows)
+    compiled = measure('compiled', lambda: [
+        model_to_schema(order, OrderSchema)
+        for order in Order.objects.all()
+    ], rows)
+    bulk = measure('models_to_schemas', lambda: list(
+        models_to_schemas(Order.objects.all(), OrderSchema)
+    ), rows)
+    assert [s.model_dump() for s in legacy] == \
+        [s.model_dump() for s in compiled] == [s.model_dump() for s in bulk]
+
+
+if __name__ == '__main__':
+    main()
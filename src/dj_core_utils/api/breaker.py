@@ -0,0 +1,76 @@
+import threading
+import time
+
+
+class CircuitState:
+    CLOSED = 'closed'        # requests flow normally
+    OPEN = 'open'            # requests fail fast
+    HALF_OPEN = 'half_open'  # a single probe request is let through
+
+
+class CircuitBreaker:
+    """
+    Per-service circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. Then one probe request
+    is allowed: success closes the circuit, failure opens it again. A
+    probe that ends without an outcome (``record_aborted``) reopens the
+    circuit, and one that never reports back is replaced by a new probe
+    after another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0  # apertura o inicio de la sonda
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a request can be sent now."""
+        if self.state == CircuitState.CLOSED or not self.failure_threshold:
+            return True
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                # OPEN: primera sonda; HALF_OPEN: la sonda anterior se perdió
+                self.state = CircuitState.HALF_OPEN
+                self._opened_at = now
+                return True
+        return False
+
+    def record_success(self) -> None:
+        if self.failures or self.state != CircuitState.CLOSED:
+            with self._lock:
+                self.failures = 0
+                self.state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN or (
+                self.failure_threshold
+                and self.failures >= self.failure_threshold
+            ):
+                self.state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_aborted(self) -> None:
+        """
+        The call ended without an outcome (cancelled or an unexpected
+        error): a probe reopens the circuit instead of leaving it half open.
+        """
+        if self.state == CircuitState.HALF_OPEN:
+            with self._lock:
+                if self.state == CircuitState.HALF_OPEN:
+                    self.state = CircuitState.OPEN
+                    self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = CircuitState.CLOSED
@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import httpx
+
+CacheKey = tuple[str, str, str, str]
+
+
+class _Entry:
+    __slots__ = ('value', 'etag', 'last_modified', 'expires_at')
+
+    def __init__(
+        self,
+        value: Any,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        expires_at: float,
+    ) -> None:
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+def _cache_control(response: httpx.Response) -> dict[str, Optional[str]]:
+    directives: dict[str, Optional[str]] = {}
+    for part in response.headers.get('Cache-Control', '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+class ResponseCache:
+    """
+    LRU cache of GET responses for AsyncAPIClient.
+
+    - Keyed by (service, endpoint, params, auth scope).
+    - Honors Cache-Control (no-store, no-cache, max-age) and revalidates
+      expired entries with If-None-Match / If-Modified-Since.
+    - Falls back to ``default_ttl`` when the response sets no max-age.
+    - Concurrent identical requests share a single upstream call.
+
+    Cached values are shared between callers: treat them as read-only.
+    """
+
+    def __init__(self, maxsize: int = 1024, default_ttl: float = 60):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._inflight: dict[tuple[Any, ...], asyncio.Future[Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.revalidated = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'revalidated': self.revalidated,
+            'size': len(self._entries),
+        }
+
+    def make_key(
+        self, service_name: str, endpoint: str, kwargs: dict[str, Any]
+    ) -> CacheKey:
+        params = kwargs.get('params') or {}
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        headers = kwargs.get('headers') or {}
+        authorization = (
+            headers.get('Authorization') or headers.get('authorization') or ''
+        )
+        scope = kwargs.get('cache_scope') or (
+            hashlib.sha256(authorization.encode()).hexdigest()[:16]
+            if authorization
+            else ''
+        )
+        return (service_name, endpoint.lstrip('/'), str(params), scope)
+
+    def invalidate(
+        self, service_name: str, endpoint: Optional[str] = None
+    ) -> None:
+        """Removes the entries of a service (or of one of its endpoints)."""
+        endpoint = endpoint.lstrip('/') if endpoint else None
+        for key in list(self._entries):
+            if key[0] == service_name and endpoint in (None, key[1]):
+                del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def fetch(
+        self, client: Any, endpoint: str, kwargs: dict[str, Any]
+    ) -> Any:
+        key = self.make_key(client.service_name, endpoint, kwargs)
+        entry = self._entries.get(key)
+        if entry is not None and entry.fresh:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+        inflight_key = (id(asyncio.get_running_loop()),) + key
+        inflight = self._inflight.get(inflight_key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(
+            self._load(client, endpoint, kwargs, key, entry)
+        )
+        self._inflight[inflight_key] = task
+        task.add_done_callback(
+            lambda _: self._inflight.pop(inflight_key, None)
+        )
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        client: Any,
+        endpoint: str,
+        kwargs: dict[str, Any],
+        key: CacheKey,
+        entry: Optional[_Entry],
+    ) -> Any:
+        self.misses += 1
+        kwargs = {k: v for k, v in kwargs.items() if k != 'cache_scope'}
+        headers = dict(kwargs.get('headers') or {})
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        kwargs['headers'] = headers
+
+        response = await client.send('GET', endpoint, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            entry.expires_at = time.monotonic() + self._ttl(response)
+            self._store(key, entry)
+            return entry.value
+
+        value = client.handle_response(response)
+        directives = _cache_control(response)
+        if 'no-store' not in directives:
+            self._store(
+                key,
+                _Entry(
+                    value,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    time.monotonic() + self._ttl(response, directives),
+                ),
+            )
+        return value
+
+    def _ttl(
+        self,
+        response: httpx.Response,
+        directives: Optional[dict[str, Optional[str]]] = None,
+    ) -> float:
+        directives = (
+            directives if directives is not None else _cache_control(response)
+        )
+        if 'no-cache' in directives:
+            return 0  # Se guarda, pero siempre se revalida
+        try:
+            return float(directives.get('max-age') or '')
+        except ValueError:
+            return self.default_ttl
+
+    def _store(self, key: CacheKey, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Singleton for global use
+response_cache = ResponseCache()
@@ -1,32 +1,471 @@
+import asyncio
+import atexit
+import os
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Iterable, NamedTuple, Optional
+
 import httpx
 from django.conf import settings
-from .exceptions import APIClientError
+from django.core.signals import setting_changed
+from .breaker import CircuitBreaker
+from .cache import ResponseCache, response_cache
+from .exceptions import (
+    APIClientError,
+    CircuitOpenError,
+    ServiceTimeoutError,
+    ServiceUnavailableError,
+)
 
+DEFAULTS: dict[str, Any] = {
+    'BASE_URL': None,
+    'MAX_CONNECTIONS': 100,
+    'MAX_KEEPALIVE_CONNECTIONS': 20,
+    'KEEPALIVE_EXPIRY': 5.0,
+    'CONNECT_TIMEOUT': 5.0,
+    'READ_TIMEOUT': 30.0,
+    'WRITE_TIMEOUT': 30.0,
+    'POOL_TIMEOUT': 5.0,
+    'HTTP2': False,  # Requiere httpx[http2]
+    'CACHE': False,  # Cache de respuestas GET (ResponseCache)
+    # Reintentos (solo metodos idempotentes), backoff exponencial con jitter
+    'RETRIES': 2,
+    'RETRY_BACKOFF': 0.1,
+    'RETRY_BACKOFF_MAX': 2.0,
+    'RETRY_STATUSES': (429, 502, 503, 504),
+    # Circuit breaker por servicio (0 lo desactiva)
+    'CIRCUIT_FAILURE_THRESHOLD': 5,
+    'CIRCUIT_RESET_TIMEOUT': 30.0,
+}
 
-class AsyncAPIClient:
-    def __init__(self, service_name):
-        self.base_url = (
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+class APIResult(NamedTuple):
+    """Outcome of one call of AsyncAPIClient.gather."""
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def get_service_config(service_name: str) -> dict[str, Any]:
+    """
+    API_CLIENT defaults merged with the overrides of the service:
+        API_CLIENT = {'READ_TIMEOUT': 10, 'SERVICES': {'users': {...}}}
+    """
+    custom = dict(getattr(settings, 'API_CLIENT', {}))
+    services = custom.pop('SERVICES', {})
+    config = {**DEFAULTS, **custom, **services.get(service_name, {})}
+
+    if not config['BASE_URL']:
+        config['BASE_URL'] = (
             f"http://{service_name}:8000/api"
             if settings.IS_MICROSERVICE
             else "http://localhost:8000/api"
         )
 
+    headers = {}
+    if settings.IS_MICROSERVICE:
+        headers['Authorization'] = f'Service {settings.SERVICE_API_KEY}'
+    config['HEADERS'] = headers
+    return config
+
+
+class ClientRegistry:
+    """
+    Process-wide pool of httpx clients, one per service.
+
+    Base URL, headers, limits and timeouts are computed once, when the
+    client of a service is created. Async clients are kept per event loop
+    because their connections cannot be shared between loops, and are
+    closed when their loop shuts down (asyncio.run, async_to_sync) or on
+    ``aclose()``; sync clients are thread-safe and shared by every thread
+    of the process.
+    """
+
+    def __init__(self):
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._closers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._sync_clients: dict[str, httpx.Client] = {}
+        self._sync_pid = os.getpid()
+        self._lock = threading.Lock()
+        self._configs: dict[str, dict[str, Any]] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def config(self, service_name: str) -> dict[str, Any]:
+        config = self._configs.get(service_name)
+        if config is None:
+            config = self._configs[service_name] = get_service_config(
+                service_name)
+        return config
+
+    def clear_configs(self, **kwargs) -> None:
+        self._configs = {}
+        self._breakers = {}
+
+    def breaker(self, service_name: str) -> CircuitBreaker:
+        """Circuit breaker of a service, shared by the whole process."""
+        breaker = self._breakers.get(service_name)
+        if breaker is None:
+            config = self.config(service_name)
+            breaker = self._breakers[service_name] = CircuitBreaker(
+                config['CIRCUIT_FAILURE_THRESHOLD'],
+                config['CIRCUIT_RESET_TIMEOUT'],
+            )
+        return breaker
+
+    def get(self, service_name: str) -> httpx.AsyncClient:
+        clients = self._loop_clients()
+        client = clients.get(service_name)
+        if client is None or client.is_closed:
+            client = clients[service_name] = self._create(service_name)
+        return client
+
+    def get_sync(self, service_name: str) -> httpx.Client:
+        if self._sync_pid != os.getpid():
+            # Las conexiones heredadas de un fork no se comparten
+            self._sync_clients = {}
+            self._sync_pid = os.getpid()
+        client = self._sync_clients.get(service_name)
+        if client is None or client.is_closed:
+            with self._lock:
+                client = self._sync_clients.get(service_name)
+                if client is None or client.is_closed:
+                    client = self._sync_clients[service_name] = httpx.Client(
+                        **self._options(service_name))
+        return client
+
+    def close(self) -> None:
+        """Closes the sync clients."""
+        with self._lock:
+            clients, self._sync_clients = self._sync_clients, {}
+        for client in clients.values():
+            client.close()
+
+    async def open(self, *service_names: str) -> None:
+        """Creates the pools ahead of time (e.g. on application startup)."""
+        for service_name in service_names:
+            self.get(service_name)
+
+    async def aclose(self) -> None:
+        clients = self._loop_clients()
+        while clients:
+            _, client = clients.popitem()
+            await client.aclose()
+
+    def _loop_clients(self) -> dict[str, httpx.AsyncClient]:
+        loop = asyncio.get_running_loop()
+        clients = self._clients.get(loop)
+        if clients is None:
+            clients = self._clients[loop] = {}
+            self._closers[loop] = self._close_on_shutdown(clients)
+        return clients
+
+    @staticmethod
+    def _close_on_shutdown(clients: dict[str, httpx.AsyncClient]):
+        """
+        Async generator that closes the clients of the running loop when
+        it is finalized: asyncio.run (and so async_to_sync) calls
+        loop.shutdown_asyncgens() before closing the loop.
+        """
+        async def closer():
+            try:
+                yield
+            finally:
+                while clients:
+                    _, client = clients.popitem()
+                    await client.aclose()
+
+        generator = closer()
+        # Primer paso síncrono: el loop lo registra en sus asyncgens
+        try:
+            generator.asend(None).send(None)
+        except StopIteration:
+            pass
+        return generator
+
+    def _create(self, service_name: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(**self._options(service_name))
+
+    def _options(self, service_name: str) -> dict[str, Any]:
+        config = self.config(service_name)
+        return dict(
+            base_url=config['BASE_URL'],
+            headers=config['HEADERS'],
+            http2=config['HTTP2'],
+            limits=httpx.Limits(
+                max_connections=config['MAX_CONNECTIONS'],
+                max_keepalive_connections=config['MAX_KEEPALIVE_CONNECTIONS'],
+                keepalive_expiry=config['KEEPALIVE_EXPIRY'],
+            ),
+            timeout=httpx.Timeout(
+                connect=config['CONNECT_TIMEOUT'],
+                read=config['READ_TIMEOUT'],
+                write=config['WRITE_TIMEOUT'],
+                pool=config['POOL_TIMEOUT'],
+            ),
+        )
+
+
+# Singleton for global use
+registry = ClientRegistry()
+setting_changed.connect(registry.clear_configs)
+atexit.register(registry.close)
+
+
+@asynccontextmanager
+async def lifespan(app=None, services=()):
+    """
+    Opens the pools on startup and closes them on shutdown:
+        app = FastAPI(lifespan=lifespan)
+    """
+    await registry.open(*services)
+    try:
+        yield
+    finally:
+        await registry.aclose()
+
+
+class BaseAPIClient:
+    """Configuration, retry policy and error mapping shared by the clients."""
+
+    def __init__(self, service_name):
+        self.service_name = service_name
+        self.config = registry.config(service_name)
+        self.base_url = self.config['BASE_URL']
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return registry.breaker(self.service_name)
+
+    def handle_response(self, response: httpx.Response):
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise APIClientError(
+                f"API Error: {e.response.text}",
+                status_code=e.response.status_code,
+            )
+        return response.json()
+
+    def _retries(self, method: str) -> int:
+        if method.upper() in IDEMPOTENT_METHODS:
+            return self.config['RETRIES']
+        return 0
+
+    def _check_circuit(self) -> None:
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.service_name)
+
+    def _retry(self, response: httpx.Response) -> bool:
+        return response.status_code in self.config['RETRY_STATUSES']
+
+    def _record(self, response: httpx.Response) -> None:
+        """Updates the breaker with the final response of a request."""
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _transport_error(self, error: httpx.TransportError) -> APIClientError:
+        self.breaker.record_failure()
+        if isinstance(error, httpx.TimeoutException):
+            return ServiceTimeoutError()
+        return ServiceUnavailableError(
+            f'Service {self.service_name} unavailable: {error}')
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: random delay up to the exponential backoff."""
+        return random.uniform(0, min(
+            self.config['RETRY_BACKOFF_MAX'],
+            self.config['RETRY_BACKOFF'] * 2 ** attempt,
+        ))
+
+
+class AsyncAPIClient(BaseAPIClient):
+    """
+    Client of another service. With ``cache=True`` (or a ResponseCache,
+    or 'CACHE': True in the service config) GET requests are cached and
+    concurrent identical GETs are coalesced.
+
+    Idempotent requests are retried on timeouts, connection errors and
+    RETRY_STATUSES, and every service has a circuit breaker that fails
+    fast (CircuitOpenError) while it is down.
+    """
+
+    def __init__(self, service_name, cache=None):
+        super().__init__(service_name)
+        if cache is None:
+            cache = self.config['CACHE']
+        if cache is True:
+            cache = response_cache
+        self.cache: Optional[ResponseCache] = cache or None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return registry.get(self.service_name)
+
     async def request(self, method, endpoint, **kwargs):
-        async with httpx.AsyncClient() as client:
+        if self.cache is not None and method.upper() == 'GET':
+            return await self.cache.fetch(self, endpoint, kwargs)
+        kwargs.pop('cache_scope', None)
+        response = await self.send(method, endpoint, **kwargs)
+        return self.handle_response(response)
+
+    async def get(self, endpoint, **kwargs):
+        return await self.request('GET', endpoint, **kwargs)
+
+    async def batch(
+        self,
+        requests: Iterable[tuple],
+        concurrency: int = 10,
+    ) -> list[APIResult]:
+        """
+        Runs (method, endpoint[, kwargs]) requests to this service
+        concurrently. Returns an APIResult per request, in order.
+        """
+        return await self.gather(
+            *(self.request(method, endpoint, **(rest[0] if rest else {}))
+              for method, endpoint, *rest in requests),
+            concurrency=concurrency,
+        )
+
+    @staticmethod
+    async def gather(
+        *calls: Awaitable,
+        concurrency: int = 10,
+    ) -> list[APIResult]:
+        """
+        Awaits the calls (of any service) with at most ``concurrency`` in
+        flight. A failed call does not cancel the others: returns an
+        APIResult per call, in order.
+            users, orders = await AsyncAPIClient.gather(
+                AsyncAPIClient('users').get('me/'),
+                AsyncAPIClient('orders').get('orders/'),
+            )
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(call):
+            async with semaphore:
+                try:
+                    return APIResult(await call)
+                except Exception as e:
+                    return APIResult(error=e)
+
+        return list(await asyncio.gather(*(run(call) for call in calls)))
+
+    async def send(self, method, endpoint, **kwargs) -> httpx.Response:
+        """
+        Sends the request and returns the raw response. Retries are one
+        call for the circuit breaker: only the final outcome is recorded.
+        """
+        self._check_circuit()
+        retries = self._retries(method)
+        attempt = 0
+        try:
+            while True:
+                try:
+                    response = await self.client.request(
+                        method,
+                        endpoint,
+                        **kwargs
+                    )
+                except httpx.TransportError as e:
+                    if attempt >= retries:
+                        raise self._transport_error(e)
+                else:
+                    if attempt >= retries or not self._retry(response):
+                        self._record(response)
+                        return response
+                    await response.aclose()
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+        except APIClientError:
+            raise
+        except BaseException:
+            # Cancelado o error inesperado: la sonda no queda colgada
+            self.breaker.record_aborted()
+            raise
+
+
+class SyncAPIClient(BaseAPIClient):
+    """
+    Blocking client of another service for WSGI views, management
+    commands and Celery tasks. Same settings, retries, circuit breaker
+    and errors as AsyncAPIClient, over a persistent httpx.Client per
+    service shared by every thread of the process. Responses are not
+    cached (ResponseCache is async only).
+    """
+
+    @property
+    def client(self) -> httpx.Client:
+        return registry.get_sync(self.service_name)
+
+    def request(self, method, endpoint, **kwargs):
+        kwargs.pop('cache_scope', None)
+        response = self.send(method, endpoint, **kwargs)
+        return self.handle_response(response)
+
+    def get(self, endpoint, **kwargs):
+        return self.request('GET', endpoint, **kwargs)
+
+    def batch(
+        self,
+        requests: Iterable[tuple],
+        concurrency: int = 10,
+    ) -> list[APIResult]:
+        """
+        Runs (method, endpoint[, kwargs]) requests in a thread pool over
+        the shared connection pool. Returns an APIResult per request.
+        """
+        def run(request):
+            method, endpoint, *rest = request
+            kwargs = rest[0] if rest else {}
             try:
-                response = await client.request(
-                    method,
-                    f"{self.base_url}/{endpoint}",
-                    headers=self._get_headers(),
-                    **kwargs
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise APIClientError(f"API Error: {e.response.text}")
-
-    def _get_headers(self):
-        headers = {}
-        if settings.IS_MICROSERVICE:
-            headers['Authorization'] = f'Service {settings.SERVICE_API_KEY}'
-        return headers
+                return APIResult(self.request(method, endpoint, **kwargs))
+            except Exception as e:
+                return APIResult(error=e)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(run, requests))
+
+    def send(self, method, endpoint, **kwargs) -> httpx.Response:
+        """
+        Sends the request and returns the raw response. Retries are one
+        call for the circuit breaker: only the final outcome is recorded.
+        """
+        self._check_circuit()
+        retries = self._retries(method)
+        attempt = 0
+        try:
+            while True:
+                try:
+                    response = self.client.request(
+                        method,
+                        endpoint,
+                        **kwargs
+                    )
+                except httpx.TransportError as e:
+                    if attempt >= retries:
+                        raise self._transport_error(e)
+                else:
+                    if attempt >= retries or not self._retry(response):
+                        self._record(response)
+                        return response
+                    response.close()
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+        except APIClientError:
+            raise
+        except BaseException:
+            # Error inesperado o interrupción: la sonda no queda colgada
+            self.breaker.record_aborted()
+            raise
@@ -11,3 +11,18 @@ class ServiceTimeoutError(APIClientError):
 
     def __init__(self):
         super().__init__('Service timeout', 504)
+
+
+class ServiceUnavailableError(APIClientError):
+    """The service could not be reached (connection or protocol error)"""
+
+    def __init__(self, message='Service unavailable'):
+        super().__init__(message, 503)
+
+
+class CircuitOpenError(ServiceUnavailableError):
+    """The circuit breaker of the service is open: the call was not sent"""
+
+    def __init__(self, service_name):
+        self.service_name = service_name
+        super().__init__(f'Circuit open for service {service_name}')
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class CoreUtilsConfig(AppConfig):
+    name = 'dj_core_utils'
+    # Las migraciones del paquete usan AutoField: no depende del
+    # DEFAULT_AUTO_FIELD del proyecto (que pediría una 0002 en site-packages)
+    default_auto_field = 'django.db.models.AutoField'
@@ -1,6 +1,120 @@
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from django.contrib.auth.models import AnonymousUser
+import threading
+import time
+from collections import OrderedDict
+
 from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Claims que se copian a la instancia si el modelo tiene el campo
+USER_CLAIMS = (
+    'email', 'is_active', 'is_staff', 'is_superuser', 'username', 'user_type'
+)
+
+
+class UserCache:
+    """
+    Per-process LRU of user rows for ``ttl`` seconds, invalidated on
+    post_save / post_delete of the user model and bounded to ``maxsize``
+    users. Every hit builds a new instance, so requests never share a
+    mutable User.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._rows: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model, pk):
+        # simplejwt guarda el id como str en el token
+        key = str(pk)
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is None:
+                return None
+            field_names, values, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._rows[key]
+                return None
+            self._rows.move_to_end(key)
+        return model.from_db(DEFAULT_DB_ALIAS, field_names, values)
+
+    def set(self, user, ttl: float) -> None:
+        fields = user._meta.concrete_fields
+        key = str(user.pk)
+        with self._lock:
+            self._rows[key] = (
+                [field.attname for field in fields],
+                [getattr(user, field.attname) for field in fields],
+                time.monotonic() + ttl,
+            )
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.maxsize:
+                self._rows.popitem(last=False)
+
+    def invalidate(self, pk) -> None:
+        with self._lock:
+            self._rows.pop(str(pk), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+
+
+# Singleton for global use
+user_cache = UserCache()
+
+
+def _invalidate_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+post_save.connect(_invalidate_user, sender=settings.AUTH_USER_MODEL)
+post_delete.connect(_invalidate_user, sender=settings.AUTH_USER_MODEL)
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError(
+        'Token users are read-only: load the user from the database '
+        'to modify it')
+
+
+def token_user(model, validated_token):
+    """
+    Read-only user instance built from the token claims without
+    querying: as with ``.only()``, the fields not carried by the token
+    are deferred and loaded from the database the first time they are
+    accessed. Claims that are not fields (e.g. user_type) are set as
+    attributes. save() and delete() raise, so claims that may be stale
+    are never written back.
+    """
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    id_field = model._meta.get_field(api_settings.USER_ID_FIELD)
+
+    field_names = [id_field.attname]
+    values = [id_field.to_python(validated_token[api_settings.USER_ID_CLAIM])]
+    extra = {}
+    for claim in USER_CLAIMS:
+        if claim not in validated_token:
+            continue
+        if claim in fields and claim != id_field.attname:
+            field_names.append(claim)
+            values.append(validated_token[claim])
+        elif claim not in fields:
+            extra[claim] = validated_token[claim]
+
+    user = model.from_db(DEFAULT_DB_ALIAS, field_names, values)
+    user.__dict__.update(extra)
+    user.save = user.delete = _read_only
+    return user
 
 
 class CustomJWTAuthentication(JWTAuthentication):
@@ -8,6 +122,11 @@ class CustomJWTAuthentication(JWTAuthentication):
     Custom backend that:
     - Validates JWT tokens
     - Supports service-to-service authentication
+    - With JWT_STATELESS_USER builds the user from the token claims
+      (no query per request, see token_user). Only an ``is_active``
+      claim is checked: deactivating a user takes effect when its
+      access tokens expire, keep ACCESS_TOKEN_LIFETIME short
+    - With JWT_USER_CACHE_TTL caches the users loaded from the database
     """
 
     def authenticate(self, request):
@@ -16,7 +135,7 @@ class CustomJWTAuthentication(JWTAuthentication):
             user_token = super().authenticate(request)
             if user_token:
                 return user_token
-        except Exception:
+        except (InvalidToken, AuthenticationFailed):
             pass
 
         # 2. Fallback a autenticación servicio-servicio
@@ -28,3 +147,41 @@ class CustomJWTAuthentication(JWTAuthentication):
 
         # 3. No autenticado
         return None
+
+    def get_user(self, validated_token):
+        stateless = getattr(settings, 'JWT_STATELESS_USER', False)
+        # Revocar por cambio de password requiere el hash de la BD
+        if stateless and not api_settings.CHECK_REVOKE_TOKEN:
+            if api_settings.USER_ID_CLAIM not in validated_token:
+                raise InvalidToken(
+                    'Token contained no recognizable user identification')
+            # Solo el claim: desactivar al usuario no invalida sus tokens
+            if api_settings.CHECK_USER_IS_ACTIVE and \
+                    validated_token.get('is_active') is False:
+                raise AuthenticationFailed(
+                    'User is inactive', code='user_inactive')
+            return token_user(self.user_model, validated_token)
+
+        ttl = getattr(settings, 'JWT_USER_CACHE_TTL', 0)
+        if not ttl or api_settings.USER_ID_FIELD != 'id':
+            return super().get_user(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(self.user_model, user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user, ttl)
+            return user
+
+        # Mismas validaciones que JWTAuthentication.get_user
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(
+                'User is inactive', code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                "The user's password has been changed.",
+                code='password_changed',
+            )
+        return user
@@ -0,0 +1,132 @@
+from typing import Iterable, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import (
+    Count, IntegerField, Model, OuterRef, Q, QuerySet, Subquery
+)
+from django.db.models.functions import Coalesce
+
+from .mixins import UniversalState
+from .models import Comments, File
+
+# (atributo de la lista, nombre del conteo, modelo)
+ATTACHMENTS = (
+    ('attached_files', 'files_count', File),
+    ('attached_comments', 'comments_count', Comments),
+)
+
+
+def _attachment_models(files: bool, comments: bool):
+    return [
+        entry for entry, wanted in zip(ATTACHMENTS, (files, comments))
+        if wanted
+    ]
+
+
+def _check_integer_pk(model: type[Model]) -> None:
+    # object_id es un PositiveIntegerField: otras pk no pueden tener adjuntos
+    pk = model._meta.pk
+    while pk.is_relation:
+        pk = pk.target_field
+    if not isinstance(pk, IntegerField):
+        raise ValueError(
+            f'{model.__name__} has a non-integer primary key; attachments '
+            f'are keyed by an integer object_id.'
+        )
+
+
+def prefetch_attachments(
+    objects: Iterable[Model],
+    files: bool = True,
+    comments: bool = True,
+    state: Optional[str] = UniversalState.ACTIVE,
+    using: Optional[str] = None,
+) -> list[Model]:
+    """
+    Loads the files and comments of a page of objects with one query
+    per type (served by the (content_type, object_id, universal_state)
+    index) and sets them as ``obj.attached_files`` and
+    ``obj.attached_comments``. ``state=None`` loads every state.
+
+    Objects of several models can be mixed; content types come from
+    the ContentType manager cache. Unsaved objects get empty lists;
+    models without an integer primary key raise ValueError. Returns the
+    objects as a list.
+    """
+    objects = list(objects)
+    if not objects:
+        return objects
+    if using is None:
+        using = objects[0]._state.db
+    content_types = ContentType.objects.db_manager(using)
+
+    for model in {type(obj) for obj in objects}:
+        _check_integer_pk(model)
+    targets = {}
+    for obj in objects:
+        if obj.pk is None:
+            continue
+        content_type = content_types.get_for_model(obj)
+        targets.setdefault(content_type.pk, set()).add(obj.pk)
+    if not targets:
+        for attr, _, _ in _attachment_models(files, comments):
+            for obj in objects:
+                setattr(obj, attr, [])
+        return objects
+    condition = Q()
+    for content_type_id, pks in targets.items():
+        condition |= Q(content_type_id=content_type_id, object_id__in=pks)
+
+    for attr, _, model in _attachment_models(files, comments):
+        queryset = model._default_manager.using(using).filter(condition)
+        if state is not None:
+            queryset = queryset.filter(universal_state=state)
+        content_object = model._meta.get_field('content_object')
+
+        grouped = {}
+        for attachment in queryset:
+            grouped.setdefault(
+                (attachment.content_type_id, attachment.object_id), []
+            ).append(attachment)
+        for obj in objects:
+            key = (content_types.get_for_model(obj).pk, obj.pk)
+            attachments = grouped.get(key, [])
+            for attachment in attachments:
+                # Evita la consulta de attachment.content_object
+                content_object.set_cached_value(attachment, obj)
+            setattr(obj, attr, attachments)
+    return objects
+
+
+def annotate_attachment_counts(
+    queryset: QuerySet,
+    files: bool = True,
+    comments: bool = True,
+    state: Optional[str] = UniversalState.ACTIVE,
+) -> QuerySet:
+    """
+    Annotates ``files_count`` and ``comments_count`` with correlated
+    subqueries over the (content_type, object_id, universal_state)
+    index, in the same query as the objects. Models without an integer
+    primary key raise ValueError.
+    """
+    _check_integer_pk(queryset.model)
+    content_type = ContentType.objects.db_manager(
+        queryset.db).get_for_model(queryset.model)
+    annotations = {}
+    for _, name, model in _attachment_models(files, comments):
+        attachments = model._default_manager.filter(
+            content_type_id=content_type.pk,
+            object_id=OuterRef('pk'),
+        )
+        if state is not None:
+            attachments = attachments.filter(universal_state=state)
+        counts = (
+            attachments.order_by()
+            .values('object_id')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        annotations[name] = Coalesce(
+            Subquery(counts, output_field=IntegerField()), 0)
+    return queryset.annotate(**annotations)
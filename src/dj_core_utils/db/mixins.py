@@ -1,4 +1,9 @@
-from django.db import models
+from copy import deepcopy
+from typing import Any, Iterable, Optional
+
+from django.db import models, router, transaction
+from django.db.models import DEFERRED
+from django.utils import timezone
 
 
 class LockType(models.TextChoices):
@@ -15,7 +20,212 @@ class UniversalState(models.TextChoices):
     TERMINATED = 'terminated', 'Terminated'
 
 
-class UniversalStateMixin(models.Model):
+def _snapshot_value(value):
+    # Solo los valores mutables (p. ej. JSONField) necesitan copia
+    if isinstance(value, (dict, list)):
+        return deepcopy(value)
+    return value
+
+
+def is_auto_updated(field) -> bool:
+    """True for the fields save() refreshes on every update."""
+    return getattr(field, 'auto_now', False) or \
+        getattr(field, 'on_update', False)
+
+
+def auto_update_values(model, user=None) -> dict[str, Any]:
+    """
+    {attname: value} of the auto_now / on_update fields (updated_at,
+    updated_by) as save() would set them, for writes that skip pre_save
+    (update(), bulk_update()).
+    """
+    now = timezone.now()
+    values = {}
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False):
+            values[field.attname] = now
+        elif getattr(field, 'on_update', False):
+            values[field.attname] = getattr(user, 'pk', None)
+    return values
+
+
+class ChangeTrackingMixin(models.Model):
+    """
+    Keeps the field values loaded from the database to compute changes
+    in memory, without fetching the row again.
+
+    With ``save_dirty_fields_only = True`` ``save()`` only writes the
+    changed fields plus the ones updated automatically (auto_now, on_update).
+    """
+    save_dirty_fields_only = False
+
+    _loaded_values: Optional[dict[str, Any]] = None
+
+    class Meta:
+        app_label = 'dj_core_utils'
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: _snapshot_value(value)
+            for name, value in zip(field_names, values)
+            if value is not DEFERRED
+        }
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(
+            using=using, fields=fields, from_queryset=from_queryset
+        )
+        self._take_snapshot(fields)
+
+    def save(self, *args, **kwargs):
+        if (
+            self.save_dirty_fields_only
+            and not args
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+            and not self._state.adding
+            and self._loaded_values is not None
+        ):
+            kwargs['update_fields'] = self._get_update_fields()
+        super().save(*args, **kwargs)
+        self._take_snapshot(kwargs.get('update_fields'))
+
+    def get_dirty_fields(self, fields: Optional[Iterable[str]] = None) -> set[str]:
+        """Returns the attnames changed since the instance was loaded."""
+        return set(self.get_changes(fields))
+
+    def get_changes(
+            self,
+            fields: Optional[Iterable[str]] = None) -> dict[str, Any]:
+        """Returns {attname: {'before': ..., 'after': ...}} of changed fields."""
+        loaded = self._loaded_values or {}
+        values = self.__dict__
+        attnames = self._get_attnames(fields)
+        changes = {}
+        for field in self._meta.concrete_fields:
+            attname = field.attname
+            if attname not in values:
+                continue  # Campo diferido que nunca se cargó
+            if attnames is not None and attname not in attnames:
+                continue
+            before = loaded.get(attname)
+            after = values[attname]
+            if attname not in loaded or before != after:
+                changes[attname] = {'before': before, 'after': after}
+        return changes
+
+    def _get_update_fields(self) -> list[str]:
+        update_fields = self.get_dirty_fields()
+        for field in self._meta.concrete_fields:
+            if is_auto_updated(field):
+                update_fields.add(field.attname)
+        update_fields.discard(self._meta.pk.attname)
+        return list(update_fields)
+
+    def _get_attnames(
+            self,
+            fields: Optional[Iterable[str]]) -> Optional[set[str]]:
+        if fields is None:
+            return None
+        fields = set(fields)
+        return {
+            field.attname for field in self._meta.concrete_fields
+            if field.name in fields or field.attname in fields
+        }
+
+    def _take_snapshot(self, fields: Optional[Iterable[str]] = None):
+        if self._loaded_values is None:
+            self._loaded_values = {}
+        values = self.__dict__
+        attnames = self._get_attnames(fields)
+        for field in self._meta.concrete_fields:
+            attname = field.attname
+            if attname in values and (attnames is None or attname in attnames):
+                self._loaded_values[attname] = _snapshot_value(values[attname])
+
+
+def _current_user():
+    from django_currentuser.middleware import get_current_authenticated_user
+
+    from dj_core_utils.middleware.context import get_current_user
+
+    user = get_current_user() or get_current_authenticated_user()
+    return user if getattr(user, 'is_authenticated', False) else None
+
+
+class UniversalStateQuerySet(models.QuerySet):
+    """
+    State transitions as a single UPDATE ... WHERE. Rows that are locked
+    (object_locked or lock_type other than full access) are not touched.
+    auto_now / on_update fields (updated_at, updated_by) are set as
+    save() would, and the OperationLog rows of the affected pks are
+    buffered as one batch (``audit=False`` to skip them).
+    """
+
+    def active(self):
+        return self.filter(universal_state=UniversalState.ACTIVE)
+
+    def writable(self):
+        return self.filter(
+            object_locked=False, lock_type=LockType.FULL_ACCESS)
+
+    def activate(self, user=None, audit: bool = True) -> int:
+        return self.set_state(UniversalState.ACTIVE, user, audit)
+
+    def freeze(self, user=None, audit: bool = True) -> int:
+        return self.set_state(UniversalState.FROZEN, user, audit)
+
+    def terminate(self, user=None, audit: bool = True) -> int:
+        return self.set_state(UniversalState.TERMINATED, user, audit)
+
+    def set_state(self, state: str, user=None, audit: bool = True) -> int:
+        """Returns the number of rows changed."""
+        user = user or _current_user()
+        values = {
+            'universal_state': state,
+            **auto_update_values(self.model, user),
+        }
+
+        using = self._db or router.db_for_write(self.model)
+        queryset = self.using(using).writable().exclude(
+            universal_state=state)
+        with transaction.atomic(using=using, savepoint=False):
+            before = []
+            if audit and self._audited():
+                before = list(
+                    queryset.select_for_update()
+                    .values_list('pk', *values)
+                )
+            count = queryset.update(**values)
+            self._audit(before, values, user, using)
+        return count
+
+    def _audited(self) -> bool:
+        from dj_core_utils.signals.bulk import audit_handler
+
+        return audit_handler(self.model) is not None
+
+    def _audit(self, rows, values, user, using) -> None:
+        from dj_core_utils.signals.bulk import log_updated
+
+        log_updated(self.model, {
+            pk: {
+                attname: {'before': old, 'after': new}
+                for (attname, new), old in zip(values.items(), previous)
+                if old != new
+            }
+            for pk, *previous in rows
+        }, using=using, user=user)
+
+
+UniversalStateManager = models.Manager.from_queryset(UniversalStateQuerySet)
+
+
+class UniversalStateMixin(ChangeTrackingMixin):
     lock_type = models.CharField(
         max_length=10,
         choices=LockType.choices,
@@ -29,21 +239,31 @@ class UniversalStateMixin(models.Model):
         db_index=True
     )
 
+    objects = UniversalStateManager()
+
     class Meta:
         app_label = 'dj_core_utils'
         abstract = True
 
     def activate(self):
-        self.universal_state = UniversalState.ACTIVE
-        self.save()
+        self.set_state(UniversalState.ACTIVE)
 
     def deactivate(self):
-        self.universal_state = UniversalState.FROZEN
-        self.save()
+        self.set_state(UniversalState.FROZEN)
 
     def terminate(self):
-        self.universal_state = UniversalState.TERMINATED
-        self.save()
+        self.set_state(UniversalState.TERMINATED)
+
+    def set_state(self, state: str):
+        """Saves only the state and the auto-updated fields."""
+        self.universal_state = state
+        if self._state.adding:
+            self.save()
+            return
+        self.save(update_fields=['universal_state'] + [
+            field.name for field in self._meta.concrete_fields
+            if is_auto_updated(field)
+        ])
 
     def is_active(self):
         return self.universal_state == UniversalState.ACTIVE
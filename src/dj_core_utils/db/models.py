@@ -1,10 +1,12 @@
 from django.db import models
 from django_currentuser.db.models import CurrentUserField
 from django.contrib.contenttypes.fields import (
-    GenericForeignKey
+    GenericForeignKey, GenericRelation
 )
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
 
 from .mixins import UniversalStateMixin
 
@@ -78,6 +80,13 @@ class File(CoreBaseModel):
         app_label = 'dj_core_utils'
         verbose_name = 'archivo'
         verbose_name_plural = 'archivos'
+        indexes = [
+            # Archivos de un objeto (prefetch_attachments)
+            models.Index(
+                fields=['content_type', 'object_id', 'universal_state'],
+                name='file_object_state_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.file.name if self.file else 'Archivo sin nombre'
@@ -94,6 +103,13 @@ class Comments(CoreBaseModel):
         app_label = 'dj_core_utils'
         verbose_name = 'comentario'
         verbose_name_plural = 'comentarios'
+        indexes = [
+            # Comentarios de un objeto (prefetch_attachments)
+            models.Index(
+                fields=['content_type', 'object_id', 'universal_state'],
+                name='comment_object_state_idx'
+            ),
+        ]
 
     def __str__(self):
         text = self.comment
@@ -102,6 +118,20 @@ class Comments(CoreBaseModel):
         return text
 
 
+class AttachmentsMixin(models.Model):
+    """
+    Reverse generic relations to File and Comments: ``obj.files.all()``,
+    ``filter(comments__comment__icontains=...)`` and deleting the object
+    deletes its attachments. See db.attachments to load them in batch.
+    """
+    files = GenericRelation(File)
+    comments = GenericRelation(Comments)
+
+    class Meta:
+        app_label = 'dj_core_utils'
+        abstract = True
+
+
 class OperationType(models.TextChoices):
     CREATE = 'create', 'Create'
     UPDATE = 'update', 'Update'
@@ -109,26 +139,43 @@ class OperationType(models.TextChoices):
 
 
 class OperationLog(models.Model):
+    # Sin índice propio: oplog_user_date_idx ya empieza por user
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
         blank=True,
-        on_delete=models.SET_NULL
+        on_delete=models.SET_NULL,
+        db_index=False
     )
     model_changed = models.CharField(max_length=100)
     id_instance = models.PositiveIntegerField()
-    # 'create', 'update', 'delete'
+    # 'create', 'update', 'delete' o 'm2m_<action>' ('m2m_post_remove')
     operation_type = models.CharField(
-        max_length=10,
+        max_length=20,
         choices=OperationType.choices
     )
-    date = models.DateTimeField(auto_now_add=True)
-    changes = models.JSONField(null=True, blank=True)
+    # Se asigna al registrar la operación, no al escribir el log
+    date = models.DateTimeField(default=timezone.now, editable=False)
+    changes = models.JSONField(
+        null=True, blank=True, encoder=DjangoJSONEncoder
+    )
 
     class Meta:
         app_label = 'dj_core_utils'
         verbose_name = 'log'
         verbose_name_plural = 'logs'
+        indexes = [
+            # Historial de una instancia
+            models.Index(
+                fields=['model_changed', 'id_instance', 'date'],
+                name='oplog_instance_date_idx'
+            ),
+            # Cambios de un usuario en un rango de fechas
+            models.Index(
+                fields=['user', 'date'],
+                name='oplog_user_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return (
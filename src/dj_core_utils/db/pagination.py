@@ -0,0 +1,191 @@
+import json
+from decimal import Decimal
+from typing import Any, NamedTuple, Optional, Sequence
+from uuid import UUID
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q, QuerySet
+
+CURSOR_SALT = 'dj_core_utils.pagination'
+
+
+class InvalidCursor(ValueError):
+    """The pagination cursor could not be decoded."""
+
+
+class CountMode:
+    NONE = 'none'          # no count, the cheapest option
+    EXACT = 'exact'        # SELECT COUNT(*)
+    ESTIMATE = 'estimate'  # planner statistics on PostgreSQL
+
+
+class CursorPage(NamedTuple):
+    results: list
+    next: Optional[str]
+    previous: Optional[str]
+    count: Optional[int]
+
+
+def _json_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()  # Sin perder los microsegundos
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+def estimate_count(queryset: QuerySet, exact_below: int = 1000) -> int:
+    """
+    Row count from the PostgreSQL statistics: ``pg_class.reltuples`` for
+    a whole table, the planner estimate (EXPLAIN) for a filtered queryset.
+    Small estimates, and other databases, fall back to COUNT(*).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    query = queryset.query
+    if not query.has_filters() and not query.distinct and \
+            not query.combinator:
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [table],
+            )
+            row = cursor.fetchone()
+        estimate = row[0] if row else -1
+    else:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+
+    # reltuples es -1 en tablas que aún no se han analizado
+    if estimate < exact_below:
+        return queryset.count()
+    return estimate
+
+
+class CursorPaginator:
+    """
+    Keyset pagination over ``ordering`` (default: newest first by
+    created_at, with id as tie-breaker): every page costs the same as
+    the first one, no OFFSET is used.
+
+    Cursors are opaque and signed with SECRET_KEY, so clients can not
+    forge positions. The ordering fields must be local, non-null
+    columns; ``id`` is appended when it is missing to make it unique.
+    ``count`` is one of CountMode.
+    """
+
+    def __init__(
+        self,
+        ordering: Sequence[str] = ('-created_at', '-id'),
+        page_size: int = 50,
+        max_page_size: int = 200,
+        count: str = CountMode.NONE,
+    ):
+        ordering = list(ordering)
+        if not {'id', 'pk', '-id', '-pk'} & set(ordering):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.count = count
+
+    def paginate(
+        self,
+        queryset: QuerySet,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> CursorPage:
+        limit = min(max(limit or self.page_size, 1), self.max_page_size)
+        fields = self._fields(queryset.model)
+        count = None
+        if self.count == CountMode.EXACT:
+            count = queryset.count()
+        elif self.count == CountMode.ESTIMATE:
+            count = estimate_count(queryset)
+
+        reverse = False
+        if cursor:
+            position, reverse = self.decode_cursor(cursor, fields)
+            queryset = queryset.filter(
+                self._after(fields, position, reverse))
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                name[1:] if name.startswith('-') else f'-{name}'
+                for name in ordering
+            ]
+
+        rows = list(queryset.order_by(*ordering)[:limit + 1])
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if reverse:
+            rows.reverse()
+        if not rows:
+            return CursorPage(rows, None, None, count)
+
+        first, last = rows[0], rows[-1]
+        if reverse:
+            # Se llegó desde la página siguiente, que siempre existe
+            next_cursor = self.encode_cursor(last, fields)
+            previous = self.encode_cursor(first, fields, True) \
+                if more else None
+        else:
+            next_cursor = self.encode_cursor(last, fields) if more else None
+            previous = self.encode_cursor(first, fields, True) \
+                if cursor else None
+        return CursorPage(rows, next_cursor, previous, count)
+
+    def encode_cursor(self, row, fields, reverse: bool = False) -> str:
+        position = [
+            _json_value(getattr(row, field.attname))
+            for field, _ in fields
+        ]
+        return signing.dumps(
+            {'p': position, 'r': reverse}, salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor: str, fields) -> tuple[list, bool]:
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT)
+            position, reverse = data['p'], bool(data['r'])
+            if len(position) != len(fields):
+                raise ValueError
+            return [
+                field.to_python(value)
+                for (field, _), value in zip(fields, position)
+            ], reverse
+        except (signing.BadSignature, ValidationError, ValueError,
+                TypeError, KeyError):
+            raise InvalidCursor('Invalid cursor')
+
+    def _fields(self, model) -> list[tuple[Any, bool]]:
+        fields = []
+        for name in self.ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            field = model._meta.pk if name == 'pk' \
+                else model._meta.get_field(name)
+            fields.append((field, descending))
+        return fields
+
+    @staticmethod
+    def _after(fields, position, reverse: bool) -> Q:
+        """
+        Rows after ``position``: (a, b) < (x, y) as a < x OR (a = x AND
+        b < y), plus a leading a <= x so the index range is used.
+        """
+        condition = Q()
+        equal = {}
+        for (field, descending), value in zip(fields, position):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= Q(**equal, **{f'{field.attname}__{lookup}': value})
+            equal[field.attname] = value
+
+        field, descending = fields[0]
+        lookup = 'lte' if descending != reverse else 'gte'
+        return Q(**{f'{field.attname}__{lookup}': position[0]}) & condition
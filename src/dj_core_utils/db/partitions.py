@@ -0,0 +1,71 @@
+from datetime import date, datetime
+from typing import Optional, Union
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model
+from django.utils import timezone
+
+
+def month_start(value: Union[date, datetime]) -> date:
+    """First day of the month of the given date."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f'{table}_{month:%Y%m}'
+
+
+def monthly_partition_sql(table: str, month: date) -> str:
+    """DDL of the partition that stores one month of a table."""
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table, start)}" '
+        f'PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def is_partitioned(model: type[Model], using: str = DEFAULT_DB_ALIAS) -> bool:
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table p '
+            'JOIN pg_class c ON c.oid = p.partrelid '
+            'WHERE c.relname = %s',
+            [model._meta.db_table]
+        )
+        return cursor.fetchone() is not None
+
+
+def create_monthly_partitions(
+    model: type[Model],
+    months_ahead: int = 3,
+    start: Optional[date] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> list[str]:
+    """
+    Creates the monthly partitions of a table partitioned by RANGE on
+    its date column, from ``start`` (current month by default) up to
+    ``months_ahead`` months later. Does nothing if the table is not
+    partitioned (or the database is not PostgreSQL).
+    """
+    if not is_partitioned(model, using):
+        return []
+
+    table = model._meta.db_table
+    first = month_start(start or timezone.now())
+    created = []
+    with connections[using].cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(first, offset)
+            cursor.execute(monthly_partition_sql(table, month))
+            created.append(partition_name(table, month))
+    return created
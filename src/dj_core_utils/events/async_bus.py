@@ -0,0 +1,213 @@
+import asyncio
+import concurrent.futures
+import inspect
+import logging
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+from .dispatcher import Event, EventDispatcher, new_event
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy:
+    BLOCK = 'block'              # publish waits for room in the queue
+    DROP_OLDEST = 'drop_oldest'  # discard the oldest queued event
+    DROP_NEWEST = 'drop_newest'  # discard the event being published
+
+
+class _Subscriber:
+    __slots__ = ('pattern', 'handler', 'queue', 'overflow', 'task', 'dropped')
+
+    def __init__(self, pattern, handler, maxsize, overflow):
+        self.pattern = pattern
+        self.handler = handler
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflow = overflow
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def offer(self, event: Event) -> bool:
+        """Queues without waiting; False if it must wait (block policy)."""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            pass
+        if self.overflow == OverflowPolicy.BLOCK:
+            return False
+        self.dropped += 1
+        if self.overflow == OverflowPolicy.DROP_OLDEST:
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.queue.put_nowait(event)
+        return True
+
+
+class AsyncEventBus:
+    """
+    asyncio event bus: every subscriber has its own bounded queue and
+    handlers (sync or async) run in their own task, so a slow handler
+    never blocks the publisher or the other subscribers.
+    """
+
+    def __init__(self, maxsize=1000, overflow=OverflowPolicy.BLOCK):
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._routes = EventDispatcher()
+        self._subscribers: list[_Subscriber] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(
+        self,
+        event_type: str,
+        handler: Optional[Callable] = None,
+        maxsize: Optional[int] = None,
+        overflow: Optional[str] = None,
+    ):
+        """
+        Registers a handler for a topic or pattern ('user.*').
+        Can be used as a decorator: @event_bus.subscribe('user.created')
+        """
+        if handler is None:
+            return lambda func: self.subscribe(
+                event_type, func, maxsize, overflow)
+
+        subscriber = _Subscriber(
+            event_type,
+            handler,
+            maxsize or self.maxsize,
+            overflow or self.overflow,
+        )
+        self._subscribers.append(subscriber)
+        self._routes.subscribe(event_type, subscriber)
+        if self._loop is not None:
+            self._start(subscriber)
+        return handler
+
+    def unsubscribe(self, event_type: str, handler: Callable) -> None:
+        for subscriber in list(self._subscribers):
+            if subscriber.pattern == event_type and \
+                    subscriber.handler == handler:
+                self._routes.unsubscribe(event_type, subscriber)
+                self._subscribers.remove(subscriber)
+                if subscriber.task is not None:
+                    subscriber.task.cancel()
+
+    async def publish(self, event_type: str, data: dict) -> Event:
+        event = new_event(event_type, data)
+        await self._deliver([event])
+        return event
+
+    async def publish_many(
+            self,
+            events: Iterable[tuple[str, dict]]) -> list[Event]:
+        """Publishes (event_type, data) pairs in a single pass."""
+        batch = [new_event(event_type, data) for event_type, data in events]
+        await self._deliver(batch)
+        return batch
+
+    def publish_threadsafe(
+        self,
+        event_type: str,
+        data: dict,
+        timeout: Optional[float] = None,
+    ) -> Event:
+        """
+        Publishes from sync code running in another thread (e.g. Django
+        views or signals) and waits until the loop has queued the event.
+        The overflow policy applies as in publish: with BLOCK the calling
+        thread waits (up to ``timeout`` seconds) while a queue is full.
+        """
+        if self._loop is None:
+            raise RuntimeError('AsyncEventBus has not been started')
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            raise RuntimeError(
+                'publish_threadsafe would block the event loop, '
+                'use await publish() from async code')
+        event = new_event(event_type, data)
+        future = asyncio.run_coroutine_threadsafe(
+            self._deliver([event]), self._loop)
+        try:
+            future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+        return event
+
+    async def stream(
+        self,
+        event_type: str,
+        maxsize: Optional[int] = None,
+        overflow: Optional[str] = None,
+    ) -> AsyncIterator[Event]:
+        """async for event in event_bus.stream('user.*'): ..."""
+        self.start()
+        subscriber = _Subscriber(
+            event_type, None,
+            maxsize or self.maxsize, overflow or self.overflow)
+        self._routes.subscribe(event_type, subscriber)
+        try:
+            while True:
+                yield await subscriber.queue.get()
+                subscriber.queue.task_done()
+        finally:
+            self._routes.unsubscribe(event_type, subscriber)
+
+    def start(self) -> None:
+        """Binds the bus to the running loop and starts the handlers."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        for subscriber in self._subscribers:
+            # Las colas y tareas de un loop anterior no se pueden reutilizar
+            subscriber.queue = asyncio.Queue(maxsize=subscriber.queue.maxsize)
+            subscriber.task = None
+            self._start(subscriber)
+
+    async def join(self) -> None:
+        """Waits until every handler queue has been processed."""
+        for subscriber in self._subscribers:
+            await subscriber.queue.join()
+
+    async def close(self) -> None:
+        tasks = [s.task for s in self._subscribers if s.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscriber in self._subscribers:
+            subscriber.task = None
+        self._loop = None
+
+    async def _deliver(self, events: list[Event]) -> None:
+        self.start()
+        for event in events:
+            for subscriber in self._routes.handlers_for(event.type):
+                if not subscriber.offer(event):
+                    await subscriber.queue.put(event)
+
+    def _start(self, subscriber: _Subscriber) -> None:
+        if subscriber.handler is not None and subscriber.task is None:
+            subscriber.task = self._loop.create_task(self._run(subscriber))
+
+    async def _run(self, subscriber: _Subscriber) -> None:
+        while True:
+            event = await subscriber.queue.get()
+            try:
+                result = subscriber.handler(event.data)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception(
+                    'Event handler %r failed for %s',
+                    subscriber.handler, event.type)
+            finally:
+                subscriber.queue.task_done()
+
+
+# Singleton for global use
+event_bus = AsyncEventBus()
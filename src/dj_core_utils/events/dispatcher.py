@@ -0,0 +1,161 @@
+import itertools
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Callable, NamedTuple, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = '*'       # Exactly one segment: 'user.*' -> 'user.created'
+MULTI_WILDCARD = '**'  # Zero or more segments: 'user.**' -> 'user.a.b'
+
+
+class Event(NamedTuple):
+    id: str
+    type: str
+    data: dict
+    timestamp: datetime
+
+
+def new_event(event_type: str, data: dict) -> Event:
+    return Event(
+        # Mismo formato que uuid4().hex, sin el costo de construir un UUID
+        id=os.urandom(16).hex(),
+        type=event_type,
+        data=data,
+        timestamp=timezone.now(),
+    )
+
+
+class _TrieNode:
+    __slots__ = ('children', 'handlers')
+
+    def __init__(self):
+        self.children: dict[str, '_TrieNode'] = {}
+        self.handlers: list[tuple[int, Callable]] = []
+
+
+class EventDispatcher:
+    """
+    In-process topic -> handlers registry.
+
+    Exact topics are resolved with a dict lookup; wildcard patterns are
+    compiled into a trie of segments. The resolved handlers of every
+    topic are cached until the subscriptions change, so routing a
+    published event is O(1).
+    """
+
+    max_cached_routes = 10000
+
+    def __init__(self):
+        self._exact: dict[str, list[tuple[int, Callable]]] = {}
+        self._trie = _TrieNode()
+        self._routes: dict[str, tuple[Callable, ...]] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def subscribe(self, pattern: str, handler: Optional[Callable] = None):
+        """
+        Registers a handler for a topic or wildcard pattern.
+        Can be used as a decorator: @dispatcher.subscribe('user.*')
+        """
+        if handler is None:
+            return lambda func: self.subscribe(pattern, func)
+
+        entry = (next(self._sequence), handler)
+        with self._lock:
+            if self._is_pattern(pattern):
+                node = self._trie
+                for segment in pattern.split('.'):
+                    node = node.children.setdefault(segment, _TrieNode())
+                node.handlers.append(entry)
+            else:
+                self._exact.setdefault(pattern, []).append(entry)
+            self._routes = {}
+        return handler
+
+    def unsubscribe(self, pattern: str, handler: Callable) -> None:
+        with self._lock:
+            if self._is_pattern(pattern):
+                node = self._trie
+                for segment in pattern.split('.'):
+                    node = node.children.get(segment)
+                    if node is None:
+                        return
+                entries = node.handlers
+            else:
+                entries = self._exact.get(pattern, [])
+            entries[:] = [entry for entry in entries if entry[1] != handler]
+            self._routes = {}
+
+    def handlers_for(self, topic: str) -> tuple[Callable, ...]:
+        """Handlers subscribed to a topic, in subscription order."""
+        handlers = self._routes.get(topic)
+        if handlers is None:
+            with self._lock:
+                entries = list(self._exact.get(topic, ()))
+                self._match(self._trie, topic.split('.'), 0, entries)
+                handlers = tuple(
+                    handler for _, handler in sorted(
+                        set(entries), key=lambda entry: entry[0])
+                )
+                if len(self._routes) >= self.max_cached_routes:
+                    self._routes = {}
+                self._routes[topic] = handlers
+        return handlers
+
+    def publish(
+        self,
+        event_type: str,
+        data: dict,
+        on_commit: bool = False,
+        using: Optional[str] = None,
+    ) -> Event:
+        """
+        Publishes an event with a unique id.
+
+        With ``on_commit=True`` delivery waits until the current
+        transaction commits (and is dropped if it rolls back).
+        """
+        event = new_event(event_type, data)
+        if on_commit:
+            transaction.on_commit(lambda: self.dispatch(event), using=using)
+        else:
+            self.dispatch(event)
+        return event
+
+    def dispatch(self, event: Event) -> None:
+        for handler in self.handlers_for(event.type):
+            try:
+                handler(event.data)
+            except Exception:
+                logger.exception(
+                    'Event handler %r failed for %s', handler, event.type)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._exact = {}
+            self._trie = _TrieNode()
+            self._routes = {}
+
+    @staticmethod
+    def _is_pattern(pattern: str) -> bool:
+        return bool({WILDCARD, MULTI_WILDCARD} & set(pattern.split('.')))
+
+    def _match(self, node: _TrieNode, segments, index, entries) -> None:
+        multi = node.children.get(MULTI_WILDCARD)
+        if multi is not None:
+            # '**' consume de 0 a n segmentos
+            for position in range(index, len(segments) + 1):
+                self._match(multi, segments, position, entries)
+        if index == len(segments):
+            entries.extend(node.handlers)
+            return
+        for key in (segments[index], WILDCARD):
+            child = node.children.get(key)
+            if child is not None:
+                self._match(child, segments, index + 1, entries)
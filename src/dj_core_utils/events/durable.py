@@ -0,0 +1,389 @@
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Iterator, Optional
+
+from datetime import datetime, timezone
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .dispatcher import Event, new_event
+from .local_bus import LocalEventBus
+
+# length (payload bytes) + crc32 (payload)
+HEADER = struct.Struct('>II')
+SEGMENT_SUFFIX = '.log'
+OFFSET_SUFFIX = '.offset'
+
+_encoder = DjangoJSONEncoder(separators=(',', ':'))
+
+logger = logging.getLogger(__name__)
+
+
+class FsyncPolicy:
+    ALWAYS = 'always'  # fsync after every append
+    BATCH = 'batch'    # fsync every fsync_every records or fsync_interval seconds
+    NEVER = 'never'    # leave it to the OS
+
+
+def _segment_name(base: int) -> str:
+    return f'{base:020d}{SEGMENT_SUFFIX}'
+
+
+def _write_atomic(path: str, content: str, fsync: bool) -> None:
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as file:
+        file.write(content)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(tmp, path)
+
+
+class EventLog:
+    """
+    Append-only event log split into segment files.
+
+    Records are ``[length][crc32][json payload]``. Offsets are byte
+    positions in the whole log and every segment file is named after the
+    offset of its first record, so locating an offset is a bisect over
+    the segment list. Segments are read with mmap. Each consumer group
+    keeps its committed offset in ``offsets/<group>.offset``.
+
+    A directory must have a single writer process.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 64 * 1024 * 1024,
+        fsync: str = FsyncPolicy.BATCH,
+        fsync_every: int = 1000,
+        fsync_interval: float = 1.0,
+        buffer_size: int = 1024 * 1024,
+    ):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.buffer_size = buffer_size
+        self._offsets_dir = os.path.join(directory, 'offsets')
+        os.makedirs(self._offsets_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._maps: dict[int, mmap.mmap] = {}
+        self._bases = sorted(
+            int(name[:-len(SEGMENT_SUFFIX)])
+            for name in os.listdir(directory)
+            if name.endswith(SEGMENT_SUFFIX)
+        ) or [0]
+        self._active_base = self._bases[-1]
+        self._active_size = self._recover(self._active_base)
+        self._file = self._open_active()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @property
+    def end_offset(self) -> int:
+        return self._active_base + self._active_size
+
+    def append(self, event: Event) -> int:
+        """Appends an event and returns its offset."""
+        return self.append_many([event])[0]
+
+    def append_many(self, events: list[Event]) -> list[int]:
+        """Appends several events under a single lock and returns their offsets."""
+        records = []
+        for event in events:
+            payload = _encoder.encode(
+                [event.id, event.type, event.data, event.timestamp.timestamp()]
+            ).encode()
+            records.append(
+                HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+
+        offsets = []
+        with self._lock:
+            for record in records:
+                if self._active_size and \
+                        self._active_size + len(record) > self.segment_size:
+                    self._rotate()
+                offsets.append(self.end_offset)
+                self._file.write(record)
+                self._active_size += len(record)
+            self._unsynced += len(records)
+            if self.fsync == FsyncPolicy.ALWAYS:
+                self._sync()
+            elif self.fsync == FsyncPolicy.BATCH and (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+        return offsets
+
+    def flush(self) -> None:
+        """Makes the appended records visible to readers."""
+        with self._lock:
+            self._file.flush()
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def read(
+        self,
+        offset: int,
+        max_records: Optional[int] = None,
+    ) -> Iterator[tuple[int, Event]]:
+        """Yields (next_offset, event) from ``offset`` on."""
+        count = 0
+        while max_records is None or count < max_records:
+            record = self._read_record(offset)
+            if record is None:
+                return
+            offset, payload = record
+            event_id, event_type, event_data, timestamp = json.loads(payload)
+            yield offset, Event(
+                id=event_id,
+                type=event_type,
+                data=event_data,
+                timestamp=datetime.fromtimestamp(timestamp, timezone.utc),
+            )
+            count += 1
+
+    def committed(self, group: str) -> int:
+        """Committed offset of a consumer group (start of the log if new)."""
+        try:
+            with open(self._offset_path(group)) as file:
+                return int(file.read() or 0)
+        except FileNotFoundError:
+            return self._bases[0]
+
+    def commit(self, group: str, offset: int) -> None:
+        _write_atomic(
+            self._offset_path(group),
+            str(offset),
+            fsync=self.fsync != FsyncPolicy.NEVER,
+        )
+
+    def compact(self) -> list[str]:
+        """
+        Deletes the closed segments already consumed by every group.
+        Returns the removed file names.
+        """
+        groups = [
+            name[:-len(OFFSET_SUFFIX)]
+            for name in os.listdir(self._offsets_dir)
+            if name.endswith(OFFSET_SUFFIX)
+        ]
+        if not groups:
+            return []
+        low_watermark = min(self.committed(group) for group in groups)
+
+        removed = []
+        with self._lock:
+            while len(self._bases) > 1 and self._bases[1] <= low_watermark:
+                base = self._bases.pop(0)
+                data = self._maps.pop(base, None)
+                if data is not None:
+                    data.close()
+                os.remove(os.path.join(self.directory, _segment_name(base)))
+                removed.append(_segment_name(base))
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._sync()
+            self._file.close()
+            for data in self._maps.values():
+                data.close()
+            self._maps = {}
+
+    def _offset_path(self, group: str) -> str:
+        return os.path.join(self._offsets_dir, f'{group}{OFFSET_SUFFIX}')
+
+    def _segment_path(self, base: int) -> str:
+        return os.path.join(self.directory, _segment_name(base))
+
+    def _open_active(self):
+        return open(
+            self._segment_path(self._active_base), 'ab',
+            buffering=self.buffer_size
+        )
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _rotate(self) -> None:
+        self._sync()
+        self._file.close()
+        # El mmap del segmento activo puede ser más corto que el segmento
+        # cerrado: se descarta para que la siguiente lectura lo vea entero
+        data = self._maps.pop(self._active_base, None)
+        if data is not None:
+            data.close()
+        self._active_base += self._active_size
+        self._active_size = 0
+        self._bases.append(self._active_base)
+        self._file = self._open_active()
+
+    def _read_record(self, offset: int) -> Optional[tuple[int, bytes]]:
+        """
+        (next_offset, payload) of the record at ``offset``, None at the
+        end of the log. Runs under the writer lock, so rotation, remapping
+        and compaction never close a segment while it is being read; the
+        payload is copied out of the mmap before the lock is released.
+        """
+        with self._lock:
+            self._file.flush()
+            while offset < self.end_offset:
+                index = bisect.bisect_right(self._bases, offset) - 1
+                base = self._bases[max(index, 0)]
+                offset = max(offset, base)
+                data = self._map(base)
+                position = offset - base
+                if data is None or position + HEADER.size > len(data):
+                    if base == self._active_base:
+                        return None
+                    offset = self._bases[index + 1]
+                    continue
+
+                length, crc = HEADER.unpack_from(data, position)
+                start = position + HEADER.size
+                payload = data[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return None  # Registro incompleto al final del segmento
+                return base + start + length, payload
+        return None
+
+    def _map(self, base: int) -> Optional[mmap.mmap]:
+        """mmap of a segment; the active one is remapped when it grows."""
+        data = self._maps.get(base)
+        if base == self._active_base and data is not None \
+                and len(data) < self._active_size:
+            data.close()
+            data = None
+        if data is None:
+            with open(self._segment_path(base), 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                if not size:
+                    return None
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[base] = data
+        return data
+
+    def _recover(self, base: int) -> int:
+        """
+        Returns the valid size of a segment, truncating a record left
+        half written by a crash.
+        """
+        path = self._segment_path(base)
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'r+b') as file:
+            size = os.fstat(file.fileno()).st_size
+            if not size:
+                return 0
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                position = 0
+                while position + HEADER.size <= size:
+                    length, crc = HEADER.unpack_from(data, position)
+                    start = position + HEADER.size
+                    payload = data[start:start + length]
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        break
+                    position = start + length
+            if position < size:
+                file.truncate(position)
+        return position
+
+
+class DurableEventBus(LocalEventBus):
+    """
+    LocalEventBus backed by an EventLog: published events are persisted
+    and delivered by ``consume()``, so they survive restarts and can be
+    replayed per consumer group.
+    """
+
+    def __init__(self, directory, group='default', dispatcher=None, **options):
+        super().__init__(dispatcher)
+        self.log = EventLog(directory, **options)
+        self.group = group
+
+    def publish(self, event_type, data, ttl=None, on_commit=False):
+        """
+        Persists an event in the log
+        Args:
+            event_type (str): Event type (e.g., 'user.created')
+            data (dict): Event data
+            ttl (int): Kept for compatibility, retention is done by compact()
+            on_commit (bool): Append when the current transaction commits
+        """
+        event = new_event(event_type, data)
+        if on_commit:
+            transaction.on_commit(lambda: self.log.append(event))
+        else:
+            self.log.append(event)
+        return event
+
+    def publish_many(self, events, on_commit=False):
+        """
+        Persists several events with a single write
+        Args:
+            events (list): (event_type, data) pairs
+            on_commit (bool): Append when the current transaction commits
+        """
+        batch = [new_event(event_type, data) for event_type, data in events]
+        if on_commit:
+            transaction.on_commit(lambda: self.log.append_many(batch))
+        else:
+            self.log.append_many(batch)
+        return batch
+
+    def consume(self, max_events=1000, group=None):
+        """
+        Delivers the pending events of a consumer group to the subscribed
+        handlers and commits its offset once per batch.
+
+        Delivery is at-least-once: if a handler raises, the batch stops
+        at that event and only the events before it are committed, so the
+        next call delivers it again (to every handler of its topic, which
+        must therefore be idempotent).
+        Returns the number of delivered events.
+        """
+        group = group or self.group
+        committed = self.log.committed(group)
+        count = 0
+        for offset, event in self.log.read(committed, max_events):
+            if not self._deliver(event):
+                break
+            committed = offset
+            count += 1
+        if count:
+            self.log.commit(group, committed)
+        return count
+
+    def _deliver(self, event):
+        """Runs the handlers of an event; False if one of them failed."""
+        for handler in self.dispatcher.handlers_for(event.type):
+            try:
+                handler(event.data)
+            except Exception:
+                logger.exception(
+                    'Event handler %r failed for %s, delivery stopped at '
+                    'event %s', handler, event.type, event.id)
+                return False
+        return True
+
+    def close(self):
+        self.log.close()
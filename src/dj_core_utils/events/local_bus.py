@@ -1,41 +1,40 @@
-from django.core.cache import cache
+from .dispatcher import EventDispatcher
 
 
 class LocalEventBus:
     """
-    Local implementation for monolith mode using cache
+    Local implementation for monolith mode using an in-process dispatcher
     """
 
-    @staticmethod
-    def publish(event_type, data, ttl=3600):
+    def __init__(self, dispatcher=None):
+        self.dispatcher = dispatcher or EventDispatcher()
+
+    def publish(self, event_type, data, ttl=None, on_commit=False):
         """
         Publishes an event to the local bus
         Args:
             event_type (str): Event type (e.g., 'user.created')
             data (dict): Event data
-            ttl (int): Time to live in seconds (default: 1h)
+            ttl (int): Kept for compatibility, events are not stored
+            on_commit (bool): Deliver when the current transaction commits
+        Returns:
+            Event: published event with its unique id
         """
-        cache_key = f'event:{event_type}:{str(data.get("id", ""))}'
-        cache.set(cache_key, data, timeout=ttl)
+        return self.dispatcher.publish(event_type, data, on_commit=on_commit)
 
-    @staticmethod
-    def subscribe(event_type, callback, timeout=None):
+    def subscribe(self, event_type, callback=None, timeout=None):
         """
-        Subscribe a function to events (mock)
+        Subscribe a function to events
         Args:
-            event_type (str): Type of event to listen for
-            callback (function): Function to execute
-            timeout (int): Maximum wait time
+            event_type (str): Type of event or pattern (e.g., 'user.*')
+            callback (function): Function to execute, omit it to use
+                subscribe as a decorator
+            timeout (int): Kept for compatibility
         """
-        # In local mode, it runs immediately
-        # In production I would use Celery or similar
-        cache_key = f'event:{event_type}:*'
-        keys = cache.keys(cache_key)
-        for key in keys:
-            data = cache.get(key)
-            if data:
-                callback(data)
-                cache.delete(key)
+        return self.dispatcher.subscribe(event_type, callback)
+
+    def unsubscribe(self, event_type, callback):
+        self.dispatcher.unsubscribe(event_type, callback)
 
 
 # Singleton for global use
@@ -1,6 +1,14 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from django.core.signals import setting_changed
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
+from jose import jwk, jwt, JWTError
 from dj_core_utils.settings.base import get_settings
 from pydantic import BaseModel
 
@@ -13,6 +21,143 @@ class UserPayload(BaseModel):
     is_staff: bool
 
 
+class JWTKeys:
+    """
+    Verification settings built once from SIMPLE_JWT:
+        ALGORITHM, SIGNING_KEY (HS*), VERIFYING_KEY (RS*/ES* public key),
+        AUDIENCE, ISSUER, LEEWAY, USER_ID_CLAIM and, read from local files,
+        VERIFYING_KEY_FILE (PEM) or JWKS_FILE (JSON Web Key Set).
+    Keys are parsed here so every request reuses the same key objects.
+    """
+
+    def __init__(self, config: dict[str, Any], secret_key: str = ''):
+        self.algorithm = config.get('ALGORITHM', 'HS256')
+        self.audience = config.get('AUDIENCE')
+        self.issuer = config.get('ISSUER')
+        self.leeway = int(config.get('LEEWAY') or 0)
+        self.user_id_claim = config.get('USER_ID_CLAIM', 'user_id')
+        self.cache_size = config.get('TOKEN_CACHE_SIZE', 10000)
+        self.by_kid: dict[str, Any] = {}
+        self.key = None
+
+        if config.get('JWKS_FILE'):
+            with open(config['JWKS_FILE']) as file:
+                for data in json.load(file)['keys']:
+                    key = jwk.construct(data, data.get('alg', self.algorithm))
+                    self.by_kid[data.get('kid', '')] = key
+            return
+
+        if self.algorithm.startswith('HS'):
+            material = config.get('SIGNING_KEY') or secret_key
+        elif config.get('VERIFYING_KEY_FILE'):
+            with open(config['VERIFYING_KEY_FILE']) as file:
+                material = file.read()
+        else:
+            material = config.get('VERIFYING_KEY')
+        self.key = jwk.construct(material, self.algorithm)
+
+    def key_for(self, token: str):
+        if not self.by_kid:
+            return self.key
+        kid = jwt.get_unverified_header(token).get('kid', '')
+        try:
+            return self.by_kid[kid]
+        except KeyError:
+            raise JWTError(f'Unknown key id {kid!r}')
+
+    def decode(self, token: str) -> dict[str, Any]:
+        return jwt.decode(
+            token,
+            self.key_for(token),
+            algorithms=[self.algorithm],
+            audience=self.audience,
+            issuer=self.issuer,
+            options={
+                'verify_aud': self.audience is not None,
+                'leeway': self.leeway,
+            },
+        )
+
+
+_keys: Optional[JWTKeys] = None
+
+
+def get_jwt_keys() -> JWTKeys:
+    global _keys
+    if _keys is None:
+        settings = get_settings()
+        _keys = JWTKeys(
+            getattr(settings, 'SIMPLE_JWT', {}),
+            getattr(settings, 'SECRET_KEY', ''),
+        )
+    return _keys
+
+
+class TokenCache:
+    """
+    LRU of verified token payloads keyed by the sha256 of the token.
+    An entry lives until the ``exp`` of its token, so a repeated bearer
+    token skips the signature check. Tokens without ``exp`` are not cached.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[dict[str, Any]]:
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, token: str, payload: dict[str, Any], leeway: int = 0):
+        exp = payload.get('exp')
+        if not isinstance(exp, (int, float)) or not self.maxsize:
+            return
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._entries[key] = (payload, exp + leeway)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Singleton for global use
+token_cache = TokenCache()
+
+
+def reset_jwt_keys(**kwargs) -> None:
+    global _keys
+    _keys = None
+    token_cache.clear()
+
+
+setting_changed.connect(reset_jwt_keys)
+
+
+def decode_token(token: str) -> dict[str, Any]:
+    """Verified payload of a token (raises JWTError)."""
+    payload = token_cache.get(token)
+    if payload is None:
+        keys = get_jwt_keys()
+        payload = keys.decode(token)
+        token_cache.maxsize = keys.cache_size
+        token_cache.set(token, payload, keys.leeway)
+    return payload
+
+
 async def jwt_auth(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> UserPayload:
@@ -20,26 +165,29 @@ async def jwt_auth(
     Validates JWT tokens generated by Django
     Requires:
         - python-jose
-        - Same SECRET_KEY and ALGORITHM as Django
+        - Same SIMPLE_JWT keys and ALGORITHM as Django
     """
-    settings = get_settings()
-
     try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.SIMPLE_JWT.get('ALGORITHM', 'HS256')]
-        )
+        payload = decode_token(credentials.credentials)
 
         return UserPayload(
-            id=payload['user_id'],
+            id=payload[get_jwt_keys().user_id_claim],
             email=payload.get('email', ''),
             is_staff=payload.get('is_staff', False)
         )
-    except JWTError:
+    except (JWTError, KeyError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Invalid authentication credentials',
             headers={'WWW-Authenticate': 'Bearer'},
         )
+
+
+async def staff_auth(user: UserPayload = Depends(jwt_auth)) -> UserPayload:
+    """jwt_auth restricted to staff users (is_staff claim)."""
+    if not user.is_staff:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Staff access required',
+        )
+    return user
@@ -0,0 +1,426 @@
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import socket
+import struct
+import tempfile
+import time
+from typing import Optional
+
+from django.core.exceptions import ImproperlyConfigured
+
+from dj_core_utils.settings.base import get_settings
+from .websockets import WebSocketManager, manager as default_manager
+
+logger = logging.getLogger(__name__)
+
+# Espera antes de reiniciar el lector del backplane tras un error
+RECEIVE_RETRY_DELAY = 1.0
+
+# Hub local: kind, channel length, data length
+FRAME = struct.Struct('>BHI')
+SUBSCRIBE, UNSUBSCRIBE, PUBLISH, MESSAGE = range(4)
+
+# Lote del backplane: origin length | (timestamp, topic length, data length)*
+ORIGIN = struct.Struct('>H')
+ENTRY = struct.Struct('>dHI')
+
+
+def default_socket_path(channel: str) -> str:
+    """
+    LocalHub socket of a channel in the temp dir: applications with
+    different channels never share a hub.
+    """
+    digest = hashlib.sha256(channel.encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f'dj_core_utils_{digest}.sock')
+
+
+def _frame(kind: int, channel: str, data: bytes = b'') -> bytes:
+    channel = channel.encode()
+    return FRAME.pack(kind, len(channel), len(data)) + channel + data
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> tuple[int, str, bytes]:
+    kind, channel_length, data_length = FRAME.unpack(
+        await reader.readexactly(FRAME.size))
+    channel = await reader.readexactly(channel_length)
+    return kind, channel.decode(), await reader.readexactly(data_length)
+
+
+class LocalHub:
+    """
+    Pub/sub relay over a Unix domain socket for the workers of one host.
+
+    It runs inside one of the workers: the first one that takes the
+    ``<path>.lock`` flock. If that worker dies the lock is released and
+    the next worker that reconnects takes over. A subscriber whose
+    socket buffer exceeds ``max_buffer`` bytes is disconnected (it
+    reconnects and resubscribes) instead of stalling the others.
+    """
+
+    def __init__(self, path: str, max_buffer: int = 16 * 1024 * 1024):
+        self.path = path
+        self.max_buffer = max_buffer
+        self._subscribers: dict[str, set[asyncio.StreamWriter]] = {}
+        self._handlers: dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Socket de un hub anterior
+        self._server = await asyncio.start_unix_server(
+            self._handle, path=self.path)
+
+    @property
+    def serving(self) -> bool:
+        return self._server is not None and self._server.is_serving()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self._handlers.values())
+            for writer in list(self._handlers):
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader, writer) -> None:
+        channels = set()
+        self._handlers[writer] = asyncio.current_task()
+        try:
+            while True:
+                kind, channel, data = await _read_frame(reader)
+                if kind == SUBSCRIBE:
+                    self._subscribers.setdefault(channel, set()).add(writer)
+                    channels.add(channel)
+                elif kind == UNSUBSCRIBE:
+                    self._subscribers.get(channel, set()).discard(writer)
+                    channels.discard(channel)
+                elif kind == PUBLISH:
+                    self._relay(channel, _frame(MESSAGE, channel, data))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception:
+            logger.exception('Backplane hub connection failed')
+        finally:
+            for channel in channels:
+                self._subscribers.get(channel, set()).discard(writer)
+            self._handlers.pop(writer, None)
+            writer.close()
+
+    def _relay(self, channel: str, frame: bytes) -> None:
+        for writer in list(self._subscribers.get(channel, ())):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                logger.warning('Disconnecting slow backplane subscriber')
+                writer.close()
+                continue
+            writer.write(frame)
+
+
+_hubs: dict[str, tuple[int, LocalHub]] = {}
+
+
+async def _ensure_hub(path: str) -> None:
+    """Starts the hub in this process if no other worker holds it."""
+    held = _hubs.get(path)
+    if held is not None:
+        if not held[1].serving:
+            await held[1].start()
+        return
+    fd = os.open(f'{path}.lock', os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return
+    hub = LocalHub(path)
+    await hub.start()
+    _hubs[path] = (fd, hub)
+
+
+async def _release_hub(path: str) -> None:
+    """Stops the hub of this process and lets another worker take it."""
+    held = _hubs.pop(path, None)
+    if held is not None:
+        fd, hub = held
+        await hub.close()
+        os.close(fd)
+
+
+async def _connect(path: str, retry_delay: float = 0.05):
+    while True:
+        await _ensure_hub(path)
+        try:
+            return await asyncio.open_unix_connection(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            # El hub se esta levantando en otro worker
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 1.0)
+
+
+class LocalPubSub:
+    """Subset of redis.asyncio.client.PubSub used by Backplane."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.channels: set[str] = set()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def subscribe(self, *channels: str) -> None:
+        self.channels.update(channels)
+        if self._writer is None:
+            await self._reconnect()
+            return
+        for channel in channels:
+            self._writer.write(_frame(SUBSCRIBE, channel))
+        await self._writer.drain()
+
+    async def unsubscribe(self, *channels: str) -> None:
+        self.channels.difference_update(channels)
+        if self._writer is not None:
+            for channel in channels:
+                self._writer.write(_frame(UNSUBSCRIBE, channel))
+            await self._writer.drain()
+
+    async def listen(self):
+        """Yields {'type': 'message', 'channel': ..., 'data': bytes}."""
+        while True:
+            if self._reader is None:
+                await self._reconnect()
+            try:
+                _, channel, data = await _read_frame(self._reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self._reader = self._writer = None
+                continue
+            except Exception:
+                logger.exception('Invalid frame from the backplane hub')
+                await self.aclose()  # Se reconecta en la siguiente vuelta
+                continue
+            yield {'type': 'message', 'channel': channel, 'data': data}
+
+    async def aclose(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def _reconnect(self) -> None:
+        self._reader, self._writer = await _connect(self.path)
+        for channel in self.channels:
+            self._writer.write(_frame(SUBSCRIBE, channel))
+        await self._writer.drain()
+
+
+class LocalRedis:
+    """
+    Stand-in of redis.asyncio.Redis (``publish`` and ``pubsub``) backed
+    by a LocalHub, for the workers of a single host.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def publish(self, channel: str, data: bytes) -> None:
+        for attempt in range(2):
+            if self._writer is None or self._writer.is_closing():
+                _, self._writer = await _connect(self.path)
+            try:
+                self._writer.write(_frame(PUBLISH, channel, data))
+                await self._writer.drain()
+                return
+            except ConnectionError:
+                self._writer = None
+                if attempt:
+                    raise
+
+    def pubsub(self) -> LocalPubSub:
+        return LocalPubSub(self.path)
+
+    async def aclose(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        await _release_hub(self.path)
+
+
+class Backplane:
+    """
+    Relays WebSocketManager publish/broadcast to the other workers.
+
+    ``client`` is a redis.asyncio.Redis (multi-host, without
+    decode_responses) or a LocalRedis (one host, no server needed;
+    default, on the socket of the channel). ``channel`` must be unique
+    to the application: it defaults to the WEBSOCKET_BACKPLANE_CHANNEL
+    setting and is required. Messages are encoded once by the
+    manager; outgoing messages are packed in batches of up to
+    ``batch_size`` every ``batch_interval`` seconds, and the receiving
+    workers queue the same text to their sockets without decoding it.
+    ``stats()`` reports per-origin delivery counts and lag.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        manager: WebSocketManager = default_manager,
+        channel: Optional[str] = None,
+        batch_size: int = 500,
+        batch_interval: float = 0.002,
+    ):
+        channel = channel or getattr(
+            get_settings(), 'WEBSOCKET_BACKPLANE_CHANNEL', None)
+        if not channel:
+            raise ImproperlyConfigured(
+                'Backplane needs a channel unique to the application: pass '
+                'channel= or set WEBSOCKET_BACKPLANE_CHANNEL')
+        self.client = client if client is not None \
+            else LocalRedis(default_socket_path(channel))
+        self.manager = manager
+        self.channel = channel
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self._origin = self.worker_id.encode()
+        self._pending: list[tuple[float, str, str]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: list[asyncio.Task] = []
+        self._pubsub = None
+        self.sent = 0
+        self.batches = 0
+        self.failed = 0
+        self.received: dict[str, int] = {}
+        self.lag: dict[str, float] = {}
+        self.max_lag: dict[str, float] = {}
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._pubsub = self.client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._tasks = [
+            asyncio.create_task(self._receive()),
+            asyncio.create_task(self._send()),
+        ]
+        self.manager.backplane = self
+
+    async def close(self) -> None:
+        if self.manager.backplane is self:
+            self.manager.backplane = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pending:
+            await self._flush()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if isinstance(self.client, LocalRedis):
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def forward(self, topic: Optional[str], data: str) -> None:
+        """Queues an encoded message for the other workers."""
+        self._pending.append((time.time(), topic or '', data))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> dict:
+        return {
+            'worker': self.worker_id,
+            'sent': self.sent,
+            'batches': self.batches,
+            'failed': self.failed,
+            'pending': len(self._pending),
+            'received': dict(self.received),
+            'lag': dict(self.lag),
+            'max_lag': dict(self.max_lag),
+        }
+
+    def pack(self, batch: list[tuple[float, str, str]]) -> bytes:
+        parts = [ORIGIN.pack(len(self._origin)), self._origin]
+        for timestamp, topic, data in batch:
+            topic, data = topic.encode(), data.encode()
+            parts.append(ENTRY.pack(timestamp, len(topic), len(data)))
+            parts.append(topic)
+            parts.append(data)
+        return b''.join(parts)
+
+    @staticmethod
+    def unpack(payload: bytes):
+        """Returns (origin, [(timestamp, topic, data), ...])."""
+        (length,) = ORIGIN.unpack_from(payload)
+        position = ORIGIN.size + length
+        origin = payload[ORIGIN.size:position].decode()
+        entries = []
+        while position < len(payload):
+            timestamp, topic_length, data_length = ENTRY.unpack_from(
+                payload, position)
+            position += ENTRY.size
+            topic = payload[position:position + topic_length].decode()
+            position += topic_length
+            data = payload[position:position + data_length].decode()
+            position += data_length
+            entries.append((timestamp, topic, data))
+        return origin, entries
+
+    async def _send(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if len(self._pending) < self.batch_size:
+                await asyncio.sleep(self.batch_interval)
+            self._wakeup.clear()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            try:
+                await self.client.publish(self.channel, self.pack(batch))
+            except Exception:
+                self.failed += len(batch)
+                logger.exception('Backplane publish failed')
+                continue
+            self.sent += len(batch)
+            self.batches += 1
+
+    async def _receive(self) -> None:
+        """Reader loop, restarted after any error so delivery never stops."""
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    self._handle(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(
+                    'Backplane receiver failed, restarting in %ss',
+                    RECEIVE_RETRY_DELAY)
+                await asyncio.sleep(RECEIVE_RETRY_DELAY)
+
+    def _handle(self, message: dict) -> None:
+        if message.get('type') != 'message':
+            return
+        try:
+            origin, entries = self.unpack(message['data'])
+        except Exception:
+            logger.warning(
+                'Invalid backplane message discarded', exc_info=True)
+            return
+        if origin == self.worker_id:
+            return
+        now = time.time()
+        for timestamp, topic, data in entries:
+            self.manager.deliver(data, topic or None)
+        lag = now - entries[0][0] if entries else 0.0
+        self.received[origin] = self.received.get(origin, 0) + len(entries)
+        self.lag[origin] = lag
+        self.max_lag[origin] = max(lag, self.max_lag.get(origin, 0.0))
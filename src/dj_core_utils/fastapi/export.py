@@ -0,0 +1,92 @@
+from itertools import islice
+from typing import AsyncIterator, Iterator, Optional, Sequence, Type
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from dj_core_utils.db.export import (
+    ExportFormat, content_type, csv_chunks, export_chunks
+)
+from .utils import models_to_schemas
+
+
+def schema_chunks(
+    queryset: QuerySet,
+    schema_class: Type[BaseModel],
+    export_format: str = ExportFormat.NDJSON,
+    chunk_size: int = 2000,
+) -> Iterator[str]:
+    """
+    Streams a queryset as NDJSON or CSV text chunks through the compiled
+    model_to_schema plan (see models_to_schemas).
+    """
+    content_type(export_format)
+    schemas = models_to_schemas(queryset, schema_class, chunk_size)
+    if export_format == ExportFormat.CSV:
+        return csv_chunks(
+            list(schema_class.model_fields),
+            (schema.model_dump(mode='json').values() for schema in schemas),
+            chunk_size,
+        )
+    return _ndjson_chunks(schemas, chunk_size)
+
+
+def _ndjson_chunks(schemas, chunk_size: int) -> Iterator[str]:
+    while True:
+        batch = list(islice(schemas, chunk_size))
+        if not batch:
+            return
+        yield ''.join(schema.model_dump_json() + '\n' for schema in batch)
+
+
+async def iterate_chunks(chunks: Iterator[str]) -> AsyncIterator[str]:
+    """
+    Async generator over a sync chunk iterator. Every chunk is read in
+    the same thread (sync_to_async thread_sensitive), so the database
+    cursor is never shared between threads, and it is closed if the
+    client disconnects.
+    """
+    read = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await read(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def stream_export(
+    queryset: QuerySet,
+    schema_class: Optional[Type[BaseModel]] = None,
+    fields: Optional[Sequence[str]] = None,
+    export_format: str = ExportFormat.NDJSON,
+    filename: Optional[str] = None,
+    chunk_size: int = 2000,
+) -> StreamingResponse:
+    """
+    StreamingResponse with a queryset as NDJSON or CSV. With
+    ``schema_class`` rows go through the schema, otherwise ``fields``
+    are written from values_list(); one of them is required.
+    """
+    if schema_class is not None:
+        chunks = schema_chunks(
+            queryset, schema_class, export_format, chunk_size)
+    elif fields:
+        chunks = export_chunks(queryset, fields, export_format, chunk_size)
+    else:
+        raise ValueError('stream_export needs a schema_class or fields')
+    headers = None
+    if filename:
+        headers = {
+            'Content-Disposition': f'attachment; filename="{filename}"'}
+    return StreamingResponse(
+        iterate_chunks(chunks),
+        media_type=content_type(export_format),
+        headers=headers,
+    )
@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.utils import timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from dj_core_utils.db.history import (
+    InvalidCursor, get_history, get_state_at, history_allowed
+)
+from .auth import staff_auth
+from .schemas import (
+    CursorPaginatedResponse, ObjectStateSchema, OperationLogSchema
+)
+
+# El historial expone los valores de cualquier modelo auditado: solo staff
+router = APIRouter(
+    prefix='/history',
+    tags=['history'],
+    dependencies=[Depends(staff_auth)],
+)
+
+
+def _check_allowed(model_changed: str) -> None:
+    if not history_allowed(model_changed):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='History not available'
+        )
+
+
+# Endpoints síncronos: FastAPI los ejecuta en su threadpool (ORM de Django)
+@router.get(
+    '/{model_changed}/{id_instance}',
+    response_model=CursorPaginatedResponse[OperationLogSchema]
+)
+def operation_history(
+    model_changed: str,
+    id_instance: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Change stream of an instance with keyset pagination"""
+    _check_allowed(model_changed)
+    try:
+        logs, next_cursor = get_history(
+            model_changed, id_instance, cursor=cursor, limit=limit
+        )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Invalid cursor'
+        )
+    return CursorPaginatedResponse[OperationLogSchema](
+        next=next_cursor,
+        results=[OperationLogSchema.model_validate(log) for log in logs]
+    )
+
+
+@router.get(
+    '/{model_changed}/{id_instance}/state',
+    response_model=ObjectStateSchema
+)
+def operation_state(
+    model_changed: str,
+    id_instance: int,
+    at: Optional[datetime] = None,
+):
+    """Field values of an instance at a given moment"""
+    _check_allowed(model_changed)
+    moment = at or timezone.now()
+    if settings.USE_TZ and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return ObjectStateSchema(
+        model_changed=model_changed,
+        id_instance=id_instance,
+        at=moment,
+        state=get_state_at(model_changed, id_instance, moment)
+    )
@@ -0,0 +1,37 @@
+from typing import Optional, Type
+
+from django.db.models import QuerySet
+from fastapi import HTTPException, status
+
+from dj_core_utils.db.pagination import CursorPaginator, InvalidCursor
+from .schemas import CursorPaginatedResponse
+from .utils import S, model_to_schema
+
+# Paginador por defecto: created_at descendente, sin COUNT(*)
+paginator = CursorPaginator()
+
+
+def paginate(
+    queryset: QuerySet,
+    schema_class: Type[S],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    paginator: CursorPaginator = paginator,
+) -> CursorPaginatedResponse[S]:
+    """
+    Keyset page of a queryset as CursorPaginatedResponse[schema_class].
+    Call it from sync endpoints (Django ORM).
+    """
+    try:
+        page = paginator.paginate(queryset, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Invalid cursor'
+        )
+    return CursorPaginatedResponse[schema_class](
+        next=page.next,
+        previous=page.previous,
+        count=page.count,
+        results=[model_to_schema(row, schema_class) for row in page.results]
+    )
@@ -43,17 +43,33 @@ class TrackedSchema(TimeStampedSchema):
     object_locked: bool
 
 
-class OperationLogSchema(TrackedSchema):
+class OperationLogSchema(BaseModel):
+    """OperationLog has no timestamps or tracking fields of its own"""
+    id: Optional[int] = None
     user_id: Optional[int] = Field(
         None, description="ID del usuario que realizó la acción"
     )
     model_changed: str = Field(..., description="Nombre del modelo afectado")
     id_instance: int = Field(..., description="ID de la instancia afectada")
     operation_type: str = Field(..., description="Tipo de operación")
+    date: Optional[datetime] = Field(
+        None, description="Fecha de la operación"
+    )
     changes: Optional[Dict[str, Any]] = Field(
         None, description="Cambios realizados"
     )
 
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ObjectStateSchema(BaseModel):
+    model_changed: str
+    id_instance: int
+    at: datetime
+    state: Optional[Dict[str, Any]] = Field(
+        None, description="Valores de los campos; None si no existía"
+    )
+
 
 class UserSchema(TrackedSchema):
     email: str = Field(..., description="Email del usuario")
@@ -68,3 +84,12 @@ class PaginatedResponse(BaseModel, Generic[T]):
     next: Optional[str]
     previous: Optional[str]
     results: List[T]
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    next: Optional[str]
+    previous: Optional[str] = None
+    count: Optional[int] = Field(
+        None, description="Total (exacto o estimado); None si no se cuenta"
+    )
+    results: List[T]
@@ -1,70 +1,206 @@
-from django.db.models import Model
-from django.contrib.auth import get_user_model
-from typing import TypeVar, Type, Union, Optional
+from contextlib import nullcontext
+
+from django.db import router, transaction
+from django.db.models import Model, QuerySet
+from typing import (
+    Any, Callable, Iterable, Iterator, TypeVar, Type, Union, Optional
+)
+from pydantic import BaseModel
 from .schemas import (
     BaseSchema, TimeStampedSchema, TrackedSchema,
     UniversalState, LockType
 )
+from dj_core_utils.db.mixins import is_auto_updated
 from dj_core_utils.db.models import (
     TimeStampedModel,
     UserTrackedModel,
-    OperationLog
+    OperationLog,
+    OperationType
 )
+from dj_core_utils.middleware.context import acting_user, get_current_user
+from dj_core_utils.signals.buffer import audit_buffer
+from dj_core_utils.signals.bulk import audit_handler
 
 T = TypeVar('T', bound=Model)
-User = get_user_model()
+S = TypeVar('S', bound=BaseModel)
+
+
+class _SchemaPlan:
+    """
+    Compiled model -> schema conversion: the columns (attnames) to read
+    and, for every schema key, the column index and converter. Foreign
+    keys are read through their attname, related objects are never loaded.
+    """
+    __slots__ = ('schema_class', 'attnames', 'columns')
+
+    def __init__(self, model, schema_class):
+        self.schema_class = schema_class
+        self.attnames: list[str] = []
+        self.columns: list[tuple[str, int, Optional[Callable], bool]] = []
+
+        # TimeStampedModel
+        if issubclass(model, TimeStampedModel):
+            if not issubclass(
+                    schema_class, (TimeStampedSchema, TrackedSchema)):
+                raise ValueError(
+                    'TimeStampedModel models require '
+                    'TimeStampedSchema or TrackedSchema'
+                )
+        if issubclass(model, UserTrackedModel):
+            if not issubclass(schema_class, TrackedSchema):
+                raise ValueError(
+                    'UserTrackedModel models require TrackedSchema')
+
+        for field in model._meta.concrete_fields:
+            if field.is_relation:
+                # Relaciones ForeignKey (se omiten si son None)
+                self._add(f'{field.name}_id', field.attname, skip_none=True)
+            else:
+                self._add(field.name, field.attname)
+
+        # UserTrackedModel incluye universal_state,
+        # lock_type, object_locked, created_by, updated_by
+        if issubclass(model, UserTrackedModel):
+            self._add('created_by', 'created_by_id')
+            self._add('updated_by', 'updated_by_id')
+            self._add('universal_state', 'universal_state', UniversalState)
+            self._add('lock_type', 'lock_type', LockType)
+            self._add('object_locked', 'object_locked')
+
+        # Caso especial: OperationLog
+        if issubclass(model, OperationLog):
+            self._add('user_id', 'user_id')
+
+        if schema_class.model_config.get('extra') != 'allow':
+            self._keep(set(schema_class.model_fields))
+
+    def _keep(self, keys) -> None:
+        """Drops the columns of other keys and the attnames they used."""
+        attnames, columns = [], []
+        for key, index, converter, skip_none in self.columns:
+            if key not in keys:
+                continue
+            attname = self.attnames[index]
+            if attname not in attnames:
+                attnames.append(attname)
+            columns.append(
+                (key, attnames.index(attname), converter, skip_none))
+        self.attnames, self.columns = attnames, columns
+
+    def _add(self, key, attname, converter=None, skip_none=False):
+        self.columns = [column for column in self.columns if column[0] != key]
+        if attname not in self.attnames:
+            self.attnames.append(attname)
+        self.columns.append(
+            (key, self.attnames.index(attname), converter, skip_none))
+
+    def to_data(self, row) -> dict[str, Any]:
+        data = {}
+        for key, index, converter, skip_none in self.columns:
+            value = row[index]
+            if value is None:
+                if skip_none:
+                    continue
+            elif converter is not None:
+                value = converter(value)
+            data[key] = value
+        return data
+
+    def build(self, row, validate=True):
+        data = self.to_data(row)
+        if validate:
+            return self.schema_class(**data)
+        return self.schema_class.model_construct(**data)
+
+
+_schema_plans: dict[tuple[type, type], _SchemaPlan] = {}
+
+
+def get_schema_plan(model, schema_class) -> _SchemaPlan:
+    plan = _schema_plans.get((model, schema_class))
+    if plan is None:
+        plan = _schema_plans[model, schema_class] = _SchemaPlan(
+            model, schema_class)
+    return plan
 
 
 def model_to_schema(
     django_instance: Model,
     schema_class: Type[Union[BaseSchema, TimeStampedSchema, TrackedSchema]]
 ) -> Union[BaseSchema, TimeStampedSchema, TrackedSchema]:
-    model_dict = {}
-
-    for field in django_instance._meta.fields:
-        field_name = field.name
-        field_value = getattr(django_instance, field_name)
-
-        # Relaciones ForeignKey
-        if field.is_relation:
-            if isinstance(field_value, User):
-                model_dict[f'{field_name}_id'] = field_value.id
-            elif hasattr(field_value, 'id'):
-                model_dict[f'{field_name}_id'] = field_value.id
-            continue
-
-        model_dict[field_name] = field_value
-
-    # TimeStampedModel
-    if isinstance(django_instance, TimeStampedModel):
-        if not issubclass(schema_class, (TimeStampedSchema, TrackedSchema)):
-            raise ValueError(
-                'TimeStampedModel models require '
-                'TimeStampedSchema or TrackedSchema'
-            )
+    plan = get_schema_plan(type(django_instance), schema_class)
+    return plan.build(
+        [getattr(django_instance, attname) for attname in plan.attnames])
+
+
+def models_to_schemas(
+    queryset: QuerySet,
+    schema_class: Type[S],
+    chunk_size: int = 2000,
+    validate: bool = False,
+) -> Iterator[S]:
+    """
+    Streams a queryset as schemas reading only the columns the schema
+    needs (values_list + iterator), without building model instances.
+    Rows come from the database already typed, so by default schemas are
+    built with model_construct (no validation); pass validate=True to
+    run the pydantic validators.
+    """
+    plan = get_schema_plan(queryset.model, schema_class)
+    # Sin columnas values_list() leería todas: basta con el pk
+    rows = queryset.values_list(*plan.attnames or ['pk']).iterator(
+        chunk_size=chunk_size)
+    for row in rows:
+        yield plan.build(row, validate)
+
+
+class _ModelPlan:
+    """
+    Compiled schema -> model rules: the keys excluded from the dump and
+    the renames of relation keys to their attname.
+    """
+    __slots__ = ('exclude', 'renames')
+
+    def __init__(self, schema_class, django_model, exclude_fields):
+        # Campos base que no deben sobreescribirse
+        exclude = {'id', 'created_at', 'updated_at'} | set(exclude_fields)
+        if issubclass(schema_class, TrackedSchema):
+            # El estado y el usuario los controla el servidor
+            exclude.update({
+                'created_by',
+                'updated_by',
+                'universal_state',
+                'lock_type',
+                'object_locked'
+            })
+        self.exclude = exclude
+
+        # Relaciones: 'customer' o 'customer_id' (int) -> customer_id
+        self.renames = {
+            field.name: field.attname
+            for field in django_model._meta.concrete_fields
+            if field.is_relation and field.name in schema_class.model_fields
+            and field.name not in exclude
+        }
+
+    def to_data(self, schema) -> dict[str, Any]:
+        data = schema.model_dump(exclude_unset=True, exclude=self.exclude)
+        for key, attname in self.renames.items():
+            if key in data:
+                data[attname] = data.pop(key)
+        return data
 
-    # UserTrackedModel incluye universal_state,
-    # lock_type, object_locked, created_by, updated_by
-    if isinstance(django_instance, UserTrackedModel):
-        if not issubclass(schema_class, TrackedSchema):
-            raise ValueError('UserTrackedModel models require TrackedSchema')
-
-        model_dict.update({
-            'created_by': django_instance.created_by_id,
-            'updated_by': django_instance.updated_by_id,
-            'universal_state': UniversalState(django_instance.universal_state),
-            'lock_type': LockType(django_instance.lock_type),
-            'object_locked': django_instance.object_locked
-        })
-
-    # Caso especial: OperationLog
-    if isinstance(django_instance, OperationLog):
-        model_dict['user_id'] = (
-            django_instance.user_id if django_instance.user else None
-        )
-        model_dict['changes'] = django_instance.changes
 
-    return schema_class(**model_dict)
+_model_plans: dict[tuple, _ModelPlan] = {}
+
+
+def get_model_plan(schema_class, django_model, exclude_fields=None):
+    key = (schema_class, django_model, frozenset(exclude_fields or ()))
+    plan = _model_plans.get(key)
+    if plan is None:
+        plan = _model_plans[key] = _ModelPlan(
+            schema_class, django_model, key[2])
+    return plan
 
 
 def schema_to_model(
@@ -72,44 +208,157 @@ def schema_to_model(
     django_model: Type[T],
     exclude_fields: Optional[set] = None
 ) -> T:
-    if exclude_fields is None:
-        exclude_fields = set()
+    plan = get_model_plan(type(schema), django_model, exclude_fields)
+    return django_model(**plan.to_data(schema))
 
-    create_data = schema.model_dump(exclude_unset=True)
 
-    # Campos base que no deben sobreescribirse
-    base_excludes = {'id', 'created_at', 'updated_at'} | exclude_fields
+def schemas_to_models(
+    schemas: Iterable[BaseModel],
+    django_model: Type[T],
+    exclude_fields: Optional[set] = None
+) -> list[T]:
+    """Unsaved instances of a list of schemas (rules compiled once)."""
+    return [
+        schema_to_model(schema, django_model, exclude_fields)
+        for schema in schemas
+    ]
 
-    if isinstance(schema, TrackedSchema):
-        base_excludes.update(
-            {
-                'created_by',
-                'updated_by',
-                'universal_state',
-                'lock_type',
-                'object_locked'
-            })
 
-        if hasattr(django_model, 'universal_state'):
-            create_data['universal_state'] = schema.universal_state.value
+def _unique_key(instance, attnames):
+    return tuple(getattr(instance, attname) for attname in attnames)
 
-        if hasattr(django_model, 'lock_type'):
-            create_data['lock_type'] = schema.lock_type.value
 
-        if hasattr(django_model, 'object_locked'):
-            create_data['object_locked'] = schema.object_locked
+def _fetch_by_unique(django_model, batch, unique_attnames, columns, using):
+    """{unique key: row} of the batch rows that exist in the database."""
+    queryset = django_model._base_manager.using(using).filter(**{
+        f'{attname}__in': {getattr(obj, attname) for obj in batch}
+        for attname in unique_attnames
+    })
+    rows = {}
+    for row in queryset.values('pk', *columns):
+        key = tuple(row[attname] for attname in unique_attnames)
+        rows[key] = row
+    return rows
+
+
+def bulk_upsert(
+    schemas: Iterable[BaseModel],
+    django_model: Type[T],
+    unique_fields: list[str],
+    update_fields: Optional[list[str]] = None,
+    batch_size: int = 500,
+    exclude_fields: Optional[set] = None,
+    user=None,
+    audit: bool = True,
+    using: Optional[str] = None,
+) -> list[T]:
+    """
+    Inserts the schemas or updates the rows that already exist by
+    ``unique_fields`` with bulk_create(update_conflicts=True), in batches
+    of ``batch_size`` and a single transaction.
 
-    # Eliminar campos excluidos
-    for field in base_excludes:
-        create_data.pop(field, None)
+    created_by/updated_by are filled with ``user`` (default: the current
+    user). bulk_create does not send post_save, so with ``audit`` the
+    OperationLog rows (create, or update with the changed fields) are
+    written as one batch when the transaction commits.
+    """
+    using = using or router.db_for_write(django_model)
+    schemas = list(schemas)
+    if not schemas:
+        return []
+    plan_data = [
+        get_model_plan(type(schema), django_model, exclude_fields)
+        .to_data(schema)
+        for schema in schemas
+    ]
+    instances = [django_model(**data) for data in plan_data]
 
-    # Relaciones especiales
-    if hasattr(django_model, 'created_by'):
-        if 'created_by_id' in create_data:
-            create_data['created_by'] = create_data.pop('created_by_id')
+    opts = django_model._meta
+    unique_attnames = [opts.get_field(name).attname for name in unique_fields]
+    if update_fields is None:
+        keys = set().union(*plan_data)
+        update_fields = [
+            field.name for field in opts.concrete_fields
+            if not field.primary_key and field.name not in unique_fields
+            and field.name not in ('created_at', 'created_by')
+            and (field.attname in keys or is_auto_updated(field))
+        ]
+    update_attnames = [opts.get_field(name).attname for name in update_fields]
 
-    if hasattr(django_model, 'updated_by'):
-        if 'updated_by_id' in create_data:
-            create_data['updated_by'] = create_data.pop('updated_by_id')
+    if user is None:
+        user = get_current_user()
+    if not getattr(user, 'is_authenticated', False):
+        user = None
+    if user is not None and hasattr(django_model, 'created_by_id'):
+        for instance in instances:
+            if instance.created_by_id is None:
+                instance.created_by_id = user.pk
 
-    return django_model(**create_data)
+    handler = audit_handler(django_model) if audit else None
+    audited = handler is not None
+
+    # updated_by (CurrentUserField on_update) se resuelve en pre_save
+    acting = acting_user(user) if user is not None else nullcontext()
+    with acting, transaction.atomic(using=using):
+        for start in range(0, len(instances), batch_size):
+            batch = instances[start:start + batch_size]
+            existing = _fetch_by_unique(
+                django_model, batch, unique_attnames,
+                set(unique_attnames) | set(update_attnames), using
+            ) if audited else {}
+            django_model._base_manager.db_manager(using).bulk_create(
+                batch,
+                update_conflicts=bool(update_fields),
+                ignore_conflicts=not update_fields,
+                unique_fields=unique_fields if update_fields else None,
+                update_fields=update_fields or None,
+            )
+            if audited:
+                _audit_upsert(
+                    django_model, batch, existing, unique_attnames,
+                    update_attnames, user, using, handler,
+                )
+    return instances
+
+
+def _audit_upsert(django_model, batch, existing, unique_attnames,
+                  update_attnames, user, using, handler):
+    missing = [obj for obj in batch if obj.pk is None]
+    if missing:
+        # Backends que no devuelven los pk de bulk_create
+        rows = _fetch_by_unique(
+            django_model, missing, unique_attnames, unique_attnames, using)
+        for obj in missing:
+            row = rows.get(_unique_key(obj, unique_attnames))
+            if row is not None:
+                obj.pk = row['pk']
+
+    fields = [django_model._meta.get_field(a) for a in update_attnames]
+    for obj in batch:
+        before = existing.get(_unique_key(obj, unique_attnames))
+        if before is None:
+            operation, changes = OperationType.CREATE, {
+                'new': handler.model_to_dict_safe(obj)}
+        else:
+            if obj.pk is None:
+                obj.pk = before['pk']
+            operation = OperationType.UPDATE
+            changes = {}
+            for field in fields:
+                after = field.to_python(getattr(obj, field.attname))
+                if before[field.attname] != after:
+                    changes[field.attname] = {
+                        'before': before[field.attname], 'after': after}
+            # updated_at/updated_by cambian siempre, no cuentan como cambio
+            if not any(not is_auto_updated(field) and field.attname in
+                       changes for field in fields):
+                continue
+            changes = handler.clean_changes(django_model, changes)
+        audit_buffer.add(
+            using=using,
+            user=user,
+            model_changed=django_model.__name__,
+            id_instance=obj.pk,
+            operation_type=operation,
+            changes=changes,
+        )
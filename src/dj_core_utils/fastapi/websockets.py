@@ -1,17 +1,276 @@
-from fastapi import WebSocket
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
+
+logger = logging.getLogger(__name__)
+
+# Cierre por cliente lento: "try again later"
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# Cierre por frame binario: "unsupported data"
+UNSUPPORTED_DATA_CLOSE_CODE = 1003
+
+TOPIC_SEPARATOR = ':'
+WILDCARD = '*'  # 'model:Order:*' -> 'model:Order:123', '*' -> every topic
+
+
+class SlowConsumerPolicy:
+    LAG = 'lag'    # discard the oldest queued messages, the client lags
+    DROP = 'drop'  # close the connection of the slow client
+
+
+def encode(message) -> str:
+    """Same encoding as WebSocket.send_json."""
+    return json.dumps(message, separators=(',', ':'), ensure_ascii=False)
+
+
+def topic_prefix(pattern: str) -> Optional[str]:
+    """Prefix of a wildcard pattern, None for an exact topic."""
+    if not pattern.endswith(WILDCARD):
+        return None
+    prefix = pattern[:-len(WILDCARD)]
+    if WILDCARD in prefix or prefix and not prefix.endswith(TOPIC_SEPARATOR):
+        raise ValueError(
+            f"Invalid topic pattern {pattern!r}: '*' must be a whole "
+            f"trailing segment, e.g. 'model:Order:*'")
+    return prefix
+
+
+def topic_prefixes(topic: str):
+    """'model:Order:1' -> '', 'model:', 'model:Order:'."""
+    yield ''
+    position = topic.find(TOPIC_SEPARATOR)
+    while position != -1:
+        yield topic[:position + 1]
+        position = topic.find(TOPIC_SEPARATOR, position + 1)
+
+
+class _Connection:
+    __slots__ = ('websocket', 'queue', 'task', 'lagged', 'topics')
+
+    def __init__(self, websocket: WebSocket, maxsize: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.task: Optional[asyncio.Task] = None
+        self.lagged = 0
+        self.topics: set[str] = set()
 
 
 class WebSocketManager:
-    def __init__(self):
-        self.connections = []
+    """
+    Registry of the websockets of this process.
+
+    Every connection has a bounded outbound queue drained by its own
+    writer task, so sending never waits on a client: a message is
+    serialized once and the same text is queued for every connection.
+    When the queue of a slow client is full the ``policy`` decides
+    whether it lags (oldest messages are dropped) or is disconnected.
+    Connections that fail or close are removed automatically.
+
+    Clients subscribe to topics ('user:42') or wildcard prefixes
+    ('model:Order:*'); ``publish`` only touches the subscribed sockets
+    through a topic -> connections index.
+
+    With a ``backplane`` (see fastapi.backplane) publish and broadcast
+    also reach the clients connected to the other workers.
+    """
+
+    backplane = None
+
+    def __init__(self, max_queue=100, policy=SlowConsumerPolicy.LAG):
+        self.max_queue = max_queue
+        self.policy = policy
+        self._connections: dict[WebSocket, _Connection] = {}
+        self._topics: dict[str, set[WebSocket]] = {}
+        self._prefixes: dict[str, set[WebSocket]] = {}
+
+    @property
+    def connections(self):
+        """Set-like view of the connected websockets."""
+        return self._connections.keys()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.connections.append(websocket)
+        connection = _Connection(websocket, self.max_queue)
+        connection.task = asyncio.create_task(self._write(connection))
+        self._connections[websocket] = connection
+
+    async def disconnect(self, websocket: WebSocket, code: int = 1000):
+        connection = self._discard(websocket)
+        if connection is None:
+            return
+        if connection.task is not None and \
+                connection.task is not asyncio.current_task():
+            connection.task.cancel()
+        await self._close(websocket, code)
+
+    async def serve(
+        self,
+        websocket: WebSocket,
+        on_message: Optional[Callable[[WebSocket, dict], Awaitable]] = None,
+    ):
+        """
+        Connects the websocket and handles its messages until it closes:
+            {"action": "subscribe", "topic": "model:Order:*"}
+            {"action": "unsubscribe", "topic": "model:Order:*"}
+        Any other message is passed to ``on_message``. A frame that is
+        not valid JSON gets an error message; a binary frame closes the
+        connection with 1003.
+        """
+        await self.connect(websocket)
+        try:
+            while True:
+                try:
+                    message = await websocket.receive_json()
+                except json.JSONDecodeError:
+                    await self.send(websocket, {'error': 'Invalid JSON'})
+                    continue
+                except KeyError:
+                    # receive_json solo acepta frames de texto
+                    logger.debug('Binary frame from websocket %r', websocket)
+                    await self.disconnect(
+                        websocket, UNSUPPORTED_DATA_CLOSE_CODE)
+                    return
+                action = message.get('action') \
+                    if isinstance(message, dict) else None
+                if action in ('subscribe', 'unsubscribe'):
+                    try:
+                        getattr(self, action)(websocket, message.get('topic'))
+                    except (TypeError, ValueError) as e:
+                        await self.send(websocket, {'error': str(e)})
+                elif on_message is not None:
+                    await on_message(websocket, message)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await self.disconnect(websocket)
+
+    def subscribe(self, websocket: WebSocket, topic: str) -> None:
+        if not isinstance(topic, str) or not topic:
+            raise TypeError('topic must be a non-empty string')
+        connection = self._connections.get(websocket)
+        if connection is None:
+            return
+        prefix = topic_prefix(topic)
+        if prefix is None:
+            self._topics.setdefault(topic, set()).add(websocket)
+        else:
+            self._prefixes.setdefault(prefix, set()).add(websocket)
+        connection.topics.add(topic)
+
+    def unsubscribe(self, websocket: WebSocket, topic: str) -> None:
+        connection = self._connections.get(websocket)
+        if connection is None or topic not in connection.topics:
+            return
+        connection.topics.discard(topic)
+        self._unindex(websocket, topic)
+
+    async def publish(self, topic: str, message: dict) -> int:
+        """
+        Queues {"topic", "data"} for the subscribers of the topic.
+        Returns the number of local connections reached.
+        """
+        data = encode({'topic': topic, 'data': message})
+        if self.backplane is not None:
+            self.backplane.forward(topic, data)
+        return self.deliver(data, topic)
+
+    async def send(self, websocket: WebSocket, message: dict):
+        """Queues a message for a single connection."""
+        connection = self._connections.get(websocket)
+        if connection is not None:
+            self._offer(connection, encode(message))
 
     async def broadcast(self, message: dict):
-        for connection in self.connections:
-            await connection.send_json(message)
+        data = encode(message)
+        if self.backplane is not None:
+            self.backplane.forward(None, data)
+        self.deliver(data)
+
+    def deliver(self, data: str, topic: Optional[str] = None) -> int:
+        """
+        Queues already encoded text for the subscribers of ``topic`` (every
+        local connection if None). Returns the number of connections.
+        """
+        if topic is None:
+            connections = list(self._connections.values())
+        else:
+            websockets = set(self._topics.get(topic, ()))
+            if self._prefixes:
+                for prefix in topic_prefixes(topic):
+                    websockets.update(self._prefixes.get(prefix, ()))
+            connections = [
+                self._connections[websocket] for websocket in websockets
+                if websocket in self._connections
+            ]
+        for connection in connections:
+            self._offer(connection, data)
+        return len(connections)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'connections': len(self._connections),
+            'topics': len(self._topics) + len(self._prefixes),
+            'queued': sum(c.queue.qsize() for c in self._connections.values()),
+            'lagged': sum(c.lagged for c in self._connections.values()),
+        }
+
+    def _offer(self, connection: _Connection, data: str) -> None:
+        try:
+            connection.queue.put_nowait(data)
+            return
+        except asyncio.QueueFull:
+            pass
+        if self.policy == SlowConsumerPolicy.DROP:
+            asyncio.ensure_future(self.disconnect(
+                connection.websocket, SLOW_CONSUMER_CLOSE_CODE))
+            return
+        connection.lagged += 1
+        connection.queue.get_nowait()
+        connection.queue.put_nowait(data)
+
+    def _discard(self, websocket: WebSocket) -> Optional[_Connection]:
+        connection = self._connections.pop(websocket, None)
+        if connection is not None:
+            for topic in connection.topics:
+                self._unindex(websocket, topic)
+            connection.topics.clear()
+        return connection
+
+    def _unindex(self, websocket: WebSocket, topic: str) -> None:
+        prefix = topic_prefix(topic)
+        index, key = (self._topics, topic) if prefix is None \
+            else (self._prefixes, prefix)
+        websockets = index.get(key)
+        if websockets is not None:
+            websockets.discard(websocket)
+            if not websockets:
+                del index[key]
+
+    async def _write(self, connection: _Connection) -> None:
+        websocket = connection.websocket
+        while True:
+            data = await connection.queue.get()
+            try:
+                await websocket.send_text(data)
+            except Exception:
+                # Socket cerrado o caido: se elimina del registro
+                logger.debug('Dropping websocket %r', websocket, exc_info=True)
+                await self.disconnect(websocket)
+                return
+
+    @staticmethod
+    async def _close(websocket: WebSocket, code: int) -> None:
+        if websocket.application_state == WebSocketState.DISCONNECTED or \
+                websocket.client_state == WebSocketState.DISCONNECTED:
+            return
+        try:
+            await websocket.close(code)
+        except Exception:
+            pass
 
 
 manager = WebSocketManager()
@@ -0,0 +1,109 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from dj_core_utils.db.models import OperationLog
+
+FIELDS = (
+    'id', 'user_id', 'model_changed', 'id_instance',
+    'operation_type', 'date', 'changes',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Streams expired OperationLog rows into a gzip JSONL archive '
+        'and deletes them in bounded batches'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'AUDIT_LOG_RETENTION_DAYS', 365),
+            help='Archive logs older than this number of days',
+        )
+        parser.add_argument(
+            '--before',
+            help='Archive logs before this date (YYYY-MM-DD), overrides --days',
+        )
+        parser.add_argument('--output-dir', default='.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--no-delete',
+            action='store_true',
+            help='Only write the archive',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        cutoff = self._cutoff(options)
+        using = options['database']
+        batch_size = options['batch_size']
+        path = os.path.join(
+            options['output_dir'],
+            f'operation_logs_{cutoff:%Y%m%d%H%M%S}.jsonl.gz'
+        )
+
+        rows = (
+            OperationLog.objects.using(using)
+            .filter(date__lt=cutoff)
+            .order_by('date', 'id')
+            .values_list(*FIELDS)
+            .iterator(chunk_size=options['chunk_size'])
+        )
+
+        archived = 0
+        with gzip.open(path, 'wt', encoding='utf-8') as archive:
+            batch = []
+            for row in rows:
+                record = dict(zip(FIELDS, row))
+                archive.write(json.dumps(record, cls=DjangoJSONEncoder))
+                archive.write('\n')
+                batch.append(record['id'])
+                if len(batch) >= batch_size:
+                    archived += self._commit_batch(
+                        archive, batch, using, options['no_delete'])
+                    batch = []
+            archived += self._commit_batch(
+                archive, batch, using, options['no_delete'])
+
+        self.stdout.write(f'{archived} logs archived in {path}')
+
+    def _cutoff(self, options) -> datetime:
+        if not options['before']:
+            return timezone.now() - timedelta(days=options['days'])
+        try:
+            cutoff = datetime.strptime(options['before'], '%Y-%m-%d')
+        except ValueError:
+            raise CommandError('--before must use the YYYY-MM-DD format')
+        if settings.USE_TZ:
+            cutoff = timezone.make_aware(cutoff)
+        return cutoff
+
+    def _commit_batch(self, archive, pks, using, no_delete) -> int:
+        """Flushes the archive and then deletes the rows already written."""
+        if not pks:
+            return 0
+        archive.flush()
+        if not no_delete:
+            # DELETE directo: sin cargar instancias ni emitir señales
+            table = connections[using].ops.quote_name(
+                OperationLog._meta.db_table)
+            pk = connections[using].ops.quote_name(
+                OperationLog._meta.pk.column)
+            placeholders = ', '.join(['%s'] * len(pks))
+            with connections[using].cursor() as cursor:
+                cursor.execute(
+                    f'DELETE FROM {table} WHERE {pk} IN ({placeholders})',
+                    pks
+                )
+        return len(pks)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from dj_core_utils.db.models import OperationLog
+from dj_core_utils.db.partitions import create_monthly_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Creates the monthly partitions of OperationLog ahead of time '
+        '(PostgreSQL, table partitioned by RANGE (date))'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=3)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        created = create_monthly_partitions(
+            OperationLog,
+            months_ahead=options['months'],
+            using=options['database'],
+        )
+        if not created:
+            self.stdout.write('OperationLog is not a partitioned table')
+            return
+        for name in created:
+            self.stdout.write(f'Partition ready: {name}')
@@ -1,4 +1,7 @@
 import threading
+from contextlib import contextmanager
+
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.deprecation import MiddlewareMixin
 
 _request_local = threading.local()
@@ -26,3 +29,42 @@ class CurrentUserMiddleware(MiddlewareMixin):
 def get_current_user():
     """Get the current user from anywhere in the code"""
     return getattr(_request_local, 'user', None)
+
+
+def _set_currentuser(user) -> None:
+    """
+    Sets the django-currentuser user of this thread (CurrentUserField
+    defaults and on_update). Its only setter is private, so a release
+    without it fails here instead of saving rows with the wrong user.
+    """
+    from django_currentuser import middleware
+
+    setter = getattr(middleware, '_set_current_user', None)
+    if setter is None:
+        raise ImproperlyConfigured(
+            'django_currentuser.middleware._set_current_user is missing: '
+            'this django-currentuser release is not supported')
+    setter(user)
+
+
+@contextmanager
+def acting_user(user):
+    """
+    Makes ``user`` the current user of this thread inside the block, for
+    get_current_user() and for CurrentUserField, outside a request:
+        with acting_user(user):
+            Model.objects.bulk_create(instances)
+    """
+    from django_currentuser.middleware import (
+        get_current_user as get_currentuser
+    )
+
+    previous = get_current_user()
+    previous_currentuser = get_currentuser()
+    _set_currentuser(user)
+    _request_local.user = user
+    try:
+        yield user
+    finally:
+        _request_local.user = previous
+        _set_currentuser(previous_currentuser)
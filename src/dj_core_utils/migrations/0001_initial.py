@@ -0,0 +1,339 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:23
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+import django_currentuser.db.models.fields
+import django_currentuser.middleware
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClasificationFile",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "lock_type",
+                    models.CharField(
+                        choices=[
+                            ("full", "Full Access"),
+                            ("read", "Read Only"),
+                            ("none", "No Access"),
+                        ],
+                        default="full",
+                        max_length=10,
+                    ),
+                ),
+                ("object_locked", models.BooleanField(default=False)),
+                (
+                    "universal_state",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("frozen", "Frozen"),
+                            ("active", "Active"),
+                            ("effective", "Effective"),
+                            ("terminated", "Terminated"),
+                        ],
+                        db_index=True,
+                        default="active",
+                        max_length=15,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("nombre", models.CharField(max_length=50, unique=True)),
+                (
+                    "created_by",
+                    django_currentuser.db.models.fields.CurrentUserField(
+                        default=django_currentuser.middleware.get_current_authenticated_user,
+                        editable=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="%(class)s_created",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "updated_by",
+                    django_currentuser.db.models.fields.CurrentUserField(
+                        default=django_currentuser.middleware.get_current_authenticated_user,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        on_update=True,
+                        related_name="%(class)s_updated",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Clasificación de archivo",
+                "verbose_name_plural": "Clasificaciones de archivos",
+            },
+        ),
+        migrations.CreateModel(
+            name="Comments",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "lock_type",
+                    models.CharField(
+                        choices=[
+                            ("full", "Full Access"),
+                            ("read", "Read Only"),
+                            ("none", "No Access"),
+                        ],
+                        default="full",
+                        max_length=10,
+                    ),
+                ),
+                ("object_locked", models.BooleanField(default=False)),
+                (
+                    "universal_state",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("frozen", "Frozen"),
+                            ("active", "Active"),
+                            ("effective", "Effective"),
+                            ("terminated", "Terminated"),
+                        ],
+                        db_index=True,
+                        default="active",
+                        max_length=15,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("comment", models.TextField(verbose_name="Comentario")),
+                ("object_id", models.PositiveIntegerField()),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "created_by",
+                    django_currentuser.db.models.fields.CurrentUserField(
+                        default=django_currentuser.middleware.get_current_authenticated_user,
+                        editable=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="%(class)s_created",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "updated_by",
+                    django_currentuser.db.models.fields.CurrentUserField(
+                        default=django_currentuser.middleware.get_current_authenticated_user,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        on_update=True,
+                        related_name="%(class)s_updated",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "comentario",
+                "verbose_name_plural": "comentarios",
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "object_id", "universal_state"],
+                        name="comment_object_state_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="File",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "lock_type",
+                    models.CharField(
+                        choices=[
+                            ("full", "Full Access"),
+                            ("read", "Read Only"),
+                            ("none", "No Access"),
+                        ],
+                        default="full",
+                        max_length=10,
+                    ),
+                ),
+                ("object_locked", models.BooleanField(default=False)),
+                (
+                    "universal_state",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("frozen", "Frozen"),
+                            ("active", "Active"),
+                            ("effective", "Effective"),
+                            ("terminated", "Terminated"),
+                        ],
+                        db_index=True,
+                        default="active",
+                        max_length=15,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "file",
+                    models.FileField(
+                        upload_to="archivos/%Y/%m/%d/", verbose_name="Archivo"
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                (
+                    "clasificacion",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="dj_core_utils.clasificationfile",
+                        verbose_name="Clasificación de archivo",
+                    ),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "created_by",
+                    django_currentuser.db.models.fields.CurrentUserField(
+                        default=django_currentuser.middleware.get_current_authenticated_user,
+                        editable=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="%(class)s_created",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "updated_by",
+                    django_currentuser.db.models.fields.CurrentUserField(
+                        default=django_currentuser.middleware.get_current_authenticated_user,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        on_update=True,
+                        related_name="%(class)s_updated",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "archivo",
+                "verbose_name_plural": "archivos",
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "object_id", "universal_state"],
+                        name="file_object_state_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="OperationLog",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model_changed", models.CharField(max_length=100)),
+                ("id_instance", models.PositiveIntegerField()),
+                (
+                    "operation_type",
+                    models.CharField(
+                        choices=[
+                            ("create", "Create"),
+                            ("update", "Update"),
+                            ("delete", "Delete"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "date",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                (
+                    "changes",
+                    models.JSONField(
+                        blank=True,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "log",
+                "verbose_name_plural": "logs",
+                "indexes": [
+                    models.Index(
+                        fields=["model_changed", "id_instance", "date"],
+                        name="oplog_instance_date_idx",
+                    ),
+                    models.Index(fields=["user", "date"], name="oplog_user_date_idx"),
+                ],
+            },
+        ),
+    ]
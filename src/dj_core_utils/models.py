@@ -0,0 +1,2 @@
+# Registra los modelos en la app 'dj_core_utils' (migraciones y app registry)
+from .db.models import *  # noqa: F401,F403
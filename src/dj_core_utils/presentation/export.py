@@ -0,0 +1,23 @@
+from typing import Optional, Sequence
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+
+from dj_core_utils.db.export import ExportFormat, content_type, export_chunks
+
+
+def streaming_export(
+    queryset: QuerySet,
+    fields: Sequence[str],
+    export_format: str = ExportFormat.NDJSON,
+    filename: Optional[str] = None,
+    chunk_size: int = 2000,
+) -> StreamingHttpResponse:
+    """StreamingHttpResponse with a queryset as NDJSON or CSV."""
+    response = StreamingHttpResponse(
+        export_chunks(queryset, fields, export_format, chunk_size),
+        content_type=content_type(export_format),
+    )
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
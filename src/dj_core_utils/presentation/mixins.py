@@ -1,6 +1,29 @@
+from typing import Optional
+
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.serializers import BaseSerializer, ModelSerializer
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    ValidationError as DjangoValidationError,
+)
+from django.db import IntegrityError, transaction
+from django.db.models import Model
+
+from dj_core_utils.db.export import CONTENT_TYPES, ExportFormat
+from dj_core_utils.db.mixins import (
+    ChangeTrackingMixin,
+    LockType,
+    UniversalStateMixin,
+    UniversalStateQuerySet,
+    auto_update_values,
+)
+from dj_core_utils.signals.bulk import log_created, log_updated
+from .export import streaming_export
 
 
 class UniversalStateQuerysetMixin:
@@ -20,7 +43,9 @@ class UniversalStateSoftDeleteMixin:
     Compatible with perform_destroy().
     """
     def perform_destroy(self, instance):
-        if hasattr(instance, 'universal_state'):
+        if hasattr(instance, 'set_state'):
+            instance.terminate()
+        elif hasattr(instance, 'universal_state'):
             instance.universal_state = 'terminated'
             instance.save()
         else:
@@ -33,6 +58,9 @@ class UniversalStateDestroyMixin:
     """
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
+        if hasattr(instance, 'set_state'):
+            instance.terminate()
+            return Response(status=status.HTTP_204_NO_CONTENT)
         if hasattr(instance, 'universal_state'):
             instance.universal_state = 'terminated'
             instance.save()
@@ -86,3 +114,395 @@ class ActionSerializerMixin:
         # If the action is not in action_serializer_classes, fall back to the default
         # serializer_class defined in the ViewSet (or what super().get_serializer_class() provides)
         return super().get_serializer_class()
+
+
+class ExportMixin:
+    """
+    Adds GET <list url>/export/?file_format=ndjson|csv to a viewset.
+
+    The filtered queryset is streamed (StreamingHttpResponse) from
+    values_list().iterator(), without serializers or pagination, so
+    memory stays flat whatever the number of rows.
+
+    Columns are ``export_fields`` or, by default, the readable fields of
+    the serializer that are model columns, so an export never shows
+    more than the list endpoint:
+
+        export_fields = ['id', 'name', 'customer_id', 'created_at']
+    """
+    export_fields = None
+    export_chunk_size = 2000
+    export_format_query_param = 'file_format'  # 'format' es de DRF
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        export_format = request.query_params.get(
+            self.export_format_query_param, ExportFormat.NDJSON)
+        if export_format not in CONTENT_TYPES:
+            return Response(
+                {'error': f'Unknown export format {export_format!r}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        name = queryset.model._meta.model_name
+        return streaming_export(
+            queryset,
+            fields=self.get_export_fields(),
+            export_format=export_format,
+            filename=f'{name}.{export_format}',
+            chunk_size=self.export_chunk_size,
+        )
+
+    def get_export_fields(self) -> list[str]:
+        if self.export_fields:
+            return list(self.export_fields)
+        opts = self.get_queryset().model._meta
+        fields = []
+        for field in self.get_serializer().fields.values():
+            if field.write_only or field.source == '*' or '.' in field.source:
+                continue
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                continue  # Campo calculado: no hay columna que leer
+            if model_field.concrete and not model_field.many_to_many:
+                fields.append(model_field.name)
+        if not fields:
+            raise ImproperlyConfigured(
+                f'{type(self).__name__} has no export_fields and its '
+                f'serializer has no readable model fields')
+        return fields
+
+
+def _unique_value(opts, names, serializer) -> Optional[tuple]:
+    """
+    Values of a unique field set once the item is written, or None when
+    it can not collide (NULLs, or a field omitted on create).
+    """
+    attrs, instance = serializer.validated_data, serializer.instance
+    values = []
+    for name in names:
+        if name in attrs:
+            value = attrs[name]
+        elif instance is not None:
+            value = getattr(instance, opts.get_field(name).attname)
+        else:
+            return None
+        if isinstance(value, Model):
+            value = value.pk
+        if value is None:
+            return None
+        values.append(value)
+    return tuple(values)
+
+
+class BulkActionsMixin:
+    """
+    Bulk endpoints for a ModelViewSet, one request instead of N:
+
+        POST   <list url>/bulk/         [{...}, {...}]           bulk_create
+        PATCH  <list url>/bulk/         [{"id": 1, ...}, ...]    bulk_update
+        DELETE <list url>/bulk/         {"ids": [1, 2, 3]}       soft delete
+
+    Items are validated with the serializer of the action (see
+    ActionSerializerMixin: 'bulk_create', 'bulk_update') and written
+    with bulk_create / bulk_update / UniversalStateQuerySet.terminate()
+    in one transaction, audited as one batch. Only flat ModelSerializers
+    are written in bulk (see is_bulk_writable); nested writes or a custom
+    create()/update() are saved item by item through the serializer.
+
+    Response: {"results": [...], "errors": {"<index>": {...}}} where
+    results has one entry per item (None for the failed ones). With
+    ``bulk_partial = False`` any error rolls back the whole request (400).
+    """
+    bulk_max_items = 500
+    bulk_batch_size = 500
+    bulk_partial = False
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        items = self.get_bulk_items(request.data)
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+
+        valid, errors = {}, {}
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item, context=context)
+            if serializer.is_valid():
+                valid[index] = serializer
+            else:
+                errors[str(index)] = serializer.errors
+        self.check_bulk_unique(valid, errors)
+        if errors and not self.bulk_partial:
+            return self.get_bulk_error_response(errors)
+
+        try:
+            with transaction.atomic():
+                instances = self.perform_bulk_create(list(valid.values()))
+        except IntegrityError:
+            return self.get_bulk_integrity_response(valid, errors)
+        created = dict(zip(valid, instances))
+        return self.get_bulk_response(
+            items, created, errors, status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        items = self.get_bulk_items(request.data, with_ids=True)
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        instances = self.get_bulk_instances([item['id'] for item in items])
+
+        valid, errors, seen = {}, {}, set()
+        for index, item in enumerate(items):
+            instance = instances.get(str(item['id']))
+            if instance is not None:
+                # dos cambios del mismo objeto: el segundo pisaría al primero
+                if instance.pk in seen:
+                    errors[str(index)] = {'id': ['Duplicate id.']}
+                    continue
+                seen.add(instance.pk)
+            error = self.check_bulk_instance(request, instance)
+            if error is not None:
+                errors[str(index)] = error
+                continue
+            serializer = serializer_class(
+                instance, data=item, partial=True, context=context)
+            if serializer.is_valid():
+                valid[index] = serializer
+            else:
+                errors[str(index)] = serializer.errors
+        self.check_bulk_unique(valid, errors)
+        if errors and not self.bulk_partial:
+            return self.get_bulk_error_response(errors)
+
+        try:
+            with transaction.atomic():
+                self.perform_bulk_update(list(valid.values()))
+        except IntegrityError:
+            return self.get_bulk_integrity_response(valid, errors)
+        updated = {
+            index: serializer.instance for index, serializer in valid.items()
+        }
+        return self.get_bulk_response(items, updated, errors)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        data = request.data
+        ids = data.get('ids') if isinstance(data, dict) else data
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError({'ids': ['Expected a non-empty list.']})
+        self.check_bulk_size(ids)
+        instances = self.get_bulk_instances(ids)
+
+        deleted, errors = {}, {}
+        for index, pk in enumerate(ids):
+            instance = instances.get(str(pk))
+            error = self.check_bulk_instance(request, instance)
+            if error is not None:
+                errors[str(index)] = error
+            else:
+                deleted[index] = instance
+        if errors and not self.bulk_partial:
+            return self.get_bulk_error_response(errors)
+
+        with transaction.atomic():
+            self.perform_bulk_destroy(list(deleted.values()))
+        return Response({
+            'results': [
+                deleted[index].pk if index in deleted else None
+                for index in range(len(ids))
+            ],
+            'errors': errors,
+        })
+
+    def perform_bulk_create(self, serializers: list) -> list:
+        if not serializers:
+            return []
+        if not self.is_bulk_writable(serializers[0], 'create'):
+            return [serializer.save() for serializer in serializers]
+        model = serializers[0].Meta.model
+        instances, many_to_many = [], []
+        m2m_names = {field.name for field in model._meta.many_to_many}
+        for serializer in serializers:
+            attrs = dict(serializer.validated_data)
+            m2m = {name: attrs.pop(name) for name in m2m_names & set(attrs)}
+            instances.append(model(**attrs))
+            many_to_many.append(m2m)
+        model._default_manager.bulk_create(
+            instances, batch_size=self.bulk_batch_size)
+        for instance, m2m in zip(instances, many_to_many):
+            for name, value in m2m.items():
+                getattr(instance, name).set(value)
+        log_created(model, instances, user=self.request.user)
+        return instances
+
+    def perform_bulk_update(self, serializers: list) -> None:
+        if not serializers:
+            return
+        if not self.is_bulk_writable(serializers[0], 'update'):
+            for serializer in serializers:
+                serializer.save()
+            return
+        pairs = [
+            (serializer.instance, serializer.validated_data)
+            for serializer in serializers
+        ]
+        model = type(pairs[0][0])
+        opts = model._meta
+        m2m_names = {field.name for field in opts.many_to_many}
+        user = self.request.user
+        # bulk_update no llama a pre_save: auto_now / on_update a mano
+        auto_values = auto_update_values(model, user)
+        fields, changes = set(), {}
+        for instance, attrs in pairs:
+            for name, value in attrs.items():
+                if name in m2m_names:
+                    getattr(instance, name).set(value)
+                else:
+                    setattr(instance, name, value)
+                    fields.add(name)
+            for attname, value in auto_values.items():
+                setattr(instance, attname, value)
+            fields.update(auto_values)
+            if isinstance(instance, ChangeTrackingMixin):
+                changes[instance.pk] = instance.get_changes()
+        if fields:
+            model._default_manager.bulk_update(
+                [instance for instance, _ in pairs],
+                list(fields),
+                batch_size=self.bulk_batch_size,
+            )
+        log_updated(model, changes, user=user)
+
+    def perform_bulk_destroy(self, instances: list) -> None:
+        if not instances:
+            return
+        model = type(instances[0])
+        pks = [instance.pk for instance in instances]
+        # Igual que el destroy individual: el borrado lógico no depende
+        # del manager por defecto del modelo
+        if issubclass(model, UniversalStateMixin):
+            UniversalStateQuerySet(model).filter(pk__in=pks).terminate(
+                user=self.request.user)
+        else:
+            model._default_manager.filter(pk__in=pks).delete()
+
+    def is_bulk_writable(self, serializer, method: str) -> bool:
+        """
+        True if ``method`` ('create' or 'update') of the serializer is the
+        plain ModelSerializer one and no writable field is nested or has a
+        dotted source, so bulk_create / bulk_update write the same rows.
+        """
+        if not isinstance(serializer, ModelSerializer):
+            return False
+        if getattr(type(serializer), method) is not getattr(
+                ModelSerializer, method):
+            return False
+        return not any(
+            isinstance(field, BaseSerializer) or '.' in field.source
+            for field in serializer._writable_fields
+        )
+
+    def check_bulk_unique(self, valid: dict, errors: dict) -> None:
+        """
+        Moves to ``errors`` the items of ``valid`` that repeat the value
+        of a unique field (or unique_together / UniqueConstraint) of an
+        earlier item: validation only compares against saved rows.
+        """
+        if not valid:
+            return
+        serializer = next(iter(valid.values()))
+        opts = serializer.Meta.model._meta
+        unique_sets = [
+            (field.name,) for field in opts.concrete_fields
+            if field.unique and not field.primary_key
+        ]
+        unique_sets += [tuple(names) for names in opts.unique_together]
+        unique_sets += [
+            tuple(constraint.fields)
+            for constraint in opts.total_unique_constraints
+        ]
+        for names in unique_sets:
+            seen = set()
+            for index, serializer in list(valid.items()):
+                value = _unique_value(opts, names, serializer)
+                if value is None:
+                    continue
+                if value in seen:
+                    errors[str(index)] = {
+                        name: ['Duplicate value in this request.']
+                        for name in names
+                    }
+                    del valid[index]
+                else:
+                    seen.add(value)
+
+    def get_bulk_items(self, data, with_ids: bool = False) -> list:
+        if not isinstance(data, list) or not data:
+            raise ValidationError({'items': ['Expected a non-empty list.']})
+        self.check_bulk_size(data)
+        if with_ids and any(
+                not isinstance(item, dict) or 'id' not in item
+                for item in data):
+            raise ValidationError({'items': ['Every item needs an "id".']})
+        return data
+
+    def check_bulk_size(self, items: list) -> None:
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({'items': [
+                f'At most {self.bulk_max_items} items per request.']})
+
+    def get_bulk_instances(self, ids: list) -> dict:
+        """{str(pk): instance} of the ids visible through get_queryset."""
+        pk_field = self.get_queryset().model._meta.pk
+        valid_ids = []
+        for pk in ids:
+            try:
+                valid_ids.append(pk_field.to_python(pk))
+            except DjangoValidationError:
+                pass
+        queryset = self.filter_queryset(self.get_queryset())
+        return {
+            str(instance.pk): instance
+            for instance in queryset.filter(pk__in=valid_ids)
+        }
+
+    def check_bulk_instance(self, request, instance):
+        """Error of one item, or None if it can be written."""
+        if instance is None:
+            return {'id': ['Not found.']}
+        try:
+            self.check_object_permissions(request, instance)
+        except PermissionDenied as e:
+            return {'detail': [str(e.detail)]}
+        if getattr(instance, 'object_locked', False) or getattr(
+                instance, 'lock_type', LockType.FULL_ACCESS
+        ) != LockType.FULL_ACCESS:
+            return {'detail': ['Object is locked.']}
+        return None
+
+    def get_bulk_response(self, items, saved: dict, errors: dict,
+                          status_code=status.HTTP_200_OK):
+        data = self.get_serializer(list(saved.values()), many=True).data
+        by_index = dict(zip(saved, data))
+        return Response({
+            'results': [by_index.get(index) for index in range(len(items))],
+            'errors': errors,
+        }, status=status_code)
+
+    def get_bulk_integrity_response(self, valid: dict, errors: dict):
+        """
+        400 when the database rejects the batch (a race or a constraint
+        the validation does not know): nothing was written.
+        """
+        for index in valid:
+            errors[str(index)] = {
+                'detail': ['Conflicts with another row, nothing was saved.']}
+        return self.get_bulk_error_response(errors)
+
+    def get_bulk_error_response(self, errors: dict):
+        return Response(
+            {'results': None, 'errors': errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
@@ -0,0 +1,93 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from dj_core_utils.db.pagination import (
+    CountMode, CursorPaginator, InvalidCursor
+)
+
+
+class CoreCursorPagination(BasePagination):
+    """
+    Keyset pagination for viewsets with signed cursors (see
+    dj_core_utils.db.pagination). Query params: cursor, limit.
+
+    Subclass to change the ordering, page sizes or count mode:
+        class OrderPagination(CoreCursorPagination):
+            ordering = ('-created_at', '-id')
+            count = CountMode.ESTIMATE
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    max_page_size = 200
+    count = CountMode.NONE
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+
+    def get_paginator(self) -> CursorPaginator:
+        return CursorPaginator(
+            ordering=self.ordering,
+            page_size=self.page_size,
+            max_page_size=self.max_page_size,
+            count=self.count,
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        try:
+            limit = int(request.query_params.get(
+                self.page_size_query_param, self.page_size))
+            self.page = self.get_paginator().paginate(
+                queryset,
+                cursor=request.query_params.get(self.cursor_query_param),
+                limit=limit,
+            )
+        except (InvalidCursor, ValueError):
+            raise ValidationError({'error': 'Invalid cursor or limit'})
+        return self.page.results
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_link(self.page.next),
+            'previous': self.get_link(self.page.previous),
+            'results': data,
+        }
+        if self.page.count is not None:
+            response = {'count': self.page.count, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {
+                    'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'schema': {'type': 'integer'},
+            },
+        ]
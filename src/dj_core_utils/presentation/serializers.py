@@ -2,6 +2,8 @@ from rest_framework import serializers
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
 
+from dj_core_utils.db.models import OperationLog
+
 User = get_user_model()
 
 
@@ -15,3 +17,12 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("id", "username", "email", "user_type")
+
+
+class OperationLogSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OperationLog
+        fields = (
+            "id", "user", "model_changed", "id_instance",
+            "operation_type", "date", "changes",
+        )
@@ -1,10 +1,45 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.module_loading import import_string
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import BasePermission, IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.contenttypes.models import ContentType
 
-from dj_core_utils.presentation.serializers import ContentTypeSerializer, UserSerializer
+from dj_core_utils.db.history import (
+    InvalidCursor, get_history, get_state_at, history_allowed
+)
+from dj_core_utils.presentation.serializers import (
+    ContentTypeSerializer, OperationLogSerializer, UserSerializer
+)
+
+HISTORY_MAX_LIMIT = 200
+HISTORY_PERMISSION_CLASSES = ['rest_framework.permissions.IsAdminUser']
+
+
+class HistoryPermission(BasePermission):
+    """
+    Every permission of AUDIT_HISTORY_PERMISSION_CLASSES (IsAdminUser by
+    default): the audit stream holds the values of every audited model.
+    """
+    def has_permission(self, request, view):
+        paths = getattr(
+            settings, 'AUDIT_HISTORY_PERMISSION_CLASSES',
+            HISTORY_PERMISSION_CLASSES)
+        return all(
+            import_string(path)().has_permission(request, view)
+            for path in paths
+        )
+
+
+def _history_not_found():
+    return Response(
+        {"error": "History not available"},
+        status=status.HTTP_404_NOT_FOUND
+    )
 
 
 @api_view(["GET"])
@@ -18,3 +53,55 @@ def get_content_type(request, app_label=None, model=None):
 @permission_classes([IsAuthenticated])
 def get_my_data(request):
     return Response(UserSerializer(request.user).data)
+
+
+@api_view(["GET"])
+@permission_classes([HistoryPermission])
+def get_operation_history(request, model_changed, id_instance):
+    """Change stream of an instance. Query params: cursor, limit."""
+    if not history_allowed(model_changed):
+        return _history_not_found()
+    try:
+        limit = min(int(request.query_params.get("limit", 50)), HISTORY_MAX_LIMIT)
+        logs, next_cursor = get_history(
+            model_changed,
+            id_instance,
+            cursor=request.query_params.get("cursor"),
+            limit=max(limit, 1),
+        )
+    except (InvalidCursor, ValueError):
+        return Response(
+            {"error": "Invalid cursor or limit"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response({
+        "next": next_cursor,
+        "results": OperationLogSerializer(logs, many=True).data,
+    })
+
+
+@api_view(["GET"])
+@permission_classes([HistoryPermission])
+def get_operation_state(request, model_changed, id_instance):
+    """Field values of an instance at a moment. Query param: at (ISO 8601)."""
+    if not history_allowed(model_changed):
+        return _history_not_found()
+    moment = timezone.now()
+    if "at" in request.query_params:
+        try:
+            moment = parse_datetime(request.query_params["at"])
+        except ValueError:
+            moment = None
+        if moment is None:
+            return Response(
+                {"error": "Invalid 'at' datetime"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if settings.USE_TZ and timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+    return Response({
+        "model_changed": model_changed,
+        "id_instance": id_instance,
+        "at": moment,
+        "state": get_state_at(model_changed, id_instance, moment),
+    })
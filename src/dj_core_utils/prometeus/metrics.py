@@ -1,4 +1,4 @@
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge, Histogram
 
 EVENTS_PUBLISHED = Counter(
     'django_events_published_total',
@@ -8,3 +8,28 @@ EVENTS_PUBLISHED = Counter(
 
 # En tu código al publicar:
 # EVENTS_PUBLISHED.labels(event_type="orden_creada").inc()
+
+AUDIT_QUEUE_DEPTH = Gauge(
+    'django_audit_queue_depth',
+    'Registros de auditoría pendientes en la cola'
+)
+
+AUDIT_FLUSH_SECONDS = Histogram(
+    'django_audit_flush_seconds',
+    'Tiempo de escritura de un lote de auditoría'
+)
+
+AUDIT_DROPPED = Counter(
+    'django_audit_dropped_total',
+    'Registros de auditoría descartados por la cola llena'
+)
+
+
+def record_audit_metric(metric, value):
+    """Metrics hook for the audit pipeline (AUDIT_METRICS_HOOK)."""
+    if metric == 'queue_depth':
+        AUDIT_QUEUE_DEPTH.set(value)
+    elif metric == 'flush_latency':
+        AUDIT_FLUSH_SECONDS.observe(value)
+    elif metric == 'dropped':
+        AUDIT_DROPPED.inc(value)
@@ -71,6 +71,27 @@ class CoreSettings:
             'ACCESS_TOKEN_LIFETIME': timedelta(minutes=120),
         }
     )
+    # Usuario construido desde los claims del token (sin query por request)
+    JWT_STATELESS_USER = os.getenv('JWT_STATELESS_USER', 'False') == 'True'
+    # Segundos que se cachean los usuarios leidos de la BD (0 = sin cache)
+    JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', '0'))
+
+    # Audit
+    AUDIT_BUFFER_MAX_SIZE = int(os.getenv('AUDIT_BUFFER_MAX_SIZE', '500'))
+    AUDIT_PIPELINE_MODE = os.getenv('AUDIT_PIPELINE_MODE', 'sync')
+    AUDIT_QUEUE_SIZE = int(os.getenv('AUDIT_QUEUE_SIZE', '10000'))
+    AUDIT_QUEUE_OVERFLOW = os.getenv('AUDIT_QUEUE_OVERFLOW', 'block')
+    AUDIT_LOG_RETENTION_DAYS = int(
+        os.getenv('AUDIT_LOG_RETENTION_DAYS', '365'))
+    # Modelos cuyo historial se expone (vacío = todos los auditados)
+    AUDIT_HISTORY_MODELS = [
+        name for name in os.getenv('AUDIT_HISTORY_MODELS', '').split(',')
+        if name
+    ]
+    # Permisos DRF de los endpoints de historial (todos deben cumplirse)
+    AUDIT_HISTORY_PERMISSION_CLASSES = [
+        'rest_framework.permissions.IsAdminUser',
+    ]
 
     # Logging
     LOGGING_CONFIG = 'logging.config.dictConfig'
@@ -87,3 +108,15 @@ class CoreSettings:
             'level': 'INFO',
         },
     }
+
+
+def get_settings():
+    """
+    Settings for code that can run without Django (e.g. FastAPI):
+    django.conf.settings once Django is configured, CoreSettings otherwise.
+    """
+    from django.conf import settings
+
+    if settings.configured:
+        return settings
+    return CoreSettings
@@ -1,37 +1,112 @@
+import re
 from typing import Any
-from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.db.models.signals import (
+    pre_save, post_save, post_delete, m2m_changed
+)
 from django.dispatch import receiver
-from django.db.models import JSONField, ForeignKey, ManyToManyField, Model
+from django.db.models import FileField, JSONField, Model
 
 from dj_core_utils.middleware.context import get_current_user
-from dj_core_utils.db.models import OperationLog, OperationType
+from dj_core_utils.db.mixins import ChangeTrackingMixin
+from dj_core_utils.db.models import OperationType
+
+from .buffer import audit_buffer
+from .bulk import register_audit_handler
+
+
+def _json_value(value):
+    return value if isinstance(value, dict) else dict(value or {})
+
+
+def _file_value(value):
+    return getattr(value, 'name', value) or None
+
+
+REDACTED = '[redacted]'
+
+
+def _redacted(value):
+    return None if value is None else REDACTED
 
 
 class AuditHandler:
     EXCLUDED_MODELS = ['OperationLog']
+    # Campos cuyo valor nunca se guarda en el log (solo que cambiaron)
+    SENSITIVE_FIELDS = re.compile(
+        r'password|passwd|secret|token|api_?key', re.IGNORECASE)
+
+    # {model: (concrete_fields, ((attname, converter), ...))}
+    _plans: dict[type[Model], tuple] = {}
 
     @classmethod
-    def model_to_dict_safe(cls, instance: Model) -> dict[str, Any]:
-        """Serializes a model securely for auditing."""
-        data = {}
-        for field in instance._meta.get_fields():
-            if isinstance(field, ManyToManyField):
-                continue  # Los M2M se manejan aparte
-            try:
-                value = getattr(instance, field.name, None)
-
-                if isinstance(field, ForeignKey):
-                    data[field.name] = str(value) if value else None
+    def get_serialization_plan(cls, model: type[Model]) -> tuple:
+        """
+        Returns the (attname, converter) pairs used to serialize a model.
+
+        Only concrete fields are included, so M2M, reverse and generic
+        relations are skipped ahead of time and ForeignKeys are read from
+        their attname without fetching the related object. Fields matching
+        SENSITIVE_FIELDS are redacted. The plan is rebuilt when the app
+        registry expires the ``_meta`` caches.
+        """
+        fields = model._meta.concrete_fields
+        plan = cls._plans.get(model)
+        if plan is None or plan[0] is not fields:
+            steps = []
+            for field in fields:
+                converter = None
+                if cls.SENSITIVE_FIELDS.search(field.attname):
+                    converter = _redacted
                 elif isinstance(field, JSONField):
-                    data[field.name] = (
-                        value if isinstance(value, dict) else dict(value or {})
-                    )
-                else:
-                    data[field.name] = value
-            except Exception:
-                data[field.name] = None
+                    converter = _json_value
+                elif isinstance(field, FileField):
+                    converter = _file_value
+                steps.append((field.attname, converter))
+            plan = (fields, tuple(steps))
+            cls._plans[model] = plan
+        return plan[1]
+
+    @classmethod
+    def model_to_dict_safe(
+            cls,
+            instance: Model,
+            redact: bool = True) -> dict[str, Any]:
+        """
+        Serializes a model securely for auditing. ``redact=False`` keeps
+        the sensitive values, only to diff them before clean_changes.
+        """
+        data = {}
+        values = instance.__dict__
+        for attname, converter in cls.get_serialization_plan(type(instance)):
+            if attname not in values:
+                continue  # Campo diferido, no se consulta
+            value = values[attname]
+            if converter is _redacted and not redact:
+                converter = None
+            if converter is not None:
+                try:
+                    value = converter(value)
+                except Exception:
+                    value = None
+            data[attname] = value
         return data
 
+    @classmethod
+    def clean_changes(
+            cls,
+            model: type[Model],
+            changes: dict[str, Any]) -> dict[str, Any]:
+        """Applies the serialization plan (and redaction) to a diff."""
+        for attname, converter in cls.get_serialization_plan(model):
+            if converter is None or attname not in changes:
+                continue
+            for key, value in changes[attname].items():
+                try:
+                    changes[attname][key] = converter(value)
+                except Exception:
+                    changes[attname][key] = None
+        return changes
+
     @classmethod
     def get_changes(
             cls,
@@ -46,8 +121,36 @@ class AuditHandler:
         }
 
 
+@receiver(pre_save)
+def handle_pre_save(sender, instance, raw=False, **kwargs):
+    """
+    Keeps the 'before' state of models without change tracking.
+    ChangeTrackingMixin models already know it, so no query is made.
+    """
+    if sender.__name__ in AuditHandler.EXCLUDED_MODELS:
+        return
+    if raw or isinstance(instance, ChangeTrackingMixin):
+        return
+    if instance._state.adding or instance.pk is None:
+        return
+
+    before_instance = sender._base_manager.using(
+        instance._state.db).filter(pk=instance.pk).first()
+    instance._audit_before = (
+        AuditHandler.model_to_dict_safe(before_instance, redact=False)
+        if before_instance else None
+    )
+
+
 @receiver(post_save)
-def handle_save(sender, instance, created, **kwargs):
+def handle_save(
+    sender,
+    instance,
+    created,
+    using=None,
+    update_fields=None,
+    **kwargs
+):
     if sender.__name__ in AuditHandler.EXCLUDED_MODELS:
         return
 
@@ -65,24 +168,28 @@ def handle_save(sender, instance, created, **kwargs):
     if created:
         audit_data['changes'] = {
             'new': AuditHandler.model_to_dict_safe(instance)}
+    elif isinstance(instance, ChangeTrackingMixin):
+        audit_data['changes'] = AuditHandler.clean_changes(
+            sender, instance.get_changes(update_fields))
     else:
-        try:
-            before_instance = sender.objects.get(pk=instance.pk)
-            before = AuditHandler.model_to_dict_safe(before_instance)
-            after = AuditHandler.model_to_dict_safe(instance)
-            audit_data['changes'] = AuditHandler.get_changes(before, after)
-        except sender.DoesNotExist:
+        before = instance.__dict__.pop('_audit_before', None)
+        if before is None:
             audit_data['changes'] = {}
+        else:
+            after = AuditHandler.model_to_dict_safe(instance, redact=False)
+            audit_data['changes'] = AuditHandler.clean_changes(
+                sender, AuditHandler.get_changes(before, after))
 
-    OperationLog.objects.create(**audit_data)
+    audit_buffer.add(using=using, **audit_data)
 
 
 @receiver(post_delete)
-def handle_delete(sender, instance, **kwargs):
+def handle_delete(sender, instance, using=None, **kwargs):
     if sender.__name__ in AuditHandler.EXCLUDED_MODELS:
         return
 
-    OperationLog.objects.create(
+    audit_buffer.add(
+        using=using,
         user=get_current_user(),
         model_changed=sender.__name__,
         id_instance=instance.pk,
@@ -99,6 +206,7 @@ def handle_m2m_change(
     model,
     pk_set,
     sender,
+    using=None,
     **kwargs
 ):
     model_name = instance.__class__.__name__
@@ -110,7 +218,8 @@ def handle_m2m_change(
 
     user = get_current_user()
 
-    OperationLog.objects.create(
+    audit_buffer.add(
+        using=using,
         user=user,
         model_changed=model_name,
         id_instance=instance.pk,
@@ -121,3 +230,6 @@ def handle_m2m_change(
             'pks': list(pk_set) if pk_set else []
         }
     )
+
+
+register_audit_handler(AuditHandler)
@@ -0,0 +1,123 @@
+import threading
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from .pipeline import audit_pipeline, write_logs
+
+_buffer_local = threading.local()
+
+
+class _PendingLogs:
+    """Logs registered under the same set of savepoints."""
+
+    def __init__(self, flush_callback):
+        self.entries: list[dict[str, Any]] = []
+        self.flush_callback = flush_callback
+
+
+class AuditBuffer:
+    """
+    Collects OperationLog entries per connection and transaction and
+    hands them to the audit pipeline when the transaction commits.
+
+    - Outside an atomic block entries are delivered immediately.
+    - Entries registered inside a rolled back transaction or savepoint
+      are discarded together with their on_commit callback.
+    - When a transaction buffers more than ``max_size`` entries they are
+      flushed early, inside the same transaction.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self._max_size = max_size
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, 'AUDIT_BUFFER_MAX_SIZE', 500)
+
+    def add(self, using: Optional[str] = None, **audit_data: Any) -> None:
+        """Registers a log entry for the current transaction."""
+        using = using or DEFAULT_DB_ALIAS
+        entry = self._record(audit_data)
+        connection = connections[using]
+
+        if not connection.in_atomic_block:
+            audit_pipeline.submit([entry], using)
+            return
+
+        pending = self._pending(using, connection)
+        key = frozenset(connection.savepoint_ids)
+        group = pending.get(key)
+        if group is None:
+            def flush_callback():
+                self._flush(using, key)
+
+            group = _PendingLogs(flush_callback)
+            pending[key] = group
+            transaction.on_commit(flush_callback, using=using)
+
+        group.entries.append(entry)
+        if len(group.entries) >= self.max_size:
+            self._write(group, using)
+
+    def flush(self, using: Optional[str] = None) -> None:
+        """Writes every buffered entry of the current transaction now."""
+        using = using or DEFAULT_DB_ALIAS
+        pending = self._pending(using, connections[using])
+        for group in pending.values():
+            self._write(group, using)
+
+    def _flush(self, using: str, key: frozenset) -> None:
+        group = self._state(using)['pending'].pop(key, None)
+        if group is not None:
+            entries, group.entries = group.entries, []
+            audit_pipeline.submit(entries, using)
+
+    def _write(self, group: _PendingLogs, using: str) -> None:
+        # Dentro de la transacción: se escriben de forma síncrona
+        entries, group.entries = group.entries, []
+        write_logs(entries, using)
+
+    def _record(self, audit_data: dict[str, Any]) -> dict[str, Any]:
+        """Lightweight record that does not keep model instances."""
+        user = audit_data.pop('user', None)
+        audit_data['user_id'] = getattr(user, 'pk', None)
+        audit_data.setdefault('date', timezone.now())
+        return audit_data
+
+    def _state(self, using: str) -> dict[str, Any]:
+        states = getattr(_buffer_local, 'states', None)
+        if states is None:
+            states = _buffer_local.states = {}
+        if using not in states:
+            states[using] = {'hooks': None, 'pending': {}}
+        return states[using]
+
+    def _pending(self, using: str, connection) -> dict[frozenset, _PendingLogs]:
+        """
+        Returns the groups still alive in the current transaction.
+
+        Django replaces ``run_on_commit`` with a new list on commit,
+        rollback and savepoint rollback, so the registered callbacks are
+        only re-checked when that list changes.
+        """
+        state = self._state(using)
+        if state['hooks'] is not connection.run_on_commit:
+            registered = {
+                id(func) for _, func, _ in connection.run_on_commit
+            }
+            state['pending'] = {
+                key: group
+                for key, group in state['pending'].items()
+                if id(group.flush_callback) in registered
+            }
+            state['hooks'] = connection.run_on_commit
+        return state['pending']
+
+
+# Singleton for global use
+audit_buffer = AuditBuffer()
@@ -0,0 +1,82 @@
+from typing import Any, Iterable, Optional
+
+from django.db.models import Model
+
+from dj_core_utils.db.models import OperationType
+
+from .buffer import audit_buffer
+
+# AuditHandler registrado explícitamente (signals.audit lo registra)
+_audit_handler = None
+
+
+def register_audit_handler(handler) -> None:
+    """
+    Audits bulk writes with ``handler`` (an AuditHandler). Importing
+    dj_core_utils.signals.audit registers its AuditHandler next to the
+    receivers; a project can register its own subclass instead.
+    """
+    global _audit_handler
+    _audit_handler = handler
+
+
+def unregister_audit_handler() -> None:
+    """Stops auditing bulk writes."""
+    global _audit_handler
+    _audit_handler = None
+
+
+def audit_handler(model: type[Model]):
+    """
+    Registered AuditHandler unless the model is excluded, otherwise None.
+    Bulk writes send no signals, so they are audited explicitly only in
+    that case, without registering the receivers.
+    """
+    handler = _audit_handler
+    if handler is None or model.__name__ in handler.EXCLUDED_MODELS:
+        return None
+    return handler
+
+
+def log_created(
+    model: type[Model],
+    instances: Iterable[Model],
+    using: Optional[str] = None,
+    user=None,
+) -> None:
+    """Buffers the create logs of bulk_create'd instances."""
+    handler = audit_handler(model)
+    if handler is None:
+        return
+    for instance in instances:
+        audit_buffer.add(
+            using=using,
+            user=user,
+            model_changed=model.__name__,
+            id_instance=instance.pk,
+            operation_type=OperationType.CREATE,
+            changes={'new': handler.model_to_dict_safe(instance)},
+        )
+
+
+def log_updated(
+    model: type[Model],
+    changes: dict[Any, dict[str, Any]],
+    using: Optional[str] = None,
+    user=None,
+) -> None:
+    """Buffers the update logs of {pk: {attname: {before, after}}}."""
+    handler = audit_handler(model)
+    if handler is None:
+        return
+    for pk, diff in changes.items():
+        if not diff:
+            continue
+        audit_buffer.add(
+            using=using,
+            user=user,
+            model_changed=model.__name__,
+            id_instance=pk,
+            operation_type=OperationType.UPDATE,
+            changes=handler.clean_changes(model, diff),
+        )
@@ -0,0 +1,227 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.utils.module_loading import import_string
+
+from dj_core_utils.db.models import OperationLog
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy:
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop_oldest'
+    WRITE_THROUGH = 'write_through'
+
+
+def write_logs(records: list[dict[str, Any]], using: str) -> None:
+    """Writes audit records with a single bulk_create."""
+    if records:
+        OperationLog.objects.using(using).bulk_create(
+            [OperationLog(**record) for record in records],
+            batch_size=getattr(settings, 'AUDIT_BUFFER_MAX_SIZE', 500)
+        )
+
+
+class AuditPipeline:
+    """
+    Delivers committed audit records to the database.
+
+    In 'sync' mode (default) records are written in the calling thread.
+    In 'async' mode they are put in a bounded queue that a background
+    thread drains with bulk_create using its own connection. When the
+    queue is full the overflow policy decides: 'block' waits,
+    'drop_oldest' discards the oldest record and 'write_through' writes
+    in the calling thread.
+
+    The writer thread discards unusable connections before each batch
+    and retries once on OperationalError (database restart, connection
+    dropped while idle); records that still fail are logged and counted
+    as 'dropped'.
+
+    The metrics hook receives (metric, value) for 'queue_depth',
+    'flush_latency' (seconds) and 'dropped'.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        overflow: Optional[str] = None,
+        metrics_hook: Optional[Callable[[str, float], None]] = None,
+    ):
+        self._mode = mode
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._metrics_hook = metrics_hook
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def mode(self) -> str:
+        return self._mode or getattr(settings, 'AUDIT_PIPELINE_MODE', 'sync')
+
+    @mode.setter
+    def mode(self, value: str) -> None:
+        self._mode = value
+
+    @property
+    def overflow(self) -> str:
+        return self._overflow or getattr(
+            settings, 'AUDIT_QUEUE_OVERFLOW', OverflowPolicy.BLOCK)
+
+    @property
+    def metrics_hook(self) -> Optional[Callable[[str, float], None]]:
+        if self._metrics_hook is None:
+            hook = getattr(settings, 'AUDIT_METRICS_HOOK', None)
+            self._metrics_hook = import_string(hook) if hook else False
+        return self._metrics_hook or None
+
+    def submit(self, records: list[dict[str, Any]], using: str) -> None:
+        """Delivers the records of a committed transaction."""
+        if not records:
+            return
+        if self.mode != 'async':
+            self._write(records, using)
+            return
+
+        audit_queue = self._ensure_worker()
+        for record in records:
+            self._put(audit_queue, (using, record))
+        self._metric('queue_depth', audit_queue.qsize())
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Waits until every queued record has been written."""
+        if self._queue is None or self._pid != os.getpid():
+            return
+        if timeout is None:
+            self._queue.join()
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def stop(self, timeout: float = 10) -> None:
+        """Writes the pending records and stops the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or self._pid != os.getpid():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _put(self, audit_queue: queue.Queue, item: tuple) -> None:
+        overflow = self.overflow
+        if overflow == OverflowPolicy.BLOCK:
+            audit_queue.put(item)
+            return
+        try:
+            audit_queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+
+        if overflow == OverflowPolicy.WRITE_THROUGH:
+            self._write([item[1]], item[0])
+            return
+
+        # drop_oldest
+        while True:
+            try:
+                audit_queue.get_nowait()
+                audit_queue.task_done()
+                self._metric('dropped', 1)
+            except queue.Empty:
+                pass
+            try:
+                audit_queue.put_nowait(item)
+                return
+            except queue.Full:
+                continue
+
+    def _ensure_worker(self) -> queue.Queue:
+        with self._lock:
+            # Tras un fork el hilo del proceso padre no existe
+            if self._thread is None or self._pid != os.getpid():
+                maxsize = self._maxsize or getattr(
+                    settings, 'AUDIT_QUEUE_SIZE', 10000)
+                self._queue = queue.Queue(maxsize=maxsize)
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(self._queue,),
+                    name='audit-pipeline',
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._queue
+
+    def _run(self, audit_queue: queue.Queue) -> None:
+        batch_size = getattr(settings, 'AUDIT_BUFFER_MAX_SIZE', 500)
+        running = True
+        try:
+            while running:
+                items = [audit_queue.get()]
+                while len(items) < batch_size:
+                    try:
+                        items.append(audit_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if any(item is None for item in items):
+                    running = False
+                self._drain([item for item in items if item is not None])
+                for _ in items:
+                    audit_queue.task_done()
+        finally:
+            connections.close_all()
+
+    def _drain(self, items: list[tuple]) -> None:
+        by_alias: dict[str, list[dict[str, Any]]] = {}
+        for using, record in items:
+            by_alias.setdefault(using, []).append(record)
+        for using, records in by_alias.items():
+            try:
+                self._write_retrying(records, using)
+            except Exception:
+                logger.exception(
+                    'Could not write %s audit records', len(records))
+                self._metric('dropped', len(records))
+
+    def _write_retrying(
+            self, records: list[dict[str, Any]], using: str) -> None:
+        connection = connections[using]
+        connection.close_if_unusable_or_obsolete()
+        try:
+            self._write(records, using)
+        except OperationalError:
+            # Conexión caída mientras esperaba: se abre otra y se reintenta
+            logger.warning('Audit connection lost, retrying with a new one')
+            connection.close()
+            self._write(records, using)
+
+    def _write(self, records: list[dict[str, Any]], using: str) -> None:
+        start = time.perf_counter()
+        write_logs(records, using)
+        self._metric('flush_latency', time.perf_counter() - start)
+
+    def _metric(self, metric: str, value: float) -> None:
+        hook = self.metrics_hook
+        if hook is not None:
+            try:
+                hook(metric, value)
+            except Exception:
+                logger.exception('Audit metrics hook failed')
+
+
+# Singleton for global use
+audit_pipeline = AuditPipeline()
+atexit.register(audit_pipeline.stop)
@@ -0,0 +1,40 @@
+import django
+import pytest
+from django.conf import settings
+
+
+def pytest_configure():
+    settings.configure(
+        SECRET_KEY='tests',
+        IS_MICROSERVICE=False,
+        USE_TZ=True,
+        DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+        INSTALLED_APPS=[
+            'django.contrib.contenttypes',
+            'django.contrib.auth',
+            'rest_framework',
+            'dj_core_utils',
+            'tests',
+        ],
+        DATABASES={
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': ':memory:',
+            }
+        },
+    )
+    django.setup()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def test_database():
+    """Test database with the migrations applied (django.test.TestCase)."""
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment, teardown_test_environment
+    )
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+    yield
+    teardown_test_environment()
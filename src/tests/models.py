@@ -0,0 +1,49 @@
+from django.db import models
+
+from dj_core_utils.db.mixins import UniversalStateMixin
+from dj_core_utils.db.models import AttachmentsMixin, CoreBaseModel
+
+
+class Customer(models.Model):
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = 'tests'
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=20)
+
+    class Meta:
+        app_label = 'tests'
+
+
+class Order(CoreBaseModel, AttachmentsMixin):
+    customer = models.ForeignKey(
+        Customer, null=True, blank=True, on_delete=models.CASCADE)
+    code = models.CharField(max_length=20, unique=True)
+    total = models.IntegerField(default=0)
+    notes = models.TextField(blank=True, default='')
+    secret = models.CharField(max_length=50, blank=True, default='')
+    tags = models.ManyToManyField(Tag, blank=True)
+
+    class Meta:
+        app_label = 'tests'
+        ordering = ['id']
+
+
+class Coupon(models.Model):
+    code = models.CharField(max_length=20, primary_key=True)
+
+    class Meta:
+        app_label = 'tests'
+
+
+class Note(UniversalStateMixin):
+    text = models.CharField(max_length=50)
+
+    # Manager normal: el borrado lógico no debe depender de él
+    objects = models.Manager()
+
+    class Meta:
+        app_label = 'tests'
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+
+from dj_core_utils.api.client import AsyncAPIClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    """Counts the connections that are still open."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.open_connections = 0
+        self._lock = threading.Lock()
+
+    def process_request_thread(self, request, client_address):
+        with self._lock:
+            self.open_connections += 1
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self._lock:
+                self.open_connections -= 1
+
+
+class ClientRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        self.server = _Server()
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        host, port = self.server.server_address
+        settings = override_settings(API_CLIENT={
+            'SERVICES': {'echo': {'BASE_URL': f'http://{host}:{port}'}},
+        })
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_short_lived_loops_close_their_connections(self):
+        async def call():
+            client = AsyncAPIClient('echo')
+            results = await client.batch([('GET', '/')] * 3)
+            return [result.value for result in results]
+
+        for _ in range(5):
+            self.assertEqual(asyncio.run(call()), [{'ok': True}] * 3)
+
+        deadline = time.monotonic() + 2
+        while self.server.open_connections and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.server.open_connections, 0)
@@ -0,0 +1,96 @@
+import gzip
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from dj_core_utils.db.models import OperationLog, OperationType
+from dj_core_utils.db.partitions import (
+    add_months, create_monthly_partitions, monthly_partition_sql
+)
+
+
+class ArchiveOperationLogsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        OperationLog.objects.bulk_create([
+            OperationLog(
+                model_changed='Order',
+                id_instance=index,
+                operation_type=OperationType.UPDATE,
+                date=now - timedelta(days=days),
+                changes={'total': {'before': 0, 'after': index}},
+            )
+            for index, days in enumerate([400, 500, 380, 10, 0])
+        ])
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def archive(self, *args):
+        out = StringIO()
+        call_command(
+            'archive_operation_logs', '--output-dir', self.directory,
+            *args, stdout=out)
+        (name,) = os.listdir(self.directory)
+        with gzip.open(os.path.join(self.directory, name), 'rt') as file:
+            return [json.loads(line) for line in file], out.getvalue()
+
+    def test_archives_and_deletes_in_batches(self):
+        records, out = self.archive('--days', '365', '--batch-size', '2')
+        # Orden cronológico: el más antiguo primero
+        self.assertEqual(
+            [record['id_instance'] for record in records], [1, 0, 2])
+        self.assertEqual(
+            records[0]['changes'], {'total': {'before': 0, 'after': 1}})
+        self.assertIn('3 logs archived', out)
+        self.assertEqual(
+            sorted(OperationLog.objects.values_list(
+                'id_instance', flat=True)),
+            [3, 4],
+        )
+
+    def test_no_delete_keeps_the_rows(self):
+        records, _ = self.archive('--days', '365', '--no-delete')
+        self.assertEqual(len(records), 3)
+        self.assertEqual(OperationLog.objects.count(), 5)
+
+    def test_before_date(self):
+        before = (timezone.now() - timedelta(days=450)).date()
+        records, _ = self.archive('--before', before.isoformat())
+        self.assertEqual(
+            [record['id_instance'] for record in records], [1])
+
+        with self.assertRaises(CommandError):
+            call_command(
+                'archive_operation_logs', '--before', '01/02/2024',
+                '--output-dir', self.directory, stdout=StringIO())
+
+
+class PartitionTests(SimpleTestCase):
+
+    def test_months(self):
+        self.assertEqual(add_months(date(2024, 11, 1), 3), date(2025, 2, 1))
+        self.assertEqual(add_months(date(2024, 1, 1), -1), date(2023, 12, 1))
+
+    def test_partition_sql(self):
+        self.assertEqual(
+            monthly_partition_sql('oplog', date(2024, 12, 15)),
+            'CREATE TABLE IF NOT EXISTS "oplog_202412" PARTITION OF "oplog" '
+            "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')",
+        )
+
+    def test_not_partitioned_outside_postgresql(self):
+        self.assertEqual(create_monthly_partitions(OperationLog), [])
+        out = StringIO()
+        call_command('create_log_partitions', stdout=out)
+        self.assertIn('not a partitioned table', out.getvalue())
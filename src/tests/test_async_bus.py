@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+from django.test import SimpleTestCase
+
+from dj_core_utils.events.async_bus import AsyncEventBus, OverflowPolicy
+
+
+class AsyncEventBusTests(SimpleTestCase):
+
+    def test_unsubscribe_keeps_other_patterns_of_the_handler(self):
+        async def scenario():
+            bus = AsyncEventBus(maxsize=1)
+            received = []
+            bus.subscribe('user.created', received.append)
+            bus.subscribe('order.*', received.append)
+            bus.unsubscribe('user.created', received.append)
+
+            for n in range(3):
+                await asyncio.wait_for(
+                    bus.publish('order.paid', {'n': n}), timeout=1)
+                await bus.join()
+            await bus.publish('user.created', {'n': 99})
+            await bus.join()
+            await bus.close()
+            return received
+
+        received = asyncio.run(scenario())
+        self.assertEqual(received, [{'n': 0}, {'n': 1}, {'n': 2}])
+
+    def test_publish_threadsafe_waits_on_a_full_queue(self):
+        async def scenario():
+            bus = AsyncEventBus(maxsize=2, overflow=OverflowPolicy.BLOCK)
+            release = asyncio.Event()
+            received = []
+
+            async def slow(data):
+                await release.wait()
+                received.append(data['n'])
+
+            bus.subscribe('tick', slow)
+            bus.start()
+            done = threading.Event()
+
+            def produce():
+                for n in range(6):
+                    bus.publish_threadsafe('tick', {'n': n})
+                done.set()
+
+            thread = threading.Thread(target=produce)
+            thread.start()
+            await asyncio.sleep(0.1)
+            # 1 en el handler + 2 en la cola; el productor espera
+            blocked = not done.is_set()
+            pending = len(asyncio.all_tasks())
+            release.set()
+            await asyncio.to_thread(thread.join)
+            await bus.join()
+            await bus.close()
+            return blocked, pending, received
+
+        blocked, pending, received = asyncio.run(scenario())
+        self.assertTrue(blocked)
+        self.assertLessEqual(pending, 3)
+        self.assertEqual(received, list(range(6)))
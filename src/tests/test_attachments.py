@@ -0,0 +1,49 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from dj_core_utils.db.attachments import (
+    annotate_attachment_counts, prefetch_attachments
+)
+from dj_core_utils.db.models import Comments
+
+from .models import Coupon, Order
+
+
+class PrefetchAttachmentsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.order = Order.objects.create(code='A-1')
+        Comments.objects.create(
+            comment='hola',
+            content_type=ContentType.objects.get_for_model(Order),
+            object_id=cls.order.pk,
+        )
+
+    def test_one_query_per_type(self):
+        order = Order.objects.get(pk=self.order.pk)
+        with self.assertNumQueries(2):
+            prefetch_attachments([order])
+        self.assertEqual(
+            [c.comment for c in order.attached_comments], ['hola'])
+        self.assertEqual(order.attached_files, [])
+
+    def test_unsaved_objects_get_empty_lists(self):
+        order = Order.objects.get(pk=self.order.pk)
+        unsaved = Order(code='A-2')
+        prefetch_attachments([order, unsaved])
+        self.assertEqual(len(order.attached_comments), 1)
+        self.assertEqual(unsaved.attached_comments, [])
+
+        with self.assertNumQueries(0):
+            prefetch_attachments([Order(code='A-3')])
+
+    def test_non_integer_primary_keys_are_rejected(self):
+        with self.assertRaises(ValueError):
+            prefetch_attachments([Coupon(code='SUMMER')])
+        with self.assertRaises(ValueError):
+            annotate_attachment_counts(Coupon.objects.all())
+
+    def test_counts(self):
+        order = annotate_attachment_counts(Order.objects.all()).get()
+        self.assertEqual((order.comments_count, order.files_count), (1, 0))
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from dj_core_utils.auth.backends import CustomJWTAuthentication, UserCache
+
+
+@override_settings(JWT_STATELESS_USER=True)
+class StatelessUserTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'ana', email='ana@example.com', is_staff=True)
+
+    def token(self, **claims):
+        token = AccessToken.for_user(self.user)
+        for claim, value in claims.items():
+            token[claim] = value
+        return token
+
+    def test_user_from_claims_without_queries(self):
+        token = self.token(email='stale@example.com', is_active=True)
+        with self.assertNumQueries(0):
+            user = CustomJWTAuthentication().get_user(token)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.email, 'stale@example.com')
+            self.assertTrue(user.is_active)
+
+    def test_user_is_read_only(self):
+        user = CustomJWTAuthentication().get_user(
+            self.token(email='stale@example.com'))
+        with self.assertRaises(TypeError):
+            user.save()
+        with self.assertRaises(TypeError):
+            user.delete()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, 'ana@example.com')
+
+    def test_inactive_claim_is_rejected(self):
+        with self.assertRaises(AuthenticationFailed):
+            CustomJWTAuthentication().get_user(self.token(is_active=False))
+
+    def test_missing_claims_are_deferred(self):
+        user = CustomJWTAuthentication().get_user(self.token())
+        with self.assertNumQueries(1):
+            self.assertTrue(user.is_staff)
+
+
+class UserCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(f'user{i}') for i in range(3)]
+
+    def test_bounded_lru(self):
+        cache = UserCache(maxsize=2)
+        first, second, third = self.users
+        cache.set(first, 60)
+        cache.set(second, 60)
+        self.assertEqual(cache.get(User, first.pk).pk, first.pk)
+        cache.set(third, 60)  # Expulsa a second, el menos usado
+        self.assertIsNone(cache.get(User, second.pk))
+        self.assertEqual(cache.get(User, str(first.pk)).pk, first.pk)
+        self.assertEqual(cache.get(User, third.pk).pk, third.pk)
+        self.assertEqual(len(cache._rows), 2)
+
+    def test_expired_entries_are_dropped(self):
+        cache = UserCache()
+        with mock.patch(
+                'dj_core_utils.auth.backends.time.monotonic',
+                return_value=100.0) as monotonic:
+            cache.set(self.users[0], 10)
+            monotonic.return_value = 110.0
+            self.assertIsNone(cache.get(User, self.users[0].pk))
+        self.assertEqual(len(cache._rows), 0)
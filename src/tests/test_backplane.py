@@ -0,0 +1,84 @@
+import asyncio
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from dj_core_utils.fastapi.backplane import Backplane, default_socket_path
+from dj_core_utils.fastapi.websockets import WebSocketManager
+
+
+class _PubSub:
+    """First listen() fails as a decode_responses client would."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.listens = 0
+
+    async def subscribe(self, *channels):
+        pass
+
+    async def listen(self):
+        self.listens += 1
+        if self.listens == 1:
+            raise TypeError('a bytes-like object is required, not str')
+        for message in self.messages:
+            yield message
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        pass
+
+
+class _Client:
+
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    def pubsub(self):
+        return self._pubsub
+
+    async def publish(self, channel, data):
+        pass
+
+
+class BackplaneTests(SimpleTestCase):
+
+    def test_channel_is_required(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Backplane(_Client(None), manager=WebSocketManager())
+
+    def test_socket_path_depends_on_the_channel(self):
+        self.assertNotEqual(
+            default_socket_path('billing:ws'), default_socket_path('crm:ws'))
+
+    @mock.patch('dj_core_utils.fastapi.backplane.RECEIVE_RETRY_DELAY', 0)
+    def test_receiver_restarts_after_an_error(self):
+        manager = WebSocketManager()
+        other = Backplane(_Client(None), manager=manager, channel='app:ws')
+        other.worker_id = 'other:1'
+        other._origin = b'other:1'
+        payload = other.pack([(0.0, 'user:1', '{"n":1}')])
+        pubsub = _PubSub([
+            {'type': 'message', 'data': 'not bytes'},
+            {'type': 'message', 'data': payload},
+        ])
+        backplane = Backplane(
+            _Client(pubsub), manager=manager, channel='app:ws')
+
+        async def scenario():
+            with mock.patch.object(manager, 'deliver') as deliver, \
+                    self.assertLogs('dj_core_utils.fastapi.backplane') as logs:
+                await backplane.start()
+                for _ in range(100):
+                    if deliver.called:
+                        break
+                    await asyncio.sleep(0.01)
+                await backplane.close()
+            return deliver, logs
+
+        deliver, logs = asyncio.run(scenario())
+        deliver.assert_called_once_with('{"n":1}', 'user:1')
+        self.assertEqual(pubsub.listens, 2)
+        self.assertEqual(backplane.received, {'other:1': 1})
+        self.assertEqual(len(logs.records), 2)  # reinicio + mensaje inválido
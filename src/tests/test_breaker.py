@@ -0,0 +1,161 @@
+import asyncio
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase, override_settings
+
+from dj_core_utils.api.breaker import CircuitBreaker, CircuitState
+from dj_core_utils.api.client import AsyncAPIClient, SyncAPIClient, registry
+from dj_core_utils.api.exceptions import (
+    CircuitOpenError, ServiceUnavailableError
+)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = mock.patch(
+            'dj_core_utils.api.breaker.time.monotonic', return_value=100.0)
+        self.monotonic = self.clock.start()
+        self.addCleanup(self.clock.stop)
+
+    def open_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        return breaker
+
+    def test_probe_after_reset_timeout(self):
+        breaker = self.open_breaker()
+        self.assertFalse(breaker.allow())
+        self.monotonic.return_value = 110.0
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # una sola sonda
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        breaker = self.open_breaker()
+        self.monotonic.return_value = 110.0
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_aborted_probe_reopens(self):
+        breaker = self.open_breaker()
+        self.monotonic.return_value = 110.0
+        self.assertTrue(breaker.allow())
+        breaker.record_aborted()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.monotonic.return_value = 120.0
+        self.assertTrue(breaker.allow())
+
+    def test_lost_probe_is_replaced(self):
+        breaker = self.open_breaker()
+        self.monotonic.return_value = 110.0
+        self.assertTrue(breaker.allow())
+        self.monotonic.return_value = 115.0
+        self.assertFalse(breaker.allow())
+        self.monotonic.return_value = 120.0
+        self.assertTrue(breaker.allow())
+
+    def test_aborted_call_does_not_count_when_closed(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_aborted()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+
+@override_settings(API_CLIENT={
+    'BASE_URL': 'http://service.test',
+    'RETRIES': 3,
+    'RETRY_BACKOFF': 0,
+    'CIRCUIT_FAILURE_THRESHOLD': 2,
+})
+class ClientBreakerTests(SimpleTestCase):
+
+    def setUp(self):
+        registry.clear_configs()  # Breakers nuevos en cada test
+
+    def transport(self, handler):
+        """Clients of 'orders' over an httpx.MockTransport."""
+        self.calls = 0
+
+        def count(request):
+            self.calls += 1
+            return handler(request)
+
+        transport = httpx.MockTransport(count)
+        patches = [
+            mock.patch.object(
+                registry, 'get_sync',
+                return_value=httpx.Client(
+                    base_url='http://service.test', transport=transport)),
+            mock.patch.object(
+                registry, 'get',
+                side_effect=lambda name: httpx.AsyncClient(
+                    base_url='http://service.test', transport=transport)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_retries_count_as_one_failure(self):
+        self.transport(lambda request: httpx.Response(503))
+        client = SyncAPIClient('orders')
+        response = client.send('GET', '/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.calls, 4)
+        self.assertEqual(client.breaker.failures, 1)
+        self.assertEqual(client.breaker.state, CircuitState.CLOSED)
+
+        client.send('GET', '/')
+        self.assertEqual(client.breaker.state, CircuitState.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            client.send('GET', '/')
+
+    def test_transport_errors_count_once(self):
+        def fail(request):
+            raise httpx.ConnectError('refused')
+
+        self.transport(fail)
+        client = SyncAPIClient('orders')
+        with self.assertRaises(ServiceUnavailableError):
+            client.send('GET', '/')
+        self.assertEqual(self.calls, 4)
+        self.assertEqual(client.breaker.failures, 1)
+
+    def test_unexpected_error_reopens_the_probe(self):
+        def fail(request):
+            raise httpx.DecodingError('bad gzip')
+
+        self.transport(fail)
+        client = SyncAPIClient('orders')
+        breaker = client.breaker
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker._opened_at -= breaker.reset_timeout
+        with self.assertRaises(httpx.DecodingError):
+            client.send('GET', '/')
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+    def test_cancelled_probe_reopens(self):
+        async def slow(request):
+            await asyncio.sleep(10)
+            return httpx.Response(200)
+
+        self.transport(slow)
+        client = AsyncAPIClient('orders')
+        breaker = client.breaker
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker._opened_at -= breaker.reset_timeout
+
+        async def call():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.send('GET', '/'), 0.05)
+
+        asyncio.run(call())
+        self.assertEqual(breaker.state, CircuitState.OPEN)
@@ -0,0 +1,83 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from dj_core_utils.db.models import OperationLog, OperationType
+from dj_core_utils.signals.buffer import AuditBuffer
+
+
+class Rollback(Exception):
+    pass
+
+
+class AuditBufferTests(TransactionTestCase):
+
+    def setUp(self):
+        self.buffer = AuditBuffer(max_size=3)
+
+    def add(self, id_instance, **extra):
+        self.buffer.add(
+            model_changed='Order',
+            id_instance=id_instance,
+            operation_type=OperationType.UPDATE,
+            changes={},
+            **extra,
+        )
+
+    def logged(self):
+        return sorted(
+            OperationLog.objects.values_list('id_instance', flat=True))
+
+    def test_outside_a_transaction_is_written_now(self):
+        user = User.objects.create_user('ana')
+        self.add(1, user=user)
+        self.assertEqual(self.logged(), [1])
+        self.assertEqual(OperationLog.objects.get().user_id, user.pk)
+
+    def test_written_on_commit(self):
+        with transaction.atomic():
+            self.add(1)
+            self.add(2)
+            self.assertEqual(self.logged(), [])
+        self.assertEqual(self.logged(), [1, 2])
+
+    def test_full_rollback_discards(self):
+        with self.assertRaises(Rollback):
+            with transaction.atomic():
+                self.add(1)
+                raise Rollback
+        self.assertEqual(self.logged(), [])
+
+        with transaction.atomic():
+            self.add(2)
+        self.assertEqual(self.logged(), [2])
+
+    def test_savepoint_rollback_discards_only_its_entries(self):
+        with transaction.atomic():
+            self.add(1)
+            with self.assertRaises(Rollback):
+                with transaction.atomic():
+                    self.add(2)
+                    with transaction.atomic():
+                        self.add(3)
+                    raise Rollback
+            with transaction.atomic():
+                self.add(4)
+            self.add(5)
+        self.assertEqual(self.logged(), [1, 4, 5])
+
+    def test_overflow_is_written_inside_the_transaction(self):
+        with transaction.atomic():
+            for id_instance in range(1, 5):
+                self.add(id_instance)
+            # max_size=3: los tres primeros ya se escribieron
+            self.assertEqual(self.logged(), [1, 2, 3])
+        self.assertEqual(self.logged(), [1, 2, 3, 4])
+
+    def test_overflow_is_rolled_back_with_the_transaction(self):
+        with self.assertRaises(Rollback):
+            with transaction.atomic():
+                for id_instance in range(1, 5):
+                    self.add(id_instance)
+                raise Rollback
+        self.assertEqual(self.logged(), [])
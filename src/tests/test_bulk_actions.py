@@ -0,0 +1,225 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.test import TestCase
+from rest_framework import serializers, viewsets
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from dj_core_utils.db.models import OperationLog
+from dj_core_utils.presentation.mixins import BulkActionsMixin
+from dj_core_utils.signals.bulk import (
+    audit_handler, register_audit_handler, unregister_audit_handler
+)
+
+from .models import Note, Order, Tag
+
+
+class OrderSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Order
+        fields = ['id', 'code', 'total', 'notes', 'tags']
+
+
+class CustomCreateSerializer(OrderSerializer):
+
+    def create(self, validated_data):
+        validated_data['notes'] = 'custom'
+        return super().create(validated_data)
+
+
+class OrderViewSet(BulkActionsMixin, viewsets.ModelViewSet):
+    queryset = Order.objects.order_by('id')
+    serializer_class = OrderSerializer
+    authentication_classes = []
+    permission_classes = []
+
+
+class CustomCreateViewSet(OrderViewSet):
+    serializer_class = CustomCreateSerializer
+
+
+class PartialViewSet(OrderViewSet):
+    bulk_partial = True
+
+
+class NoteSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Note
+        fields = ['id', 'text']
+
+
+class NoteViewSet(BulkActionsMixin, viewsets.ModelViewSet):
+    queryset = Note.objects.order_by('id')
+    serializer_class = NoteSerializer
+    authentication_classes = []
+    permission_classes = []
+
+
+factory = APIRequestFactory()
+
+
+def call(viewset, method, data, user=None):
+    view = viewset.as_view({
+        'post': 'bulk_create',
+        'patch': 'bulk_update',
+        'delete': 'bulk_destroy',
+    })
+    request = getattr(factory, method)('/orders/bulk/', data, format='json')
+    if user is not None:
+        force_authenticate(request, user)
+    return view(request)
+
+
+class BulkActionsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana')
+        cls.tag = Tag.objects.create(name='vip')
+
+    def test_create_in_bulk(self):
+        response = call(OrderViewSet, 'post', [
+            {'code': 'A-1', 'total': 1, 'tags': [self.tag.pk]},
+            {'code': 'A-2', 'total': 2},
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['errors'], {})
+        self.assertEqual(
+            [item['code'] for item in response.data['results']],
+            ['A-1', 'A-2'],
+        )
+        order = Order.objects.get(code='A-1')
+        self.assertEqual(list(order.tags.all()), [self.tag])
+
+    def test_custom_create_is_called_per_item(self):
+        response = call(CustomCreateViewSet, 'post', [
+            {'code': 'A-1', 'total': 1},
+            {'code': 'A-2', 'total': 2},
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            set(Order.objects.values_list('notes', flat=True)), {'custom'})
+
+    def test_nested_serializers_are_not_written_in_bulk(self):
+        class NestedSerializer(OrderSerializer):
+            tags = serializers.ListSerializer(
+                child=serializers.CharField(), required=False)
+
+        view = OrderViewSet()
+        serializer = NestedSerializer(data={})
+        self.assertFalse(view.is_bulk_writable(serializer, 'create'))
+        self.assertTrue(
+            view.is_bulk_writable(OrderSerializer(data={}), 'create'))
+        self.assertFalse(
+            view.is_bulk_writable(CustomCreateSerializer(data={}), 'create'))
+        self.assertTrue(
+            view.is_bulk_writable(CustomCreateSerializer(data={}), 'update'))
+
+    def test_update_in_bulk(self):
+        first = Order.objects.create(code='A-1', total=1)
+        second = Order.objects.create(code='A-2', total=2)
+        response = call(OrderViewSet, 'patch', [
+            {'id': first.pk, 'total': 10},
+            {'id': second.pk, 'total': 20},
+        ], user=self.user)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            dict(Order.objects.values_list('code', 'total')),
+            {'A-1': 10, 'A-2': 20},
+        )
+        self.assertEqual(
+            Order.objects.get(pk=first.pk).updated_by_id, self.user.pk)
+
+    def test_duplicate_ids_are_rejected(self):
+        order = Order.objects.create(code='A-1', total=1)
+        response = call(OrderViewSet, 'patch', [
+            {'id': order.pk, 'total': 10},
+            {'id': str(order.pk), 'total': 20},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['errors'], {'1': {'id': ['Duplicate id.']}})
+        self.assertEqual(Order.objects.get(pk=order.pk).total, 1)
+
+    def test_unique_values_repeated_in_the_batch(self):
+        response = call(OrderViewSet, 'post', [{'code': 'A'}, {'code': 'A'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], {
+            '1': {'code': ['Duplicate value in this request.']}})
+        self.assertFalse(Order.objects.exists())
+
+        response = call(PartialViewSet, 'post', [{'code': 'A'}, {'code': 'A'}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(response.data['errors']), ['1'])
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_unique_values_repeated_in_an_update(self):
+        first = Order.objects.create(code='A-1')
+        second = Order.objects.create(code='A-2')
+        response = call(OrderViewSet, 'patch', [
+            {'id': first.pk, 'code': 'A-3'},
+            {'id': second.pk, 'code': 'A-3'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data['errors']), ['1'])
+
+    def test_integrity_error_is_a_bad_request(self):
+        with mock.patch.object(
+                OrderViewSet, 'perform_bulk_create',
+                side_effect=IntegrityError('unique')):
+            response = call(PartialViewSet, 'post', [{'code': 'A'}, {}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data['errors']), {'0', '1'})
+
+    def test_unknown_ids_are_reported(self):
+        response = call(OrderViewSet, 'patch', [{'id': 999, 'total': 1}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['errors'], {'0': {'id': ['Not found.']}})
+
+    def test_destroy_terminates(self):
+        first = Order.objects.create(code='A-1')
+        second = Order.objects.create(code='A-2')
+        response = call(
+            OrderViewSet, 'delete', {'ids': [first.pk, second.pk]})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['results'], [first.pk, second.pk])
+        self.assertEqual(
+            set(Order.objects.values_list('universal_state', flat=True)),
+            {'terminated'},
+        )
+
+    def test_destroy_soft_deletes_with_a_plain_manager(self):
+        note = Note.objects.create(text='hola')
+        response = call(NoteViewSet, 'delete', {'ids': [note.pk]})
+        self.assertEqual(response.status_code, 200, response.data)
+        note.refresh_from_db()
+        self.assertTrue(note.is_terminated())
+
+
+class BulkAuditTests(TestCase):
+
+    def setUp(self):
+        from dj_core_utils.signals.audit import AuditHandler
+
+        register_audit_handler(AuditHandler)
+        self.addCleanup(unregister_audit_handler)
+
+    def test_registered_handler_audits_bulk_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call(OrderViewSet, 'post', [{'code': 'A-1'}, {'code': 'A-2'}])
+        self.assertEqual(
+            sorted(OperationLog.objects.filter(model_changed='Order')
+                   .values_list('operation_type', flat=True)),
+            ['create', 'create'],
+        )
+
+    def test_unregistered_handler_is_not_used(self):
+        unregister_audit_handler()
+        self.assertIsNone(audit_handler(Order))
+        with self.captureOnCommitCallbacks(execute=True):
+            call(OrderViewSet, 'post', [{'code': 'A-1'}])
+        self.assertFalse(OperationLog.objects.exists())
@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django_currentuser.middleware import (
+    get_current_user as get_currentuser
+)
+from pydantic import BaseModel
+
+from dj_core_utils.fastapi.utils import bulk_upsert
+from dj_core_utils.middleware.context import acting_user, get_current_user
+
+from .models import Order
+
+
+class OrderIn(BaseModel):
+    code: str
+    total: int
+
+
+class BulkUpsertTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ana = User.objects.create_user('ana')
+        cls.bob = User.objects.create_user('bob')
+
+    def test_users_are_set_explicitly(self):
+        bulk_upsert(
+            [OrderIn(code='A-1', total=1), OrderIn(code='A-2', total=2)],
+            Order, unique_fields=['code'], user=self.ana, audit=False,
+        )
+        bulk_upsert(
+            [OrderIn(code='A-1', total=10)],
+            Order, unique_fields=['code'], user=self.bob, audit=False,
+        )
+        rows = dict(Order.objects.values_list('code', 'total'))
+        self.assertEqual(rows, {'A-1': 10, 'A-2': 2})
+        first = Order.objects.get(code='A-1')
+        self.assertEqual(first.created_by_id, self.ana.pk)
+        self.assertEqual(first.updated_by_id, self.bob.pk)
+        self.assertEqual(
+            Order.objects.get(code='A-2').updated_by_id, self.ana.pk)
+
+        self.assertIsNone(get_current_user())
+        self.assertIsNone(get_currentuser())
+
+
+class ActingUserTests(TestCase):
+
+    def test_restores_the_previous_user(self):
+        user = User(pk=1, username='ana')
+        with acting_user(user):
+            self.assertIs(get_current_user(), user)
+            self.assertIs(get_currentuser(), user)
+        self.assertIsNone(get_current_user())
+        self.assertIsNone(get_currentuser())
+
+    def test_fails_loudly_without_the_private_setter(self):
+        with mock.patch('django_currentuser.middleware._set_current_user',
+                        new=None), \
+                self.assertRaises(ImproperlyConfigured):
+            with acting_user(User(pk=1)):
+                pass
@@ -0,0 +1,91 @@
+import asyncio
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase, override_settings
+
+from dj_core_utils.api.cache import ResponseCache
+from dj_core_utils.api.client import AsyncAPIClient, registry
+
+
+@override_settings(API_CLIENT={
+    'BASE_URL': 'http://service.test',
+    'RETRY_BACKOFF': 0,
+})
+class ResponseCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        registry.clear_configs()
+        self.cache = ResponseCache()
+        self.requests = []
+
+    def serve(self, handler):
+        async def record(request):
+            self.requests.append(request)
+            await asyncio.sleep(0)
+            return handler(request)
+
+        transport = httpx.MockTransport(record)
+        patch = mock.patch.object(
+            registry, 'get',
+            side_effect=lambda name: httpx.AsyncClient(
+                base_url='http://service.test', transport=transport))
+        patch.start()
+        self.addCleanup(patch.stop)
+        return AsyncAPIClient('orders', cache=self.cache)
+
+    def test_fresh_entries_are_served_from_cache(self):
+        client = self.serve(lambda request: httpx.Response(
+            200, json={'id': 1}, headers={'Cache-Control': 'max-age=60'}))
+
+        async def main():
+            return [await client.get('/orders/1') for _ in range(3)]
+
+        self.assertEqual(asyncio.run(main()), [{'id': 1}] * 3)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_concurrent_requests_are_coalesced(self):
+        client = self.serve(lambda request: httpx.Response(200, json=[]))
+
+        async def main():
+            return await asyncio.gather(
+                *(client.get('/orders/') for _ in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [[]] * 5)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.cache.stats()['coalesced'], 4)
+
+    def test_expired_entries_are_revalidated(self):
+        def handler(request):
+            if request.headers.get('If-None-Match') == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={'id': 1}, headers={
+                'ETag': '"v1"', 'Cache-Control': 'no-cache'})
+
+        client = self.serve(handler)
+
+        async def main():
+            return [await client.get('/orders/1') for _ in range(2)]
+
+        self.assertEqual(asyncio.run(main()), [{'id': 1}] * 2)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.cache.stats()['revalidated'], 1)
+
+    def test_no_store_and_auth_scope(self):
+        client = self.serve(lambda request: httpx.Response(
+            200, json={}, headers={'Cache-Control': 'no-store'}))
+
+        async def main():
+            await client.get('/me')
+            await client.get('/me')
+
+        asyncio.run(main())
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+        ana = self.cache.make_key(
+            'orders', '/me', {'headers': {'Authorization': 'Bearer a'}})
+        bob = self.cache.make_key(
+            'orders', '/me', {'headers': {'Authorization': 'Bearer b'}})
+        self.assertNotEqual(ana, bob)
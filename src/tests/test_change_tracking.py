@@ -0,0 +1,59 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from dj_core_utils.db.models import OperationLog
+
+from .models import Order
+
+
+class ChangeTrackingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Order.objects.create(code='A-1', total=1, notes='hola')
+
+    def setUp(self):
+        from dj_core_utils.signals import audit  # noqa: F401 (receivers)
+
+        self.order = Order.objects.get(code='A-1')
+
+    def test_changes_since_load(self):
+        self.assertEqual(self.order.get_changes(), {})
+        self.order.total = 5
+        self.order.notes = 'hola'
+        self.assertEqual(
+            self.order.get_changes(), {'total': {'before': 1, 'after': 5}})
+        self.assertEqual(self.order.get_dirty_fields(['notes']), set())
+
+    def test_audited_update_does_not_select_the_row(self):
+        self.order.total = 5
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertNumQueries(1):  # Solo el UPDATE
+                self.order.save(update_fields=['total'])
+        self.assertEqual(len(callbacks), 1)
+        log = OperationLog.objects.get(model_changed='Order')
+        self.assertEqual(log.changes, {'total': {'before': 1, 'after': 5}})
+
+        # La instantánea se renueva: un segundo save no repite el cambio
+        self.assertEqual(self.order.get_changes(['total']), {})
+
+    def test_save_dirty_fields_only(self):
+        self.order.save_dirty_fields_only = True
+        self.order.total = 5
+        with CaptureQueriesContext(connection) as queries:
+            self.order.save()
+        (update,) = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        self.assertIn('"total"', update)
+        self.assertIn('"updated_at"', update)
+        self.assertNotIn('"notes"', update)
+
+    def test_deferred_fields_are_not_fetched(self):
+        order = Order.objects.only('id', 'total').get(pk=self.order.pk)
+        order.total = 7
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                order.get_changes(), {'total': {'before': 1, 'after': 7}})
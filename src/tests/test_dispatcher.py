@@ -0,0 +1,102 @@
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+
+from dj_core_utils.events.dispatcher import EventDispatcher
+
+
+class Rollback(Exception):
+    pass
+
+
+class DispatcherRoutingTests(SimpleTestCase):
+
+    def setUp(self):
+        self.dispatcher = EventDispatcher()
+        self.received = []
+
+    def handler(self, name):
+        def handle(data):
+            self.received.append(name)
+        handle.__name__ = name
+        return handle
+
+    def routed(self, topic):
+        return [handler.__name__
+                for handler in self.dispatcher.handlers_for(topic)]
+
+    def test_exact_and_wildcards(self):
+        for pattern in ('user.created', 'user.*', 'user.**', '**',
+                        '*.created', 'order.*'):
+            self.dispatcher.subscribe(pattern, self.handler(pattern))
+
+        self.assertEqual(self.routed('user.created'), [
+            'user.created', 'user.*', 'user.**', '**', '*.created'])
+        # '*' es exactamente un segmento; '**' cero o más
+        self.assertEqual(self.routed('user'), ['user.**', '**'])
+        self.assertEqual(self.routed('user.profile.updated'),
+                         ['user.**', '**'])
+        self.assertEqual(self.routed('invoice.paid.late'), ['**'])
+
+    def test_a_handler_matched_twice_runs_once(self):
+        handle = self.handler('both')
+        self.dispatcher.subscribe('a.**.b', handle)
+        self.assertEqual(self.routed('a.x.b.b'), ['both'])
+        self.assertEqual(self.routed('a.b'), ['both'])
+
+    def test_route_cache_is_invalidated(self):
+        first, second = self.handler('first'), self.handler('second')
+        self.dispatcher.subscribe('user.*', first)
+        self.assertEqual(self.routed('user.created'), ['first'])
+
+        self.dispatcher.subscribe('user.created', second)
+        self.assertEqual(self.routed('user.created'), ['first', 'second'])
+
+        self.dispatcher.unsubscribe('user.*', first)
+        self.assertEqual(self.routed('user.created'), ['second'])
+
+        self.dispatcher.clear()
+        self.assertEqual(self.routed('user.created'), [])
+
+    def test_route_cache_is_bounded(self):
+        self.dispatcher.max_cached_routes = 3
+        self.dispatcher.subscribe('**', self.handler('all'))
+        for index in range(10):
+            self.routed(f'topic.{index}')
+        self.assertLessEqual(len(self.dispatcher._routes), 3)
+        self.assertEqual(self.routed('topic.0'), ['all'])
+
+    def test_failing_handler_does_not_stop_the_rest(self):
+        def fail(data):
+            raise RuntimeError('boom')
+
+        self.dispatcher.subscribe('user.created', fail)
+        self.dispatcher.subscribe('user.*', self.handler('after'))
+        with self.assertLogs('dj_core_utils.events.dispatcher', 'ERROR'):
+            self.dispatcher.publish('user.created', {})
+        self.assertEqual(self.received, ['after'])
+
+    def test_decorator(self):
+        @self.dispatcher.subscribe('user.*')
+        def on_user(data):
+            self.received.append(data['id'])
+
+        self.dispatcher.publish('user.created', {'id': 1})
+        self.assertEqual(self.received, [1])
+
+
+class DispatcherOnCommitTests(TestCase):
+
+    def test_delivered_only_after_commit(self):
+        dispatcher = EventDispatcher()
+        received = []
+        dispatcher.subscribe('user.created', received.append)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(Rollback):
+                with transaction.atomic():
+                    dispatcher.publish('user.created', {'id': 1},
+                                       on_commit=True)
+                    raise Rollback
+            dispatcher.publish('user.created', {'id': 2}, on_commit=True)
+            self.assertEqual(received, [])
+        self.assertEqual(received, [{'id': 2}])
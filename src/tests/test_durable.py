@@ -0,0 +1,85 @@
+import tempfile
+import threading
+
+from django.test import SimpleTestCase
+
+from dj_core_utils.events.dispatcher import new_event
+from dj_core_utils.events.durable import DurableEventBus, EventLog
+
+
+class DurableEventBusTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.bus = DurableEventBus(directory.name)
+        self.addCleanup(self.bus.close)
+
+    def test_failed_event_is_not_committed(self):
+        received, fail = [], {3}
+
+        def handler(data):
+            if data['id'] in fail:
+                raise RuntimeError('boom')
+            received.append(data['id'])
+
+        self.bus.subscribe('user.created', handler)
+        self.bus.publish_many([('user.created', {'id': i}) for i in range(6)])
+
+        with self.assertLogs('dj_core_utils.events.durable', 'ERROR'):
+            self.assertEqual(self.bus.consume(), 3)
+        self.assertEqual(received, [0, 1, 2])
+
+        fail.clear()
+        self.assertEqual(self.bus.consume(), 3)
+        self.assertEqual(received, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(self.bus.consume(), 0)
+
+
+class EventLogTests(SimpleTestCase):
+
+    def test_read_across_rotation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log = EventLog(directory, segment_size=250)
+            self.addCleanup(log.close)
+            log.append(new_event('tick', {'n': 0}))
+            self.assertEqual(
+                [event.data['n'] for _, event in log.read(0)], [0])
+
+            for n in range(1, 6):
+                log.append(new_event('tick', {'n': n}))
+            (offset, _), = log.read(0, 1)
+            self.assertEqual(
+                [event.data['n'] for _, event in log.read(offset)],
+                [1, 2, 3, 4, 5],
+            )
+
+    def test_read_while_rotating_and_compacting(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log = EventLog(directory, segment_size=4096)
+            total = 3000
+            errors = []
+
+            def write():
+                for start in range(0, total, 100):
+                    log.append_many([
+                        new_event('tick', {'n': n})
+                        for n in range(start, start + 100)
+                    ])
+
+            writer = threading.Thread(target=write)
+            writer.start()
+            seen, offset = [], 0
+            try:
+                while len(seen) < total:
+                    for offset, event in log.read(offset, 50):
+                        seen.append(event.data['n'])
+                    log.commit('reader', offset)
+                    log.compact()
+            except Exception as e:
+                errors.append(e)
+            writer.join()
+            log.close()
+
+            self.assertEqual(errors, [])
+            self.assertEqual(seen, list(range(total)))
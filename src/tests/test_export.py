@@ -0,0 +1,84 @@
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from rest_framework import serializers, viewsets
+from rest_framework.test import APIRequestFactory
+
+from dj_core_utils.db.export import export_chunks
+from dj_core_utils.fastapi.export import stream_export
+from dj_core_utils.presentation.mixins import ExportMixin
+
+from .models import Customer, Order
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    label = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Order
+        fields = ['id', 'code', 'total', 'customer', 'label', 'secret']
+        extra_kwargs = {'secret': {'write_only': True}}
+
+    def get_label(self, obj):
+        return obj.code.lower()
+
+
+class OrderViewSet(ExportMixin, viewsets.ModelViewSet):
+    queryset = Order.objects.order_by('id')
+    serializer_class = OrderSerializer
+    authentication_classes = []
+    permission_classes = []
+
+
+def content(response) -> str:
+    return b''.join(response.streaming_content).decode()
+
+
+class ExportMixinTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        customer = Customer.objects.create(name='ACME')
+        Order.objects.create(
+            code='A-1', total=10, customer=customer, secret='s3cr3t')
+        Order.objects.create(code='A-2', total=20, secret='hunter2')
+
+    def export(self, viewset=OrderViewSet, **params):
+        request = APIRequestFactory().get('/orders/export/', params)
+        return viewset.as_view({'get': 'export'})(request)
+
+    def test_defaults_to_readable_serializer_fields(self):
+        response = self.export()
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        self.assertEqual(
+            list(rows[0]), ['id', 'code', 'total', 'customer'])
+        self.assertEqual([row['total'] for row in rows], [10, 20])
+        self.assertNotIn('s3cr3t', json.dumps(rows))
+
+    def test_csv_with_export_fields(self):
+        class CodeViewSet(OrderViewSet):
+            export_fields = ['code', 'total']
+
+        response = self.export(CodeViewSet, file_format='csv')
+        self.assertEqual(
+            content(response).splitlines(), ['code,total', 'A-1,10', 'A-2,20'])
+
+    def test_refuses_without_exportable_fields(self):
+        class EmptySerializer(serializers.Serializer):
+            label = serializers.CharField(source='*', read_only=True)
+
+        class EmptyViewSet(OrderViewSet):
+            serializer_class = EmptySerializer
+
+        with self.assertRaises(ImproperlyConfigured):
+            self.export(EmptyViewSet)
+
+
+class ExportHelpersTests(TestCase):
+
+    def test_fields_are_required(self):
+        with self.assertRaises(ValueError):
+            export_chunks(Order.objects.all(), [])
+        with self.assertRaises(ValueError):
+            stream_export(Order.objects.all())
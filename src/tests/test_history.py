@@ -0,0 +1,121 @@
+import asyncio
+import base64
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import path
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from dj_core_utils.db.history import InvalidCursor, get_history, get_state_at
+from dj_core_utils.db.models import OperationLog, OperationType
+from dj_core_utils.presentation.views import get_operation_history
+
+urlpatterns = [
+    path('history/<str:model_changed>/<int:id_instance>/',
+         get_operation_history),
+]
+
+
+class HistoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.start = timezone.now() - timedelta(days=1)
+        OperationLog.objects.bulk_create([
+            OperationLog(
+                model_changed='Order',
+                id_instance=1,
+                operation_type=OperationType.UPDATE,
+                date=cls.start + timedelta(minutes=index),
+                changes={'total': {'before': index, 'after': index + 1}},
+            )
+            for index in range(5)
+        ])
+
+    def test_pages_follow_the_signed_cursor(self):
+        logs, cursor = get_history('Order', 1, limit=2)
+        pages = [logs]
+        while cursor:
+            logs, cursor = get_history('Order', 1, cursor=cursor, limit=2)
+            pages.append(logs)
+        dates = [log.date for page in pages for log in page]
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_forged_cursor_is_rejected(self):
+        forged = base64.urlsafe_b64encode(
+            json.dumps([timezone.now().isoformat(), 10 ** 6]).encode()
+        ).decode()
+        with self.assertRaises(InvalidCursor):
+            get_history('Order', 1, cursor=forged)
+
+    def test_state_at_naive_moment(self):
+        from dj_core_utils.fastapi.history import operation_state
+
+        moment = timezone.make_naive(
+            self.start + timedelta(minutes=2, seconds=30))
+        response = operation_state('Order', 1, at=moment)
+        self.assertTrue(timezone.is_aware(response.at))
+        self.assertEqual(response.state, {'total': 3})
+        self.assertEqual(
+            get_state_at('Order', 1, response.at), response.state)
+
+
+@override_settings(ROOT_URLCONF='tests.test_history')
+class HistoryAccessTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana', password='s3cret')
+        cls.admin = User.objects.create_user('root', is_staff=True)
+
+    def get(self, user, model='User'):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(f'/history/{model}/{self.user.pk}/')
+
+    def test_only_staff_can_read_the_history(self):
+        self.assertEqual(self.get(self.user).status_code, 403)
+        self.assertEqual(self.get(self.admin).status_code, 200)
+
+    def test_allowlist(self):
+        with override_settings(AUDIT_HISTORY_MODELS=['Order']):
+            self.assertEqual(self.get(self.admin).status_code, 404)
+            self.assertEqual(self.get(self.admin, 'Order').status_code, 200)
+        self.assertEqual(
+            self.get(self.admin, 'OperationLog').status_code, 404)
+
+    def test_fastapi_router_requires_staff(self):
+        from fastapi import HTTPException
+        from dj_core_utils.fastapi.auth import UserPayload, staff_auth
+
+        user = UserPayload(id=1, email='', is_staff=False)
+        with self.assertRaises(HTTPException) as error:
+            asyncio.run(staff_auth(user))
+        self.assertEqual(error.exception.status_code, 403)
+        staff = UserPayload(id=1, email='', is_staff=True)
+        self.assertIs(asyncio.run(staff_auth(staff)), staff)
+
+
+class AuditRedactionTests(TestCase):
+
+    def setUp(self):
+        from dj_core_utils.signals import audit  # noqa: F401 (receivers)
+
+    def test_sensitive_fields_are_redacted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user('bob', password='first')
+        with self.captureOnCommitCallbacks(execute=True):
+            user.set_password('second')
+            user.save()
+        created, updated = OperationLog.objects.filter(
+            model_changed='User', id_instance=user.pk).order_by('id')
+        self.assertEqual(created.changes['new']['password'], '[redacted]')
+        self.assertEqual(created.changes['new']['username'], 'bob')
+        self.assertEqual(
+            updated.changes['password'],
+            {'before': '[redacted]', 'after': '[redacted]'},
+        )
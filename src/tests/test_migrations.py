@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import textwrap
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+# Proceso aparte: los modelos se construyen con el DEFAULT_AUTO_FIELD dado
+CHECK_SCRIPT = textwrap.dedent('''
+    import sys
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    settings.configure(
+        DATABASES={'default': {
+            'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+        DEFAULT_AUTO_FIELD=sys.argv[1],
+        INSTALLED_APPS=[
+            'django.contrib.contenttypes',
+            'django.contrib.auth',
+            'dj_core_utils',
+        ],
+    )
+    django.setup()
+    call_command('makemigrations', 'dj_core_utils', check=True, dry_run=True)
+''')
+
+
+class MigrationsTests(TestCase):
+
+    def test_models_match_migrations(self):
+        """makemigrations finds nothing to add for dj_core_utils."""
+        call_command(
+            'makemigrations', 'dj_core_utils',
+            check=True, dry_run=True, stdout=StringIO()
+        )
+
+
+class DefaultAutoFieldTests(SimpleTestCase):
+
+    def test_migrations_do_not_depend_on_default_auto_field(self):
+        source = os.path.dirname(os.path.dirname(__file__))
+        env = dict(os.environ, PYTHONPATH=source)
+        for auto_field in ('django.db.models.AutoField',
+                           'django.db.models.BigAutoField'):
+            with self.subTest(auto_field=auto_field):
+                result = subprocess.run(
+                    [sys.executable, '-c', CHECK_SCRIPT, auto_field],
+                    env=env, capture_output=True, text=True, timeout=60,
+                )
+                self.assertEqual(
+                    result.returncode, 0, result.stdout + result.stderr)
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.core import signing
+from django.test import TestCase
+from django.utils import timezone
+
+from dj_core_utils.db.pagination import (
+    CURSOR_SALT, CountMode, CursorPaginator, InvalidCursor
+)
+
+from .models import Order
+
+
+class CursorPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Order.objects.bulk_create(
+            [Order(code=f'A-{index}') for index in range(7)])
+        start = timezone.now()
+        # Empates de created_at: id desempata
+        for index, order in enumerate(Order.objects.order_by('id')):
+            Order.objects.filter(pk=order.pk).update(
+                created_at=start - timedelta(minutes=index // 3))
+        cls.newest_first = list(
+            Order.objects.order_by('-created_at', '-id')
+            .values_list('code', flat=True))
+
+    def setUp(self):
+        self.paginator = CursorPaginator(page_size=3, count=CountMode.EXACT)
+
+    def walk(self, cursor=None, direction='next'):
+        pages = []
+        while True:
+            page = self.paginator.paginate(Order.objects.all(), cursor)
+            pages.append([order.code for order in page.results])
+            cursor = getattr(page, direction)
+            if cursor is None:
+                return pages, page
+
+    def test_forward_pages_cover_every_row_once(self):
+        pages, last = self.walk()
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.newest_first)
+        self.assertEqual(last.count, 7)
+
+    def test_backward_pages_mirror_the_forward_ones(self):
+        forward, _ = self.walk()
+        page = self.paginator.paginate(Order.objects.all())
+        page = self.paginator.paginate(Order.objects.all(), page.next)
+        page = self.paginator.paginate(Order.objects.all(), page.next)
+        backward, first = self.walk(page.previous, 'previous')
+        self.assertEqual(backward, forward[-2::-1])
+        self.assertIsNone(first.previous)
+        # Desde la primera página se puede volver a avanzar
+        self.assertEqual(
+            [order.code for order in self.paginator.paginate(
+                Order.objects.all(), first.next).results],
+            forward[1],
+        )
+
+    def test_ascending_ordering(self):
+        self.paginator = CursorPaginator(('created_at',), page_size=2)
+        pages, _ = self.walk()
+        self.assertEqual(sum(pages, []), self.newest_first[::-1])
+
+    def test_bad_cursors_are_rejected(self):
+        page = self.paginator.paginate(Order.objects.all())
+        tampered = page.next[:-2] + ('A' if page.next[-2] != 'A' else 'B') \
+            + page.next[-1]
+        other_salt = signing.dumps(
+            {'p': [timezone.now().isoformat(), 1], 'r': False}, salt='x')
+        wrong_length = signing.dumps({'p': [1], 'r': False}, salt=CURSOR_SALT)
+        wrong_type = signing.dumps(
+            {'p': ['not a date', 1], 'r': False}, salt=CURSOR_SALT)
+        for cursor in (tampered, other_salt, wrong_length, wrong_type,
+                       'garbage'):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    self.paginator.paginate(Order.objects.all(), cursor)
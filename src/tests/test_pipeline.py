@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import SimpleTestCase
+
+from dj_core_utils.signals.pipeline import AuditPipeline
+
+
+class AuditPipelineTests(SimpleTestCase):
+
+    def setUp(self):
+        self.metrics = []
+        self.pipeline = AuditPipeline(
+            metrics_hook=lambda metric, value: self.metrics.append(
+                (metric, value)))
+        self.connection = mock.Mock()
+        patch = mock.patch(
+            'dj_core_utils.signals.pipeline.connections',
+            {'default': self.connection})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def drain(self, *side_effect):
+        with mock.patch(
+                'dj_core_utils.signals.pipeline.write_logs',
+                side_effect=side_effect) as write_logs:
+            self.pipeline._drain([('default', {'id_instance': 1}),
+                                  ('default', {'id_instance': 2})])
+        return write_logs
+
+    def test_stale_connections_are_discarded_before_each_batch(self):
+        write_logs = self.drain(None)
+        self.connection.close_if_unusable_or_obsolete.assert_called_once()
+        self.assertEqual(write_logs.call_count, 1)
+
+    def test_retries_once_with_a_new_connection(self):
+        with self.assertLogs('dj_core_utils.signals.pipeline', 'WARNING'):
+            write_logs = self.drain(OperationalError('gone'), None)
+        self.assertEqual(write_logs.call_count, 2)
+        self.connection.close.assert_called_once()
+        self.assertNotIn('dropped', dict(self.metrics))
+
+    def test_failed_batches_are_counted_as_dropped(self):
+        with self.assertLogs('dj_core_utils.signals.pipeline', 'ERROR'):
+            self.drain(OperationalError('gone'), OperationalError('gone'))
+        self.assertIn(('dropped', 2), self.metrics)
+
+        self.metrics.clear()
+        with self.assertLogs('dj_core_utils.signals.pipeline', 'ERROR'):
+            self.drain(ValueError('bad record'))
+        self.assertIn(('dropped', 2), self.metrics)
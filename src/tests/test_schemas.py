@@ -0,0 +1,56 @@
+from typing import Optional
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from dj_core_utils.fastapi.schemas import TrackedSchema
+from dj_core_utils.fastapi.utils import (
+    get_schema_plan, model_to_schema, models_to_schemas
+)
+
+from .models import Customer, Order
+
+
+class OrderSummarySchema(TrackedSchema):
+    customer_id: Optional[int] = None
+    total: int
+
+
+class SchemaPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        customer = Customer.objects.create(name='ACME')
+        Order.objects.create(
+            code='A-1', customer=customer, total=10, notes='x' * 1000)
+        Order.objects.create(code='A-2', total=20)
+
+    def test_plan_reads_only_schema_columns(self):
+        plan = get_schema_plan(Order, OrderSummarySchema)
+        self.assertNotIn('notes', plan.attnames)
+        self.assertNotIn('secret', plan.attnames)
+        self.assertNotIn('code', plan.attnames)
+        self.assertEqual(len(plan.attnames), len(set(plan.attnames)))
+        self.assertTrue(all(
+            index < len(plan.attnames) for _, index, _, _ in plan.columns))
+
+    def test_models_to_schemas_selects_schema_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            schemas = list(models_to_schemas(
+                Order.objects.order_by('id'), OrderSummarySchema))
+        sql = queries.captured_queries[0]['sql']
+        self.assertNotIn('"notes"', sql)
+        self.assertNotIn('"secret"', sql)
+        self.assertEqual([s.total for s in schemas], [10, 20])
+        self.assertIsNotNone(schemas[0].customer_id)
+        self.assertIsNone(schemas[1].customer_id)
+
+    def test_model_to_schema_does_not_load_deferred_fields(self):
+        order = Order.objects.only(
+            *get_schema_plan(Order, OrderSummarySchema).attnames
+        ).get(code='A-1')
+        with self.assertNumQueries(0):
+            schema = model_to_schema(order, OrderSummarySchema)
+        self.assertEqual(schema.total, 10)
+        self.assertEqual(schema.universal_state.value, 'active')
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from dj_core_utils.db.mixins import UniversalState
+from dj_core_utils.db.models import OperationLog
+from dj_core_utils.signals.bulk import (
+    register_audit_handler, unregister_audit_handler
+)
+
+from .models import Order
+
+
+class SetStateTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ana')
+        cls.first = Order.objects.create(code='A-1')
+        cls.second = Order.objects.create(code='A-2')
+        cls.locked = Order.objects.create(code='A-3', object_locked=True)
+        cls.terminated = Order.objects.create(
+            code='A-4', universal_state=UniversalState.TERMINATED)
+
+    def setUp(self):
+        from dj_core_utils.signals.audit import AuditHandler
+
+        register_audit_handler(AuditHandler)
+        self.addCleanup(unregister_audit_handler)
+
+    def states(self):
+        return dict(Order.objects.values_list('code', 'universal_state'))
+
+    def test_one_update_and_one_audit_batch(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            # SELECT ... FOR UPDATE de los valores previos + UPDATE
+            with self.assertNumQueries(2):
+                count = Order.objects.all().terminate(user=self.user)
+        self.assertEqual(count, 2)
+        self.assertEqual(self.states(), {
+            'A-1': 'terminated', 'A-2': 'terminated',
+            'A-3': 'active', 'A-4': 'terminated',
+        })
+        logs = OperationLog.objects.filter(model_changed='Order')
+        self.assertEqual(
+            sorted(logs.values_list('id_instance', flat=True)),
+            [self.first.pk, self.second.pk],
+        )
+        for log in logs:
+            self.assertEqual(log.user_id, self.user.pk)
+            self.assertEqual(log.changes['universal_state'], {
+                'before': 'active', 'after': 'terminated'})
+            self.assertEqual(log.changes['updated_by_id'], {
+                'before': None, 'after': self.user.pk})
+        self.assertEqual(
+            set(Order.objects.filter(universal_state='terminated')
+                .exclude(pk=self.terminated.pk)
+                .values_list('updated_by_id', flat=True)),
+            {self.user.pk},
+        )
+
+    def test_without_audit_only_the_update_runs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                Order.objects.filter(pk=self.first.pk).freeze(audit=False)
+        self.assertEqual(self.states()['A-1'], 'frozen')
+        self.assertFalse(OperationLog.objects.exists())
+
+    def test_instance_set_state_saves_only_the_state(self):
+        order = Order.objects.get(pk=self.first.pk)
+        order.notes = 'sin guardar'
+        order.deactivate()
+        order.refresh_from_db()
+        self.assertEqual(order.universal_state, 'frozen')
+        self.assertEqual(order.notes, '')
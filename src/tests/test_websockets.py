@@ -0,0 +1,97 @@
+from django.test import SimpleTestCase
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from dj_core_utils.fastapi.websockets import (
+    UNSUPPORTED_DATA_CLOSE_CODE, WebSocketManager
+)
+
+
+class WebSocketManagerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.manager = WebSocketManager()
+        self.messages = []
+        app = FastAPI()
+
+        async def echo(websocket, message):
+            self.messages.append(message)
+            await self.manager.send(websocket, {'echo': message})
+
+        @app.websocket('/ws')
+        async def endpoint(websocket: WebSocket):
+            await self.manager.serve(websocket, on_message=echo)
+
+        self.client = TestClient(app)
+
+    def test_malformed_json_keeps_the_connection(self):
+        with self.client.websocket_connect('/ws') as websocket:
+            websocket.send_text('{not json')
+            self.assertEqual(
+                websocket.receive_json(), {'error': 'Invalid JSON'})
+            websocket.send_json({'ping': 1})
+            self.assertEqual(websocket.receive_json(), {'echo': {'ping': 1}})
+        self.assertEqual(self.messages, [{'ping': 1}])
+
+    def test_binary_frame_closes_with_unsupported_data(self):
+        with self.client.websocket_connect('/ws') as websocket:
+            websocket.send_bytes(b'\x00\x01')
+            with self.assertRaises(WebSocketDisconnect) as raised:
+                websocket.receive_json()
+        self.assertEqual(raised.exception.code, UNSUPPORTED_DATA_CLOSE_CODE)
+        self.assertEqual(len(self.manager.connections), 0)
+
+
+class TopicRoutingTests(SimpleTestCase):
+
+    def setUp(self):
+        self.manager = WebSocketManager()
+        app = FastAPI()
+
+        @app.websocket('/ws')
+        async def endpoint(websocket: WebSocket):
+            await self.manager.serve(websocket)
+
+        @app.post('/publish/{topic}')
+        async def publish(topic: str):
+            return {'reached': await self.manager.publish(topic, {'n': 1})}
+
+        self.client = TestClient(app)
+
+    def subscribe(self, websocket, topic):
+        websocket.send_json({'action': 'subscribe', 'topic': topic})
+        # Ida y vuelta: la suscripción ya está indexada
+        websocket.send_json({'action': 'subscribe', 'topic': ''})
+        self.assertIn('error', websocket.receive_json())
+
+    def test_exact_and_prefix_topics(self):
+        with self.client.websocket_connect('/ws') as exact, \
+                self.client.websocket_connect('/ws') as prefix:
+            self.subscribe(exact, 'model:Order:1')
+            self.subscribe(prefix, 'model:Order:*')
+
+            reached = self.client.post('/publish/model:Order:1').json()
+            self.assertEqual(reached, {'reached': 2})
+            expected = {'topic': 'model:Order:1', 'data': {'n': 1}}
+            self.assertEqual(exact.receive_json(), expected)
+            self.assertEqual(prefix.receive_json(), expected)
+
+            reached = self.client.post('/publish/model:Order:2').json()
+            self.assertEqual(reached, {'reached': 1})
+            self.assertEqual(prefix.receive_json()['topic'], 'model:Order:2')
+
+            reached = self.client.post('/publish/model:Invoice:1').json()
+            self.assertEqual(reached, {'reached': 0})
+
+    def test_unsubscribe_and_disconnect_unindex(self):
+        with self.client.websocket_connect('/ws') as websocket:
+            self.subscribe(websocket, 'user:42')
+            websocket.send_json({'action': 'unsubscribe', 'topic': 'user:42'})
+            self.subscribe(websocket, 'user:*')
+        self.assertEqual(self.manager.stats()['topics'], 0)
+
+    def test_invalid_pattern_is_reported(self):
+        with self.client.websocket_connect('/ws') as websocket:
+            websocket.send_json({'action': 'subscribe', 'topic': 'model*'})
+            self.assertIn("'*'", websocket.receive_json()['error'])